@@ -0,0 +1,293 @@
+"""
+Benchmarks for SBRS.
+
+Generates synthetic rosters and message packs, then loads and plays a game
+for every combination of roster size, game mode, turn engine and output
+mode, and records:
+
+    load-seconds              loading the config from scratch
+    cached-load-seconds       loading it again from its cache
+    game-seconds              playing the whole game
+    turns                     how many turns the game lasted
+    player-turns-per-second   alive players at the start of each turn, summed, per second
+    peak-memory-mb            the peak memory of the process that ran the case
+
+Every case runs in its own process, so peak memory and caches don't leak
+between cases. Games are seeded, so the same code plays the same games.
+
+    python benchmarks/bench.py --out results.json
+    python benchmarks/bench.py --sizes 1000,1000000 --engines vector --outputs silent
+    python benchmarks/bench.py --out new.json --compare baseline.json
+
+With `--compare`, every metric that got worse than the baseline by more
+than `--tolerance` is reported, and the script exits with status 1.
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+sys.path.insert(0, SRC)
+
+# pylint: disable=wrong-import-position
+from output_sinks import FileSink, NullSink  # noqa: E402
+from roster import write_roster  # noqa: E402
+from version import __version__  # noqa: E402
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+MESSAGE_TYPES = ("passive", "passive-death", "attack-success", "attack-fail", "passive-attack", "winner", "most-kills")
+
+LOWER_IS_BETTER = ("load-seconds", "cached-load-seconds", "game-seconds", "peak-memory-mb")
+HIGHER_IS_BETTER = ("player-turns-per-second",)
+
+
+def message_pack(playertypes: int, messages: int) -> dict:
+    """
+    Builds a synthetic message pack.
+
+    Args:
+        playertypes (int): How many player types to write messages for.
+        messages (int): How many messages of each type, for each player type.
+
+    Returns:
+        dict: The messages, in the format of messages.json.
+    """
+    slots = {
+        "passive": "{player1} waits near {player2} ({n})",
+        "passive-death": "{player} trips ({n})",
+        "attack-success": "{player} defeats {target} ({n})",
+        "attack-fail": "{player} misses {target} ({n})",
+        "passive-attack": "{player} looks for a fight ({n})",
+        "winner": "{player} wins with {amount} kills ({n})",
+        "most-kills": "{player} had the most kills: {amount} ({n})",
+    }
+    types = ["Default"] + [f"Type{i}" for i in range(1, playertypes)]
+    return {
+        kind: {playertype: [text.replace("{n}", f"{playertype} {i}") for i in range(messages)] for playertype in types}
+        for kind, text in slots.items()
+    }
+
+
+def write_fixture(folder: str, players: int, mode: str, playertypes: int, messages: int) -> str:
+    """
+    Writes a synthetic roster, message pack and config.
+
+    Args:
+        folder (str): Where to write the files.
+        players (int): The number of players.
+        mode (str): "ffa", or "teams" for teams of 10.
+        playertypes (int): The number of player types.
+        messages (int): Messages per message type and player type.
+
+    Returns:
+        str: The path to the config file.
+    """
+    name = f"{mode}-{players}"
+    write_roster(
+        os.path.join(folder, f"{name}.csv"),
+        (
+            (f"Player{i}", "Default" if i % playertypes == 0 else f"Type{i % playertypes}",
+             f"Team{i // 10}" if mode == "teams" else None)
+            for i in range(players)
+        ),
+    )
+    with open(os.path.join(folder, "messages.json"), "w", encoding="utf-8") as f:
+        json.dump(message_pack(playertypes, messages), f)
+    config_path = os.path.join(folder, f"{name}.json")
+    with open(config_path, "w", encoding="utf-8") as f:
+        json.dump({
+            "use-teams": mode == "teams",
+            "attack-chance": 0.3,
+            "death-chances": {"passive": 0.5, "attack": 0.5},
+            "files": {"roster": f"{name}.csv"},
+            "load-default-messages": False,
+            "extra-message-files": ["messages.json"],
+        }, f)
+    return config_path
+
+
+def peak_memory_mb() -> float | None:
+    """
+    Returns:
+        float | None: This process's peak memory use, or None where it can't be measured.
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS reports bytes
+    return peak / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+def run_case(case: dict) -> dict:
+    """
+    Loads and plays one game. Run in a separate process by `main()`.
+
+    Args:
+        case (dict): The config path, engine, output mode and seed.
+
+    Returns:
+        dict: The case's metrics.
+    """
+    # pylint: disable=import-outside-toplevel
+    from config_cache import cache_path
+    from event_log import SBRSEventLogSink
+    from sbrs import SBRSGame, basic_init
+
+    if os.path.exists(cache_path(case["config"])):
+        os.remove(cache_path(case["config"]))
+    with open(os.devnull, "w", encoding="utf-8") as devnull:
+        stdout = sys.stdout
+        sys.stdout = devnull
+        try:
+            start = time.perf_counter()
+            basic_init(case["config"], True, False)
+            load = time.perf_counter() - start
+            start = time.perf_counter()
+            config = basic_init(case["config"], True, False)
+            cached_load = time.perf_counter() - start
+
+            output = os.path.join(os.path.dirname(case["config"]), f"output-{os.getpid()}")
+            if case["output"] == "text":
+                sinks = [FileSink(output + ".txt", "w")]
+            elif case["output"] == "binary":
+                sinks = [SBRSEventLogSink(output + ".sbrslog")]
+            else:
+                sinks = [NullSink()]
+            random.seed(case["seed"])
+            game = SBRSGame(config, sinks, case["engine"])
+            player_turns = 0
+            start = time.perf_counter()
+            while not game.finished:
+                game.turn += 1
+                player_turns += len(game.alive)
+                game.simulate_turn()
+            game.close_output()
+            elapsed = time.perf_counter() - start
+        finally:
+            sys.stdout = stdout
+    for extension in (".txt", ".sbrslog"):
+        if os.path.exists(output + extension):
+            os.remove(output + extension)
+    return {
+        "load-seconds": load,
+        "cached-load-seconds": cached_load,
+        "game-seconds": elapsed,
+        "turns": game.turn,
+        "player-turns-per-second": player_turns / elapsed if elapsed else 0.0,
+        "peak-memory-mb": peak_memory_mb(),
+    }
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list:
+    """
+    Finds metrics that got worse than a baseline.
+
+    Args:
+        results (dict): New results, from `main()`.
+        baseline (dict): Stored results.
+        tolerance (float): How much worse a metric can get (0.1 is 10%) before it counts.
+
+    Returns:
+        list: A message for each regression.
+    """
+    regressions = []
+    for case, metrics in results["cases"].items():
+        old = baseline["cases"].get(case)
+        if old is None:
+            continue
+        for metric in LOWER_IS_BETTER + HIGHER_IS_BETTER:
+            new_value, old_value = metrics.get(metric), old.get(metric)
+            if not new_value or not old_value:
+                continue
+            change = new_value / old_value - 1
+            if metric in HIGHER_IS_BETTER:
+                change = old_value / new_value - 1
+            if change > tolerance:
+                regressions.append(f"{case} {metric}: {old_value:.4g} -> {new_value:.4g} ({change:+.0%} worse)")
+    return regressions
+
+
+def main():
+    """Runs the benchmarks from the command line."""
+    parser = argparse.ArgumentParser(description="SBRS benchmarks")
+    parser.add_argument("--sizes", default="1000,10000,100000", help="Roster sizes, comma-separated")
+    parser.add_argument("--modes", default="ffa,teams", help="ffa and/or teams")
+    parser.add_argument("--engines", default="python,vector", help="Turn engines (vector is skipped without NumPy)")
+    parser.add_argument("--outputs", default="silent,text,binary", help="Output modes: silent, text and/or binary")
+    parser.add_argument("--playertypes", type=int, default=50, help="Player types in the roster and message pack")
+    parser.add_argument("--messages", type=int, default=200, help="Messages per message type and player type")
+    parser.add_argument("--seed", type=int, default=1, help="Seed for every game")
+    parser.add_argument("--out", metavar="PATH", help="Write the results to this JSON file")
+    parser.add_argument("--compare", metavar="PATH", help="Compare the results against a stored baseline")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed slowdown before a regression (0.2 = 20%%)")
+    parser.add_argument("--run-case", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_case:
+        print(json.dumps(run_case(json.loads(args.run_case))))
+        return 0
+
+    engines = args.engines.split(",")
+    try:
+        import numpy  # noqa: F401  pylint: disable=import-outside-toplevel,unused-import
+    except ImportError:
+        if "vector" in engines:
+            print("NumPy is not installed; skipping the vector engine.")
+            engines.remove("vector")
+
+    results = {
+        "sbrs-version": __version__,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cases": {},
+    }
+    with tempfile.TemporaryDirectory(prefix="sbrs-bench-") as folder:
+        for size in (int(size) for size in args.sizes.split(",")):
+            for mode in args.modes.split(","):
+                fixture = os.path.join(folder, f"{mode}-{size}")
+                os.mkdir(fixture)
+                config = write_fixture(fixture, size, mode, args.playertypes, args.messages)
+                for engine in engines:
+                    for output in args.outputs.split(","):
+                        name = f"{mode}-{size}-{engine}-{output}"
+                        case = {"config": config, "engine": engine, "output": output, "seed": args.seed}
+                        run = subprocess.run(
+                            [sys.executable, os.path.abspath(__file__), "--run-case", json.dumps(case)],
+                            capture_output=True, text=True, check=True,
+                        )
+                        metrics = json.loads(run.stdout.strip().splitlines()[-1])
+                        results["cases"][name] = metrics
+                        print(
+                            f"{name:<36} load {metrics['load-seconds']:7.2f}s  cached {metrics['cached-load-seconds']:6.2f}s  "
+                            + f"game {metrics['game-seconds']:7.2f}s  {metrics['turns']:4} turns  "
+                            + f"{metrics['player-turns-per-second']:11.0f} player-turns/s  "
+                            + f"peak {metrics['peak-memory-mb'] or 0:7.1f} MB"
+                        )
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=4)
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            return 1
+        print("No regressions.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -10,9 +10,11 @@ class SBRSAction:
             name (str): The name of the action.
             description (str): The description of the action.
             function (function): The function to call when the action is taken.
+            weight (float): How likely the action is to be picked, compared to other actions.
+            type_weights (dict): Weights for specific player types, overriding `weight`.
     """
 
-    def __init__(self, name, description, function):
+    def __init__(self, name, description, function, weight=1.0, type_weights=None):
         """
             Initializes the SBRSAction object.
 
@@ -21,6 +23,15 @@ class SBRSAction:
                 description (str): The description of the action.
                 function (function): The function to call when the action is taken.
                                      Should take an SBRSGame and an SBRSPlayer as arguments.
+                weight (float): How likely the action is to be picked, compared to other
+                                actions (default 1). An action with weight 2 is picked twice
+                                as often as one with weight 1. 0 means never.
+                type_weights (dict | None): Weights for specific player types, by type name.
+                                            Types not listed use `weight`.
+
+            Notes:
+                Change weights before adding the action to a game, or call
+                `SBRSGame.invalidate_actions()` afterwards.
         """
         self.name = name
         self.description = description
@@ -29,6 +40,20 @@ class SBRSAction:
         if not callable(function):
             raise ValueError("SBRSAction function must be a callable function.")
         self.function = function
+        if weight < 0 or any(value < 0 for value in (type_weights or {}).values()):
+            raise ValueError("SBRSAction weights can't be negative.")
+        self.weight = weight
+        self.type_weights = dict(type_weights or {})
+
+    def weight_for(self, player_type: str) -> float:
+        """
+            Args:
+                player_type (str): A player type.
+
+            Returns:
+                float: The action's weight for players of that type.
+        """
+        return self.type_weights.get(player_type, self.weight)
 
     def __str__(self):
         return self.name
@@ -0,0 +1,130 @@
+"""
+Addon discovery for SBRS.
+
+Addons are the `.py` files in the `addons` folder next to sbrs.py. Each
+must have an `Addon` class. The folder is scanned and every addon module
+imported once per process; every `SBRSGame` after that only creates new
+`Addon` instances from the cached classes. This matters for batch runs,
+which create thousands of games.
+
+The manifest also records which hooks each addon overrides and, after the
+first game, which actions it added, so the game can skip addons that
+don't implement a hook.
+"""
+
+import importlib
+import os
+import traceback
+
+try:
+    from .sbrs_config import Fore
+except ImportError:
+    from sbrs_config import Fore
+
+ADDON_DIR = os.path.join(os.path.dirname(__file__), "addons")
+"""The folder addons are loaded from."""
+
+HOOKS = (
+    "early_init",
+    "initgame",
+    "start_turn",
+    "begin_turn",
+    "pre_action",
+    "post_action",
+    "end_turn",
+    "end_game",
+    "game_over",
+)
+"""The methods the game calls on addons."""
+
+_base_addon = None
+_manifest = None
+
+
+class SBRSAddonInfo:
+    """
+    What the manifest knows about one addon.
+
+    Attributes:
+        filename (str): The addon's file, in the addons folder.
+        addon_class (type | None): The addon's `Addon` class. None if it failed to load.
+        error (str | None): Why the addon failed to load, if it did.
+        hooks (tuple): The hooks the addon overrides.
+        actions (tuple | None): The names of the actions the addon added to its first
+                                game. None until a game has been created.
+    """
+
+    def __init__(self, filename: str, addon_class=None, error=None, hooks=()):
+        self.filename = filename
+        self.addon_class = addon_class
+        self.error = error
+        self.hooks = hooks
+        self.actions = None
+
+    def __repr__(self):
+        return f"SBRSAddonInfo({self.filename!r}, hooks={self.hooks!r}, actions={self.actions!r})"
+
+
+def addon_hooks(addon_class, base) -> tuple:
+    """
+    Args:
+        addon_class (type): An addon class.
+        base (type): The addon base class (`SBRSAddon`).
+
+    Returns:
+        tuple: The hooks `addon_class` implements itself, rather than inheriting from `base`.
+    """
+    return tuple(
+        name
+        for name in HOOKS
+        if callable(getattr(addon_class, name, None)) and getattr(addon_class, name) is not getattr(base, name, None)
+    )
+
+
+def base_addon_class():
+    """
+    Returns:
+        type: The `Addon` class of basic_game_behavior, which implements the vanilla rules.
+    """
+    global _base_addon  # pylint: disable=global-statement
+    if _base_addon is None:
+        _base_addon = importlib.import_module("basic_game_behavior").Addon
+    return _base_addon
+
+
+def addon_manifest(base, reload: bool = False) -> list:
+    """
+    Finds and imports the addons, the first time it is called.
+
+    Args:
+        base (type): The addon base class (`SBRSAddon`).
+        reload (bool): If True, scan the addons folder again. Modules that were
+            already imported are not re-imported.
+
+    Returns:
+        list: An `SBRSAddonInfo` for each addon file, in alphabetical order.
+    """
+    global _manifest  # pylint: disable=global-statement
+    if _manifest is not None and not reload:
+        return _manifest
+    try:
+        filenames = sorted(entry.name for entry in os.scandir(ADDON_DIR) if entry.name.endswith(".py"))
+    except FileNotFoundError:
+        filenames = []
+    manifest = []
+    for filename in filenames:
+        print(f"{Fore.YELLOW}Loading addon: {Fore.CYAN}{filename}")
+        try:
+            addon = importlib.import_module(f"addons.{filename[:-3]}")
+            # Check for addon.Addon to initialize from
+            if not hasattr(addon, "Addon"):
+                raise ValueError(
+                    'Addon does not have an "Addon" class. Was it renamed (the class MUST be named "Addon")?'
+                )
+            manifest.append(SBRSAddonInfo(filename, addon.Addon, hooks=addon_hooks(addon.Addon, base)))
+        except Exception as e:  # pylint: disable=broad-except
+            error = "".join(traceback.format_exception(type(e), e, e.__traceback__))
+            print(f"{Fore.RED}Unable to load addon {filename}.\n{error}")
+            manifest.append(SBRSAddonInfo(filename, error=error))
+    _manifest = manifest
+    return manifest
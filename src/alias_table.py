@@ -0,0 +1,90 @@
+"""
+    SBRSAliasTable object.
+"""
+
+import random
+
+
+class SBRSAliasTable:
+    """
+        Picks items at random with given weights, in constant time (Vose's alias method).
+
+        The table is built once in O(n). Every draw then takes one random
+        number, no matter how many items there are: the number picks a
+        column, and the column picks either its own item or its alias.
+
+        Attributes:
+            items (list): The items to pick from.
+            weights (list): Each item's weight.
+    """
+
+    __slots__ = ("items", "weights", "_chances", "_aliases", "_count")
+
+    def __init__(self, items, weights):
+        """
+            Builds the table.
+
+            Args:
+                items (Iterable): The items to pick from.
+                weights (Iterable): Each item's weight. Weights can't be negative,
+                                    and at least one must be positive.
+
+            Raises:
+                ValueError: If the weights are invalid, or don't match the items.
+        """
+        self.items = list(items)
+        self.weights = [float(weight) for weight in weights]
+        if len(self.items) != len(self.weights):
+            raise ValueError("Every item needs exactly one weight.")
+        if any(weight < 0 for weight in self.weights):
+            raise ValueError("Weights can't be negative.")
+        total = sum(self.weights)
+        if not self.items or total <= 0:
+            raise ValueError("At least one item needs a positive weight.")
+
+        count = len(self.items)
+        scaled = [weight * count / total for weight in self.weights]
+        chances = [1.0] * count
+        aliases = list(range(count))
+        small = [i for i, value in enumerate(scaled) if value < 1.0]
+        large = [i for i, value in enumerate(scaled) if value >= 1.0]
+        while small and large:
+            less = small.pop()
+            more = large.pop()
+            chances[less] = scaled[less]
+            aliases[less] = more
+            scaled[more] -= 1.0 - scaled[less]
+            (small if scaled[more] < 1.0 else large).append(more)
+        # Anything left over is 1 up to rounding errors
+        self._chances = chances
+        self._aliases = aliases
+        self._count = count
+
+    def __len__(self):
+        return self._count
+
+    def pick(self, rand=random.random):
+        """
+            Picks an item.
+
+            Args:
+                rand (Callable): Returns a random float in [0, 1). Defaults to `random.random`.
+
+            Returns:
+                The picked item.
+        """
+        value = rand() * self._count
+        column = int(value)
+        if value - column < self._chances[column]:
+            return self.items[column]
+        return self.items[self._aliases[column]]
+
+    def chance(self, index: int) -> float:
+        """
+            Args:
+                index (int): An item's index.
+
+            Returns:
+                float: The chance that `pick()` returns that item.
+        """
+        return self.weights[index] / sum(self.weights)
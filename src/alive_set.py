@@ -0,0 +1,313 @@
+"""
+    SBRSAliveSet object.
+"""
+
+import random
+from collections.abc import Sequence
+
+
+class SBRSAliveSet:
+    """
+        Keeps track of the players that are still alive in a game.
+
+        Players are stored in a flat array. Each player remembers its own
+        position in that array (`alive_slot`), so removing a player is a
+        swap with the last element followed by a pop. Adding, removing and
+        membership checks are all O(1).
+
+        Alive players are also split into one partition per team, using
+        the same swap-remove scheme (`team_slot`). A Fenwick tree over the
+        partition sizes lets `sample_opponent()` draw a player that is not
+        on a given team directly, without rejection loops.
+
+        When the last alive player of a team is removed, the team is added
+        to `eliminated_teams` so the game can announce it.
+
+        Attributes:
+            players (list): The alive players, in no particular order.
+            team_count (int): The number of teams that still have alive players.
+            eliminated_teams (list): Teams eliminated since the list was last cleared.
+    """
+
+    def __init__(self, players=None):
+        """
+            Initializes the SBRSAliveSet object.
+
+            Args:
+                players (list): The players to track. Dead players are skipped.
+        """
+        self.players = []
+        self.team_count = 0
+        self.eliminated_teams = []
+        self._partitions = []
+        self._partition_ids = {}
+        self._tree = None
+        if players is not None:
+            for player in players:
+                if player.alive:
+                    self.add(player)
+
+    def __len__(self):
+        return len(self.players)
+
+    def __getitem__(self, index):
+        return self.players[index]
+
+    def __iter__(self):
+        return iter(self.players)
+
+    def __contains__(self, player):
+        return (
+            getattr(player, "_alive_set", None) is self
+            and player.alive_slot is not None
+        )
+
+    def add(self, player):
+        """
+            Starts tracking a player.
+
+            Args:
+                player (SBRSPlayer): The player to add.
+        """
+        if player in self:
+            return
+        player.alive_slot = len(self.players)
+        player._alive_set = self  # pylint: disable=protected-access
+        self.players.append(player)
+
+        team = player.team
+        partition_id = self._partition_ids.get(team)
+        if partition_id is None:
+            partition_id = len(self._partitions)
+            self._partition_ids[team] = partition_id
+            self._partitions.append([])
+            self._tree = None
+        partition = self._partitions[partition_id]
+        if team is not None and not partition:
+            self.team_count += 1
+        player.team_slot = len(partition)
+        partition.append(player)
+        if self._tree is not None:
+            self._update(partition_id, 1)
+
+    def remove(self, player):
+        """
+            Stops tracking a player. Called by `SBRSPlayer.kill()`.
+
+            Args:
+                player (SBRSPlayer): The player to remove.
+        """
+        if player not in self:
+            return
+        slot = player.alive_slot
+        last = self.players.pop()
+        if last is not player:
+            self.players[slot] = last
+            last.alive_slot = slot
+        player.alive_slot = None
+
+        team = player.team
+        partition_id = self._partition_ids[team]
+        partition = self._partitions[partition_id]
+        slot = player.team_slot
+        last = partition.pop()
+        if last is not player:
+            partition[slot] = last
+            last.team_slot = slot
+        player.team_slot = None
+        if self._tree is not None:
+            self._update(partition_id, -1)
+        if team is not None and not partition:
+            self.team_count -= 1
+            self.eliminated_teams.append(team)
+
+    def sample_other(self, player):
+        """
+            Picks a random alive player other than `player`.
+
+            Args:
+                player (SBRSPlayer): The player to exclude.
+
+            Returns:
+                SBRSPlayer | None: The picked player, or None if there is nobody else.
+        """
+        count = len(self.players)
+        if player in self:
+            if count < 2:
+                return None
+            index = random.randrange(count - 1)
+            if index >= player.alive_slot:
+                index += 1
+            return self.players[index]
+        if count == 0:
+            return None
+        return self.players[random.randrange(count)]
+
+    def sample_others(self, player, count, rng=random):
+        """
+            Picks `count` different random alive players other than `player`.
+
+            Args:
+                player (SBRSPlayer): The player to exclude.
+                count (int): The number of players to pick.
+                rng (random.Random): Where to get random numbers from. Defaults to the `random` module.
+
+            Returns:
+                list: The picked players.
+
+            Raises:
+                ValueError: If there are not enough other alive players.
+        """
+        if player in self:
+            slot = player.alive_slot
+            return [
+                self.players[index + 1 if index >= slot else index]
+                for index in rng.sample(range(len(self.players) - 1), count)
+            ]
+        return [
+            self.players[index]
+            for index in rng.sample(range(len(self.players)), count)
+        ]
+
+    def sample_opponent(self, player):
+        """
+            Picks a random alive player that is not on `player`'s team.
+            Players without a team can pick anyone except themselves.
+
+            Args:
+                player (SBRSPlayer): The player looking for an opponent.
+
+            Returns:
+                SBRSPlayer | None: The picked player, or None if there is no valid target.
+        """
+        team = player.team
+        if team is None:
+            return self.sample_other(player)
+        if self._tree is None:
+            self._build_tree()
+        partition_id = self._partition_ids.get(team)
+        excluded = 0 if partition_id is None else len(self._partitions[partition_id])
+        count = len(self.players) - excluded
+        if count <= 0:
+            return None
+        # Pick an index in the concatenation of all other partitions, then
+        # skip over the excluded team's partition.
+        index = random.randrange(count)
+        if excluded and index >= self._prefix(partition_id):
+            index += excluded
+        partition_id, offset = self._find(index)
+        return self._partitions[partition_id][offset]
+
+    def _build_tree(self):
+        size = len(self._partitions)
+        self._tree = [0] * (size + 1)
+        for partition_id, partition in enumerate(self._partitions):
+            self._update(partition_id, len(partition))
+
+    def _update(self, partition_id, delta):
+        tree = self._tree
+        i = partition_id + 1
+        while i < len(tree):
+            tree[i] += delta
+            i += i & -i
+
+    def _prefix(self, partition_id):
+        """Number of alive players in the partitions before `partition_id`."""
+        tree = self._tree
+        total = 0
+        i = partition_id
+        while i > 0:
+            total += tree[i]
+            i -= i & -i
+        return total
+
+    def _find(self, index):
+        """Finds the partition holding the `index`th player, and its offset inside it."""
+        tree = self._tree
+        position = 0
+        step = 1 << (len(tree) - 1).bit_length()
+        while step:
+            following = position + step
+            if following < len(tree) and tree[following] <= index:
+                position = following
+                index -= tree[following]
+            step >>= 1
+        return position, index
+
+    def partitions(self):
+        """
+            Returns the team partitions, in the order they were created.
+
+            Returns:
+                list: A `(team, players)` pair for each partition. Eliminated teams
+                      have an empty list of players.
+        """
+        teams = sorted(self._partition_ids, key=self._partition_ids.get)
+        return [(team, list(self._partitions[self._partition_ids[team]])) for team in teams]
+
+    @classmethod
+    def from_order(cls, players, partitions):
+        """
+            Rebuilds an alive set with its players in an exact order, such as
+            one saved from `players` and `partitions()`. Random picks from the
+            rebuilt set then match the ones the original set would have made.
+
+            Args:
+                players (list): The alive players, in alive set order.
+                partitions (list): A `(team, players)` pair for each partition, in order.
+
+            Returns:
+                SBRSAliveSet: The rebuilt set.
+        """
+        alive = cls()
+        alive.players = list(players)
+        for slot, player in enumerate(alive.players):
+            player.alive_slot = slot
+            player._alive_set = alive  # pylint: disable=protected-access
+        for partition_id, (team, partition) in enumerate(partitions):
+            alive._partition_ids[team] = partition_id
+            alive._partitions.append(list(partition))
+            for slot, player in enumerate(partition):
+                player.team_slot = slot
+            if team is not None and partition:
+                alive.team_count += 1
+        return alive
+
+    def view(self):
+        """
+            Returns a read-only view of the alive players.
+
+            Returns:
+                SBRSAliveView: The view.
+        """
+        return SBRSAliveView(self)
+
+
+class SBRSAliveView(Sequence):
+    """
+        A read-only view of the players in an `SBRSAliveSet`.
+
+        The view always reflects the current state of the set, but it
+        cannot be used to change it. Note that the order of players changes
+        whenever a player dies.
+    """
+
+    __slots__ = ("_alive",)
+
+    def __init__(self, alive_set):
+        self._alive = alive_set
+
+    def __len__(self):
+        return len(self._alive.players)
+
+    def __getitem__(self, index):
+        return self._alive.players[index]
+
+    def __iter__(self):
+        return iter(self._alive.players)
+
+    def __contains__(self, player):
+        return player in self._alive
+
+    def __repr__(self):
+        return repr(self._alive.players)
@@ -0,0 +1,292 @@
+"""
+Sharded games for SBRS.
+
+Splits one huge game into arenas, each played by its own worker process,
+so a game isn't limited to one core and one address space:
+
+    python sbrs.py config.json --arenas 16 --merge-every 5 --report report.json
+
+Or from Python:
+
+    result = run_arenas(basic_init("config.json", True, color=False), arenas=16)
+    print(result.winner)
+
+The game is played in epochs of `merge_every` turns. In each epoch, every
+arena plays its share of the survivors, and an arena that is down to one
+player (or team) waits for the others. Between epochs, a lightweight
+controller collects the survivors and deals them out again: shuffled
+between the arenas (the default), or merged in order so players keep
+their neighbours. Arenas are merged into fewer as players die, down to a
+single arena for the end of the game.
+
+The controller keeps the state of the whole game: the turn, when sudden
+death starts (in the first epoch with 10% of all players left, like a
+normal game), the kills leaderboard and the winner. Workers only send back the survivors,
+and the kills of players who died.
+
+Addons run in every arena, and see each arena's epoch as a game of its own.
+
+Arenas smaller than `MIN_ARENA_PLAYERS` cost more to hand to a worker than
+they save, so rosters too small for more than one arena are played in a
+single arena, with a warning.
+"""
+
+import contextlib
+import copy
+import json
+import os
+import random
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    from .load_functions import load_players
+    from .output_sinks import NullSink
+    from .sbrs_config import Fore
+    from .tournament import split_evenly
+except ImportError:
+    from load_functions import load_players
+    from output_sinks import NullSink
+    from sbrs_config import Fore
+    from tournament import split_evenly
+
+MIN_ARENA_PLAYERS = 1000
+"""Arenas are merged so none starts an epoch with fewer players than this (unless there is only one)."""
+
+_worker_config = None
+
+
+class SBRSArenaResult:
+    """
+    The results of a sharded game.
+
+    Attributes:
+        seed (int | None): The seed the game was run with.
+        players (int): How many players the game started with.
+        winner (str | None): The winning player, or team in team games.
+        turns (int): How many turns the game lasted.
+        sudden_death_turn (int | None): The turn sudden death started on, if it did.
+        kills (Counter): Each player's kills. Players without kills are left out.
+        epochs (list): For each epoch, the turn it started on, how many arenas
+                       played it and how many players were alive at its start.
+    """
+
+    def __init__(self, seed=None, players=0):
+        self.seed = seed
+        self.players = players
+        self.winner = None
+        self.turns = 0
+        self.sudden_death_turn = None
+        self.kills = Counter()
+        self.epochs = []
+
+    def leaderboard(self, count: int = 10) -> list:
+        """
+        Args:
+            count (int): How many players to list.
+
+        Returns:
+            list: `(name, kills)` for the players with the most kills, most first.
+        """
+        return self.kills.most_common(count)
+
+    def to_dict(self) -> dict:
+        """
+        Returns:
+            dict: The result as JSON-friendly data.
+        """
+        return {
+            "seed": self.seed,
+            "players": self.players,
+            "winner": self.winner,
+            "turns": self.turns,
+            "sudden-death-turn": self.sudden_death_turn,
+            "leaderboard": dict(self.leaderboard()),
+            "kills": dict(self.kills.most_common()),
+            "epochs": self.epochs,
+        }
+
+    def to_json(self, indent=4) -> str:
+        """
+        Returns:
+            str: The result as a JSON report.
+        """
+        return json.dumps(self.to_dict(), indent=indent)
+
+
+def arena_seed(seed: int, epoch: int, arena: int) -> int:
+    """
+    Derives the seed of one arena in one epoch, so an arena plays the same no
+    matter which worker plays it.
+
+    Args:
+        seed (int): The game's seed.
+        epoch (int): The epoch, from 0.
+        arena (int): The arena's position in the epoch.
+
+    Returns:
+        int: A 64-bit seed.
+    """
+    return random.Random(f"{seed}:arena:{epoch}:{arena}").getrandbits(64)
+
+
+def play_arena(
+    config, rows: list, turn: int, turns: int, sudden_death: bool, seed: int, engine: str = "auto"
+) -> tuple:  # pylint: disable=too-many-arguments
+    """
+    Plays one arena for one epoch, silently.
+
+    Args:
+        config (SBRSConfig): The game configuration, without players. It is copied, not modified.
+        rows (list): The arena's players, as `(name, type, team, kills)`.
+        turn (int): The last turn played before this epoch.
+        turns (int): The most turns to play.
+        sudden_death (bool): Whether sudden death has started.
+        seed (int): The seed for the arena's random numbers.
+        engine (str): The turn engine to use (see `SBRSGame`).
+
+    Returns:
+        tuple: The survivors as `(name, type, team, kills)` rows in the order they
+               were given, the kills of players who died (by name, players without
+               kills are left out), and how many turns were played.
+    """
+    try:
+        from .sbrs import SBRSGame
+    except ImportError:
+        from sbrs import SBRSGame
+    config = copy.deepcopy(config)
+    config.players, config.teams = load_players([row[:3] for row in rows], None, None, config.use_teams)
+    config.playertypes = [player.type for player in config.players]
+    for player, row in zip(config.players, rows):
+        player.kills = row[3]
+    random.seed(seed)
+    game = SBRSGame(config, [NullSink()], engine)
+    game.turn = turn
+    # The controller decides when sudden death starts
+    game.sudden_death_at = None
+    if sudden_death:
+        game.addons[0].start_sudden_death(game)
+    played = 0
+    if len(game.alive) > 1 and not (config.use_teams and game.remaining_teams <= 1):
+        for summary in game.iter_turns():
+            played += 1
+            if summary.turn - turn >= turns:
+                break
+    survivors = [
+        (player.name, player.type, row[2], player.kills)
+        for player, row in zip(config.players, rows)
+        if player.alive
+    ]
+    dead = {player.name: player.kills for player in config.players if not player.alive and player.kills}
+    return survivors, dead, played
+
+
+def _init_worker(config, engine):
+    global _worker_config  # pylint: disable=global-statement
+    _worker_config = (config, engine)
+
+
+def _play_worker_arena(rows, turn, turns, sudden_death, seed) -> tuple:
+    config, engine = _worker_config
+    # Addons and the player loader print; keep workers quiet
+    with open(os.devnull, "w", encoding="utf-8") as devnull, contextlib.redirect_stdout(devnull):
+        return play_arena(config, rows, turn, turns, sudden_death, seed, engine)
+
+
+def _standing(rows: list, use_teams: bool) -> int:
+    """How many players, or teams in team games, are still in the game."""
+    if use_teams:
+        return len({row[2] for row in rows})
+    return len(rows)
+
+
+def run_arenas(
+    config, arenas: int, merge_every: int = 10, workers: int | None = None, seed: int | None = None,
+    engine: str = "auto", shuffle: bool = True, min_arena_players: int = MIN_ARENA_PLAYERS,
+) -> SBRSArenaResult:  # pylint: disable=too-many-arguments,too-many-locals
+    """
+    Plays one game split across arenas.
+
+    Args:
+        config (SBRSConfig): The game configuration, from `basic_init()`.
+        arenas (int): The most arenas to play at once.
+        merge_every (int): How many turns arenas play between merges.
+        workers (int | None): How many processes to use. Defaults to one per arena,
+            up to the number of CPUs. With 1, arenas are played in this process.
+        seed (int | None): The game's seed. If None, a random one is used.
+        engine (str): The turn engine arenas use (see `SBRSGame`).
+        shuffle (bool): If True, survivors are shuffled between arenas at every
+            merge. If False, they stay in roster order, so arenas only merge.
+        min_arena_players (int): Arenas are merged so none starts an epoch with
+            fewer players than this.
+
+    Returns:
+        SBRSArenaResult: The results.
+
+    Raises:
+        ValueError: If `arenas` or `merge_every` is less than 1, or the roster is empty.
+    """
+    if arenas < 1 or merge_every < 1:
+        raise ValueError("There must be at least one arena, playing at least one turn between merges.")
+    if not config.players:
+        raise ValueError("The roster is empty.")
+    if seed is None:
+        seed = random.SystemRandom().getrandbits(64)
+    if workers is None:
+        workers = min(arenas, os.cpu_count() or 1)
+    rng = random.Random(seed)
+    result = SBRSArenaResult(seed, len(config.players))
+    survivors = [
+        (player.name, player.type, str(player.team) if config.use_teams else None, 0) for player in config.players
+    ]
+    sudden_death_at = None if config.classic_behavior else len(survivors) * 0.1
+    base = copy.copy(config)
+    base.players, base.playertypes, base.teams, base.sbrs_game_logger = [], [], None, None
+
+    def play_epoch(epoch, groups, pool):
+        args = [
+            (rows, result.turns, merge_every, result.sudden_death_turn is not None, arena_seed(seed, epoch, arena))
+            for arena, rows in enumerate(groups)
+        ]
+        if pool is None:
+            with open(os.devnull, "w", encoding="utf-8") as devnull, contextlib.redirect_stdout(devnull):
+                return [play_arena(base, *arena_args, engine) for arena_args in args]
+        return list(pool.map(_play_worker_arena, *zip(*args)))
+
+    with contextlib.ExitStack() as stack:
+        pool = None
+        if workers > 1 and arenas > 1:
+            pool = stack.enter_context(
+                ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(base, engine))
+            )
+        epoch, previous, progressed = 0, arenas, True
+        while _standing(survivors, config.use_teams) > 1:
+            if sudden_death_at is not None and result.sudden_death_turn is None and len(survivors) <= sudden_death_at:
+                result.sudden_death_turn = result.turns + 1
+            if shuffle:
+                rng.shuffle(survivors)
+            count = max(1, min(arenas, len(survivors) // max(1, min_arena_players)))
+            if not progressed:
+                # Every arena is down to one player or team; bring them together
+                count = max(1, min(count, previous // 2))
+            if epoch == 0 and count < arenas:
+                print(
+                    f"{Fore.YELLOW}{len(survivors)} players only fill {count} arena(s) of at least "
+                    + f"{min_arena_players} players; playing {count} instead of {arenas}."
+                )
+            groups = split_evenly(survivors, -(-len(survivors) // count))
+            result.epochs.append({"turn": result.turns + 1, "arenas": len(groups), "players": len(survivors)})
+            reports = play_epoch(epoch, groups, pool)
+            survivors = [row for rows, _, _ in reports for row in rows]
+            for _, dead, _ in reports:
+                result.kills.update(dead)
+            played = max(turns for _, _, turns in reports)
+            progressed = played > 0
+            result.turns += played
+            previous = len(groups)
+            epoch += 1
+
+    result.kills.update({name: kills for name, _, _, kills in survivors if kills})
+    if survivors:
+        result.winner = survivors[0][2] if config.use_teams else survivors[0][0]
+    return result
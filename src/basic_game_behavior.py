@@ -11,32 +11,65 @@ from action import SBRSAction
 from player import SBRSPlayer
 from sbrs import SBRSAddon
 
+def action_weights(config: dict) -> dict:
+    """
+    Reads the weights of the vanilla actions from a config's "action-weights".
+    Each weight is either a number, or an object of weights by player type
+    (with "Default" for every other type):
+
+        "action-weights": {"attack": 2, "passive-death": {"Default": 1, "Medic": 0.5}}
+
+    Args:
+        config (dict): The loaded config file.
+
+    Returns:
+        dict: The weight and player type weights of each vanilla action, by name.
+    """
+    weights = {}
+    for name in ("attack", "passive", "passive-death"):
+        weight = config.get("action-weights", {}).get(name, 1)
+        if isinstance(weight, dict):
+            type_weights = {key: value for key, value in weight.items() if key != "Default"}
+            weights[name] = (weight.get("Default", 1), type_weights)
+        else:
+            weights[name] = (weight, None)
+    return weights
+
 class Addon(SBRSAddon):
     """
     The base game behavior for SBRS in the form of an SBRSAddon.
     """
 
     def initgame(self, game: sbrs.SBRSGame):
+        weights = action_weights(game.config.config)
         game.add_action(
-            SBRSAction("attack", "Player attacks another player", self.attack)
+            SBRSAction("attack", "Player attacks another player", self.attack, *weights["attack"])
         )
-        game.add_action(SBRSAction("passive", "Player does nothing", self.passive))
-        game.add_action(SBRSAction("passive-death", "Player dies", self.passive_death))
+        game.add_action(SBRSAction("passive", "Player does nothing", self.passive, *weights["passive"]))
+        game.add_action(SBRSAction("passive-death", "Player dies", self.passive_death, *weights["passive-death"]))
 
     def start_turn(self, game):
         if (
             not game.config.classic_behavior
-            and len(game.remaining_players) <= len(game.config.players) * 0.1
+            and game.sudden_death_at is not None
+            and len(game.remaining_players) <= game.sudden_death_at
             and not game.sudden_death
         ):
             # SUDDEN DEATH: bump death chance to 100% at 10% players remaining
-            game.sudden_death = True
-            game.game_print(
-                f"{game.message_color('attack-success')}SUDDEN DEATH - All attacks are guaranteed to succeed\n"
-            )
-            game.config.attack_chance = 1
-            game.config.passive_death_chance = 1
-            game.config.attack_success_chance = 1
+            self.start_sudden_death(game)
+
+    def start_sudden_death(self, game: sbrs.SBRSGame):
+        """
+        Starts sudden death: every attack and passive death happens, and always succeeds.
+
+        Args:
+            game (sbrs.SBRSGame): The game being simulated.
+        """
+        game.sudden_death = True
+        game.emit("sudden-death")
+        game.config.attack_chance = 1
+        game.config.passive_death_chance = 1
+        game.config.attack_success_chance = 1
 
     def attack(self, game: sbrs.SBRSGame, player: SBRSPlayer):
         """
@@ -47,32 +80,21 @@ class Addon(SBRSAddon):
             player (sbrs.SBRSPlayer): The player who took the action.
         """
         if random.random() < game.config.attack_chance:
-            target = random.choice(list(game.remaining_players))
             if game.config.use_teams:
-                while target.team == player.team:
-                    target = random.choice(list(game.remaining_players))
+                target = game.alive.sample_opponent(player)
             else:
-                while target == player:
-                    target = random.choice(list(game.remaining_players))
+                target = game.alive.sample_other(player)
+            if target is None:
+                # Nobody left to attack
+                return
             if random.random() < game.config.attack_success_chance:
-                game.game_print(
-                    f"{game.message_color('attack-success')}{game.random_message("attack-success", player.type)
-                    .replace('{player}', game.message_color('generic-player') + player.name + game.message_color('attack-success'))
-                    .replace('{target}', game.message_color('target-player') + target.name + game.message_color('attack-success'))}"
-                )
+                game.emit("attack-success", player, target)
                 target.kill()
                 player.kills += 1
             elif not game.config.show_kills_only:
-                game.game_print(
-                    f"{game.message_color('attack-fail')}{game.random_message('attack-fail', player.type)
-                    .replace('{player}', game.message_color('generic-player') + player.name + game.message_color('attack-fail'))
-                    .replace('{target}', game.message_color('target-player') + target.name + game.message_color('attack-fail'))}"
-                )
+                game.emit("attack-fail", player, target)
         elif not game.config.classic_behavior and not game.config.show_kills_only:
-            game.game_print(
-                f"{game.message_color('passive-attack')}{game.random_message('passive-attack', player.type)
-                .replace('{player}', game.message_color('generic-player') + player.name + game.message_color('passive-attack'))}"
-            )
+            game.emit("passive-attack", player)
 
     def passive(self, game: sbrs.SBRSGame, player: SBRSPlayer):
         """
@@ -82,52 +104,26 @@ class Addon(SBRSAddon):
             game (sbrs.SBRSGame): The game being simulated.
             player (sbrs.SBRSPlayer): The player who took the action.
         """
-        num_players = random.randint(
-            1,
-            (4 if len(game.remaining_players) >= 4 else len(game.remaining_players)),
+        if not game.listening:
+            # Nobody will see the message, so don't bother picking one
+            game.something_happened = True
+            return
+        # Message choices come from the renderer's random numbers, so they don't
+        # change the game compared to when nobody is listening
+        rng = game.renderer.random
+        max_players = min(4, len(game.remaining_players))
+        message = game.random_passive_message(
+            player.type, rng.randint(1, max_players)
         )
-        players_to_include = []
-        while len(players_to_include) < num_players:
-            player_to_include = random.choice(game.remaining_players)
-            if player_to_include not in players_to_include:
-                players_to_include.append(player_to_include)
-        message = game.random_message("passive", player.type)
-        highest_accessed_player_id = 10  # to allow while loop to actually work
-        while highest_accessed_player_id > len(players_to_include):
-            message = game.random_message("passive", player.type)
-            # find highest accessed player ID ({playerx})
-            highest_accessed_player_id = 0
-            for i in range(1, 5):
-                if f"{{player{i}}}" in message:
-                    highest_accessed_player_id = i
-        message = message.replace(
-            "{player1}",
-            game.message_color("generic-player")
-            + player.name
-            + game.message_color("passive"),
+        if message is None:
+            message = game.random_passive_message(player.type, max_players)
+            if message is None:
+                return  # no message can fit this few players
+        # {player1} is always the player taking the action
+        players_to_include = [player] + game.alive.sample_others(
+            player, message.player_count - 1, rng
         )
-        try:
-            message = message.replace(
-                "{player2}",
-                game.message_color("generic-player")
-                + players_to_include[0].name
-                + game.message_color("passive"),
-            )
-            message = message.replace(
-                "{player3}",
-                game.message_color("generic-player")
-                + players_to_include[1].name
-                + game.message_color("passive"),
-            )
-            message = message.replace(
-                "{player4}",
-                game.message_color("generic-player")
-                + players_to_include[2].name
-                + game.message_color("passive"),
-            )
-        except IndexError:
-            pass  # too many players for this message, but it's alright
-        game.game_print(f"{game.message_color('passive')}{message}")
+        game.emit("passive", player, template=message, players=tuple(players_to_include))
 
     def passive_death(self, game: sbrs.SBRSGame, player: SBRSPlayer):
         """
@@ -138,10 +134,7 @@ class Addon(SBRSAddon):
             player (sbrs.SBRSPlayer): The player who took the action.
         """
         if random.random() < game.config.passive_death_chance:
-            game.game_print(
-                f"{game.message_color('passive-death')}{game.random_message('passive-death', player.type)
-                .replace('{player}', game.message_color('generic-player') + player.name + game.message_color('passive-death'))}"
-            )
+            game.emit("passive-death", player)
             player.kill()
 
     def game_over(self, game: sbrs.SBRSGame):
@@ -152,30 +145,17 @@ class Addon(SBRSAddon):
             game (sbrs.SBRSGame): The game being simulated.
         """
         if not game.config.use_teams:
-            game.game_print(
-                game.random_message("winner", game.remaining_players[0].type)
-                .replace(
-                    "{player}",
-                    f"{game.message_color('generic-player')}{game.remaining_players[0].name}{game.message_color('winner')}",
-                )
-                .replace(
-                    "{amount}",
-                    f"{game.message_color('generic-player')}{str(game.remaining_players[0].kills)}{game.message_color('winner')}",
-                )
-            )
+            winner = game.remaining_players[0]
+            game.emit("winner", winner, amount=winner.kills)
         else:
             for team in set(p.team for p in game.remaining_players):
                 team_players = [p for p in game.remaining_players if p.team == team]
-                game.game_print(
-                    game.random_message("winner", team_players[0].type)
-                    .replace(
-                        "{player}",
-                        f"{game.message_color('generic-player')}{team} ({', '.join(p.name for p in team_players)}){game.message_color('winner')}",
-                    )
-                    .replace(
-                        "{amount}",
-                        f"{game.message_color('generic-player')}{str(sum(p.kills for p in team_players))}{game.message_color('winner')}",
-                    )
+                game.emit(
+                    "winner",
+                    team,
+                    template=game.random_message("winner", team_players[0].type),
+                    amount=sum(p.kills for p in team_players),
+                    label=f"{team} ({', '.join(p.name for p in team_players)})",
                 )
         most_kills = 0
         most_kills_players = []
@@ -185,20 +165,9 @@ class Addon(SBRSAddon):
                 most_kills_players = [player]
             elif player.kills == most_kills:
                 most_kills_players.append(player)
-        players_str = ""
-        if len(most_kills_players) == 1:
-            players_str = f"{game.message_color('generic-player')}{most_kills_players[0].name}{game.message_color('most-kills')}"
-        elif len(most_kills_players) == 2:
-            players_str = f"{game.message_color('generic-player')}{most_kills_players[0].name} {game.message_color('most-kills')}and {game.message_color('generic-player')}{most_kills_players[1].name}{game.message_color('most-kills')}"
-        else:
-            for player in most_kills_players[:-1]:
-                players_str += f"{game.message_color('generic-player')}{player.name}{game.message_color('most-kills')}, "
-            players_str += f"{game.message_color('most-kills')}and {game.message_color('generic-player')}{most_kills_players[-1].name}{game.message_color('most-kills')}"
-        game.game_print(
-            f"{game.message_color('most-kills')}{game.random_message('most-kills', random.choice(most_kills_players).type)
-            .replace('{player}', players_str)
-            .replace(
-                '{amount}',
-                f"{game.message_color('generic-player')}{str(most_kills)}{game.message_color('most-kills')}"
-            )}"
+        game.emit(
+            "most-kills",
+            template=game.random_message("most-kills", game.renderer.random.choice(most_kills_players).type),
+            players=tuple(most_kills_players),
+            amount=most_kills,
         )
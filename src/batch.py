@@ -0,0 +1,236 @@
+"""
+Monte Carlo batch runs for SBRS.
+
+Runs many games of the same config across a process pool, without any
+output, and collects how often each player (or team) won, how many kills
+players got and how long games lasted.
+
+    python sbrs.py config.json --batch 10000 --workers 16 --report report.json
+
+Or from Python:
+
+    result = run_batch(basic_init("config.json", True, color=False), 10000)
+    print(result.win_rates())
+"""
+
+import contextlib
+import copy
+import json
+import os
+import random
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    from .output_sinks import NullSink
+    from .turn_summary import game_winner
+except ImportError:
+    from output_sinks import NullSink
+    from turn_summary import game_winner
+
+_worker_config = None
+
+
+class SBRSBatchResult:
+    """
+    The combined results of a batch of games.
+
+    Attributes:
+        games (int): The number of games played.
+        seed (int | None): The seed the batch was run with.
+        wins (Counter): Wins by player name (or team name, in team games).
+        kills (dict): For each player name, a Counter of how many games they
+                      ended with each number of kills.
+        turns (Counter): How many games lasted each number of turns.
+    """
+
+    def __init__(self, seed=None):
+        self.games = 0
+        self.seed = seed
+        self.wins = Counter()
+        self.kills = {}
+        self.turns = Counter()
+
+    def add_game(self, winner, kills: dict, turns: int):
+        """
+        Records the result of one game.
+
+        Args:
+            winner (str | None): The name of the winning player or team.
+            kills (dict): Each player's kills, by player name.
+            turns (int): How many turns the game lasted.
+        """
+        self.games += 1
+        self.wins[winner] += 1
+        for name, amount in kills.items():
+            self.kills.setdefault(name, Counter())[amount] += 1
+        self.turns[turns] += 1
+
+    def merge(self, other):
+        """
+        Adds the games in another result to this one.
+
+        Args:
+            other (SBRSBatchResult): The result to add.
+        """
+        self.games += other.games
+        self.wins.update(other.wins)
+        for name, histogram in other.kills.items():
+            self.kills.setdefault(name, Counter()).update(histogram)
+        self.turns.update(other.turns)
+
+    def win_rates(self) -> dict:
+        """
+        Returns:
+            dict: The fraction of games each player (or team) won, highest first.
+        """
+        if not self.games:
+            return {}
+        return {name: wins / self.games for name, wins in self.wins.most_common()}
+
+    def mean_kills(self) -> dict:
+        """
+        Returns:
+            dict: Each player's average kills per game.
+        """
+        return {
+            name: sum(amount * count for amount, count in histogram.items()) / self.games
+            for name, histogram in self.kills.items()
+        }
+
+    def mean_turns(self) -> float:
+        """
+        Returns:
+            float: The average number of turns per game.
+        """
+        if not self.games:
+            return 0.0
+        return sum(turns * count for turns, count in self.turns.items()) / self.games
+
+    def to_dict(self) -> dict:
+        """
+        Returns:
+            dict: The result as JSON-friendly data. Histogram keys are strings.
+        """
+        return {
+            "games": self.games,
+            "seed": self.seed,
+            "wins": dict(self.wins.most_common()),
+            "win-rates": self.win_rates(),
+            "mean-kills": self.mean_kills(),
+            "kills": {
+                name: {str(amount): count for amount, count in sorted(histogram.items())}
+                for name, histogram in self.kills.items()
+            },
+            "mean-turns": self.mean_turns(),
+            "turns": {str(turns): count for turns, count in sorted(self.turns.items())},
+        }
+
+    def to_json(self, indent=4) -> str:
+        """
+        Returns:
+            str: The result as a JSON report.
+        """
+        return json.dumps(self.to_dict(), indent=indent)
+
+
+def game_seeds(seed: int | None, games: int) -> list:
+    """
+    Derives an independent seed for every game in a batch.
+
+    Args:
+        seed (int | None): The batch's seed. If None, a random one is used.
+        games (int): The number of games.
+
+    Returns:
+        list: One 64-bit seed per game.
+    """
+    rng = random.Random(seed)
+    return [rng.getrandbits(64) for _ in range(games)]
+
+
+def play_game(config, seed: int, engine: str = "auto"):
+    """
+    Plays one silent game.
+
+    Args:
+        config (SBRSConfig): The game configuration. It is copied, not modified.
+        seed (int): The seed for the game's random numbers.
+        engine (str): The turn engine to use (see `SBRSGame`).
+
+    Returns:
+        SBRSGame: The finished game.
+    """
+    try:
+        from .sbrs import SBRSGame
+    except ImportError:
+        from sbrs import SBRSGame
+    random.seed(seed)
+    game = SBRSGame(copy.deepcopy(config), [NullSink()], engine)
+    game.run_game()
+    return game
+
+
+def _run_games(config, seeds, engine) -> SBRSBatchResult:
+    result = SBRSBatchResult()
+    # Addons print while loading; keep workers quiet
+    with open(os.devnull, "w", encoding="utf-8") as devnull, contextlib.redirect_stdout(devnull):
+        for seed in seeds:
+            game = play_game(config, seed, engine)
+            result.add_game(
+                game_winner(game),
+                {player.name: player.kills for player in game.config.players},
+                game.turn,
+            )
+    return result
+
+
+def _init_worker(config, engine):
+    global _worker_config  # pylint: disable=global-statement
+    _worker_config = (config, engine)
+
+
+def _run_worker_games(seeds) -> SBRSBatchResult:
+    config, engine = _worker_config
+    return _run_games(config, seeds, engine)
+
+
+def run_batch(
+    config, games: int, workers: int | None = None, seed: int | None = None, engine: str = "auto"
+) -> SBRSBatchResult:
+    """
+    Plays many games of a config and combines their results.
+
+    The config is sent to each worker process once. Every game gets its
+    own seed derived from `seed`, so a batch with the same seed gives the
+    same result no matter how many workers run it.
+
+    Args:
+        config (SBRSConfig): The game configuration, from `basic_init()`.
+        games (int): How many games to play.
+        workers (int | None): How many processes to use. Defaults to the number
+            of CPUs. With 1, games are played in this process.
+        seed (int | None): The batch's seed. If None, a random one is used.
+        engine (str): The turn engine to use (see `SBRSGame`).
+
+    Returns:
+        SBRSBatchResult: The combined results.
+    """
+    if seed is None:
+        seed = random.SystemRandom().getrandbits(64)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    seeds = game_seeds(seed, games)
+    result = SBRSBatchResult(seed)
+
+    if workers <= 1 or games <= 1:
+        result.merge(_run_games(config, seeds, engine))
+        return result
+
+    # A few chunks per worker keeps them busy when some games run longer
+    chunk_size = max(1, games // (workers * 4))
+    chunks = [seeds[i:i + chunk_size] for i in range(0, games, chunk_size)]
+    with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(config, engine)) as pool:
+        for partial in pool.map(_run_worker_games, chunks):
+            result.merge(partial)
+    return result
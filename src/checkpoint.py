@@ -0,0 +1,291 @@
+"""
+Game checkpoints for SBRS.
+
+A checkpoint is a snapshot of a game between turns: the turn number,
+which players are alive (as a bitmap), everyone's kills, sudden death,
+addon_data and the random number generator's state. The order of the
+alive set is saved too, so a resumed game makes the same random picks
+as one that was never stopped.
+
+Checkpoints only hold the game's current state, never its history, so
+restoring one takes the same time no matter how many turns were played.
+
+Everything in a checkpoint is plain data (JSON and integer arrays), so
+loading one never runs code, even if it came from someone else. For the
+same reason, addon_data has to be JSON-compatible to be checkpointed, and
+comes back with lists in place of tuples.
+
+File layout (everything after the magic bytes is zlib-compressed):
+
+    MAGIC
+    header length (uint32), header (JSON)
+    alive bitmap        1 bit per player, in roster order
+    kills               uint32 per player
+    alive order         uint32 roster index per alive player
+    partition order     uint32 roster index per alive player, partition by partition
+    extra               JSON of the RNG states and addon_data
+"""
+
+import hashlib
+import json
+import os
+import struct
+import sys
+import threading
+import zlib
+from array import array
+
+try:
+    from .version import __version__
+except ImportError:
+    from version import __version__
+
+MAGIC = b"SBRSCKP2"
+"""The first bytes of every checkpoint file."""
+
+HEADER_LENGTH = struct.Struct("<I")
+
+
+def roster_hash(players) -> str:
+    """
+    Hashes a roster, so checkpoints are only restored into the game they were taken from.
+
+    Args:
+        players (list): The game's players, in roster order.
+
+    Returns:
+        str: The hash.
+    """
+    digest = hashlib.sha256()
+    for player in players:
+        digest.update(f"{player.name}\x1f{player.type}\x1f{player.team}\x1e".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def pack_bitmap(flags) -> bytes:
+    """
+    Packs booleans into bytes, 8 per byte, lowest bit first.
+
+    Args:
+        flags (list): The booleans.
+
+    Returns:
+        bytes: The bitmap.
+    """
+    bits = bytearray((len(flags) + 7) // 8)
+    for i, flag in enumerate(flags):
+        if flag:
+            bits[i >> 3] |= 1 << (i & 7)
+    return bytes(bits)
+
+
+def unpack_bitmap(bits: bytes, count: int) -> list:
+    """
+    Unpacks a bitmap made by `pack_bitmap()`.
+
+    Args:
+        bits (bytes): The bitmap.
+        count (int): How many booleans it holds.
+
+    Returns:
+        list: The booleans.
+    """
+    return [bool(bits[i >> 3] >> (i & 7) & 1) for i in range(count)]
+
+
+def encode_snapshot(header: dict, sections: dict) -> bytes:
+    """
+    Builds the contents of a checkpoint file.
+
+    Args:
+        header (dict): JSON-friendly information about the game.
+        sections (dict): Binary sections, by name. Written in the given order.
+
+    Returns:
+        bytes: The file contents.
+    """
+    header = {**header, "sbrs-version": __version__, "sections": [[name, len(data)] for name, data in sections.items()]}
+    header_bytes = json.dumps(header).encode("utf-8")
+    body = b"".join([HEADER_LENGTH.pack(len(header_bytes)), header_bytes, *sections.values()])
+    return MAGIC + zlib.compress(body, 6)
+
+
+def decode_snapshot(data: bytes) -> tuple:
+    """
+    Reads the contents of a checkpoint file.
+
+    Args:
+        data (bytes): The file contents.
+
+    Returns:
+        tuple: The header (dict) and the binary sections (dict).
+
+    Raises:
+        ValueError: If the data is not an SBRS checkpoint.
+    """
+    if not data.startswith(MAGIC):
+        raise ValueError("Not an SBRS checkpoint.")
+    body = zlib.decompress(data[len(MAGIC):])
+    (length,) = HEADER_LENGTH.unpack_from(body)
+    position = HEADER_LENGTH.size + length
+    header = json.loads(body[HEADER_LENGTH.size:position])
+    sections = {}
+    for name, size in header.pop("sections"):
+        sections[name] = body[position:position + size]
+        position += size
+    return header, sections
+
+
+def uint_array(values) -> bytes:
+    """
+    Args:
+        values (Iterable): Non-negative integers.
+
+    Returns:
+        bytes: The integers as little-endian uint32s.
+    """
+    values = array("I", values)
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values.tobytes()
+
+
+def read_uint_array(data: bytes) -> array:
+    """
+    Args:
+        data (bytes): Integers written by `uint_array()`.
+
+    Returns:
+        array: The integers.
+    """
+    values = array("I")
+    values.frombytes(data)
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values
+
+
+def write_atomic(path: str, data: bytes):
+    """
+    Writes a file so it is never left half-written: the data goes to a
+    temporary file first, which then replaces the target.
+
+    Args:
+        path (str): The file to write.
+        data (bytes): The contents.
+    """
+    temp = f"{path}.tmp"
+    with open(temp, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp, path)
+
+
+def encode_extra(extra: dict) -> bytes:
+    """
+    Args:
+        extra (dict): JSON-compatible data.
+
+    Returns:
+        bytes: The data as JSON.
+
+    Raises:
+        TypeError: If the data isn't JSON-compatible.
+    """
+    return json.dumps(extra, separators=(",", ":")).encode("utf-8")
+
+
+def decode_extra(data: bytes) -> dict:
+    """
+    Args:
+        data (bytes): Data from `encode_extra()`.
+
+    Returns:
+        dict: The data.
+    """
+    return json.loads(data)
+
+
+def random_state(state: list) -> tuple:
+    """
+    Turns the state of a `random.Random`, as stored by `encode_extra()`, back
+    into what `setstate()` takes.
+
+    Args:
+        state (list): The stored state.
+
+    Returns:
+        tuple: The state.
+    """
+    version, internal, gauss = state
+    return version, tuple(internal), gauss
+
+
+class SBRSCheckpointWriter:
+    """
+    Writes checkpoints on a background thread, one at a time.
+
+    Snapshots are taken by the game itself, so they always match a turn
+    boundary; only compressing and writing them happens in the background.
+    If a background write fails, its exception is raised by the next
+    `wait()`, `check()` or `write()`.
+    """
+
+    def __init__(self):
+        self._thread = None
+        self.error = None
+        """The exception raised by the last background write, if it failed."""
+
+    def write(self, path: str, header: dict, sections: dict, wait: bool = False):
+        """
+        Writes a checkpoint.
+
+        Args:
+            path (str): The file to write.
+            header (dict): The snapshot's header.
+            sections (dict): The snapshot's binary sections.
+            wait (bool): If True, write it now instead of in the background.
+
+        Raises:
+            Exception: If the previous background write failed.
+        """
+        self.wait()
+        if wait:
+            write_atomic(path, encode_snapshot(header, sections))
+            return
+        self._thread = threading.Thread(
+            target=self._run, args=(path, header, sections), name="sbrs-checkpoint", daemon=True
+        )
+        self._thread.start()
+
+    def wait(self):
+        """
+        Waits for the current background write to finish.
+
+        Raises:
+            Exception: If the background write failed.
+        """
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.check()
+
+    def check(self):
+        """
+        Raises the error of a background write that has already failed, without waiting.
+
+        Raises:
+            Exception: If the last background write failed.
+        """
+        if self.error is not None and (self._thread is None or not self._thread.is_alive()):
+            error = self.error
+            self.error = None
+            raise error
+
+    def _run(self, path, header, sections):
+        try:
+            write_atomic(path, encode_snapshot(header, sections))
+            self.error = None
+        except Exception as e:  # pylint: disable=broad-except
+            self.error = e
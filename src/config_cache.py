@@ -0,0 +1,235 @@
+"""
+Compiled config cache for SBRS.
+
+Loading a config parses its JSON, reads the roster files, compiles every
+message and builds all the players. Unless caching is turned off
+(`--no-cache`, or `basic_init(..., use_cache=False)`), the result of all
+that is saved in a cache folder of the user's own, and reused on the next launch as long as
+none of the files it came from have changed.
+
+Caches are pickles, and unpickling runs code, so they are never kept next
+to the config, where anyone who can share a config could drop one. They
+go in `$SBRS_CACHE_DIR`, or else the user's cache folder (`~/.cache/sbrs`,
+or `%LOCALAPPDATA%\\sbrs\\cache` on Windows), named after a hash of the
+config's path. On systems with file owners, caches that aren't owned by
+the user, or that other users can write to, are ignored.
+
+Files are checked by size and modification time first. Files that were
+touched but are the same size are hashed, so saving a file without
+changing it doesn't throw the cache away. The cache is also thrown away
+when the SBRS version changes.
+
+File layout:
+
+    MAGIC
+    header (pickle)     SBRS version, the config's path and the files it was loaded from
+    data (pickle)       config, players, playertypes, teams and messages
+"""
+
+import gc
+import hashlib
+import os
+import pickle
+
+try:
+    from .checkpoint import write_atomic
+    from .load_functions import default_messages_file, find_file, message_files
+    from .version import __version__
+except ImportError:
+    from checkpoint import write_atomic
+    from load_functions import default_messages_file, find_file, message_files
+    from version import __version__
+
+MAGIC = b"SBRSCFG1"
+"""The first bytes of every cache file."""
+
+CACHE_SUFFIX = ".sbrscache"
+"""The extension of cache files."""
+
+CACHE_DIR_VARIABLE = "SBRS_CACHE_DIR"
+"""The environment variable that overrides where caches are kept."""
+
+
+def cache_dir() -> str:
+    """
+    Returns:
+        str: The folder caches are kept in.
+    """
+    override = os.environ.get(CACHE_DIR_VARIABLE)
+    if override:
+        return override
+    if os.name == "nt":
+        return os.path.join(os.environ.get("LOCALAPPDATA") or os.path.expanduser("~"), "sbrs", "cache")
+    return os.path.join(os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"), "sbrs")
+
+
+def cache_path(configpath: str) -> str:
+    """
+    Args:
+        configpath (str): The path to the config file.
+
+    Returns:
+        str: The path to its cache.
+    """
+    key = hashlib.sha256(os.path.abspath(configpath).encode("utf-8")).hexdigest()[:32]
+    return os.path.join(cache_dir(), key + CACHE_SUFFIX)
+
+
+def is_private(path: str) -> bool:
+    """
+    Checks that only the current user could have written a file.
+
+    Args:
+        path (str): A file or folder.
+
+    Returns:
+        bool: False if it belongs to someone else, or others can write to it.
+            Always True on systems without file owners.
+    """
+    if not hasattr(os, "getuid"):
+        return True
+    stat = os.stat(path)
+    return stat.st_uid == os.getuid() and not stat.st_mode & 0o022
+
+
+def source_files(configpath: str, config: dict) -> list:
+    """
+    Lists the files a config is loaded from.
+
+    Args:
+        configpath (str): The path to the config file.
+        config (dict): The loaded config file.
+
+    Returns:
+        list: The absolute paths of the config file, its roster files and its message files.
+            Missing files are left out.
+    """
+    paths = [configpath]
+    files = config.get("files", {})
+    for key in ("roster", "players", "playertypes", "teams"):
+        if key in files:
+            paths.append(find_file(configpath, files[key]))
+    paths.extend(message_files(configpath, config))
+    if config.get("load-default-messages") is not False:
+        paths.append(default_messages_file(configpath))
+    return [os.path.abspath(path) for path in paths if path and os.path.exists(path)]
+
+
+def file_hash(path: str) -> str:
+    """
+    Args:
+        path (str): A file.
+
+    Returns:
+        str: The SHA-256 hash of its contents.
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def file_stamp(path: str) -> tuple:
+    """
+    Args:
+        path (str): A file.
+
+    Returns:
+        tuple: The file's path, modification time (in nanoseconds), size and hash.
+    """
+    stat = os.stat(path)
+    return (path, stat.st_mtime_ns, stat.st_size, file_hash(path))
+
+
+def is_current(stamp: tuple) -> bool:
+    """
+    Checks whether a file is unchanged since `file_stamp()` was called.
+
+    Args:
+        stamp (tuple): The file's stamp.
+
+    Returns:
+        bool: True if the file is unchanged.
+    """
+    path, mtime, size, digest = stamp
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return False
+    if stat.st_size != size:
+        return False
+    return stat.st_mtime_ns == mtime or file_hash(path) == digest
+
+
+def load_cache(configpath: str) -> tuple | None:
+    """
+    Loads a config from its cache.
+
+    Args:
+        configpath (str): The path to the config file.
+
+    Returns:
+        tuple | None: The config (dict), players, playertypes, teams and messages,
+            like `load_everything()`. None if there is no cache, or it is out of date.
+    """
+    path = cache_path(configpath)
+    try:
+        # Never unpickle a file someone else could have put there
+        if not (is_private(path) and is_private(os.path.dirname(path))):
+            return None
+        with open(path, "rb") as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                return None
+            header = pickle.load(f)
+            if (
+                header["version"] != __version__
+                or header["config"] != os.path.abspath(configpath)
+                or not all(is_current(stamp) for stamp in header["files"])
+            ):
+                return None
+            # Unpickling builds hundreds of thousands of objects, none of them garbage;
+            # collecting in the middle of it only costs time
+            enabled = gc.isenabled()
+            gc.disable()
+            try:
+                data = pickle.load(f)
+            finally:
+                if enabled:
+                    gc.enable()
+    except Exception:  # pylint: disable=broad-except
+        # A missing, corrupted or outdated cache is just rebuilt
+        return None
+    # Files that didn't exist when the cache was written might now
+    if [stamp[0] for stamp in header["files"]] != source_files(configpath, data[0]):
+        return None
+    return data
+
+
+def save_cache(configpath: str, data: tuple) -> bool:
+    """
+    Saves a loaded config to its cache.
+
+    Args:
+        configpath (str): The path to the config file.
+        data (tuple): The config (dict), players, playertypes, teams and messages.
+
+    Returns:
+        bool: True if the cache was written. Caches are skipped if they can't be
+            written, such as when the cache folder is read-only.
+    """
+    try:
+        os.makedirs(cache_dir(), mode=0o700, exist_ok=True)
+        header = {
+            "version": __version__,
+            "config": os.path.abspath(configpath),
+            "files": [file_stamp(path) for path in source_files(configpath, data[0])],
+        }
+        write_atomic(cache_path(configpath), b"".join([
+            MAGIC,
+            pickle.dumps(header, protocol=pickle.HIGHEST_PROTOCOL),
+            pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL),
+        ]))
+    except OSError:
+        return False
+    return True
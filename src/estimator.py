@@ -0,0 +1,304 @@
+"""
+Analytic estimates for free-for-all games.
+
+With the vanilla rules and no teams, how a game plays out only depends on
+the number of players, `attack-chance`, the `death-chances`, the action
+weights and sudden death. `estimate()` works out the distribution of game
+lengths and how many players survive each turn, without simulating any
+games.
+
+Each turn is modelled exactly: players act one at a time, in order, and
+players killed before their action don't get one. The number of players
+alive at the start of each turn is then a Markov chain. Games with more
+than `EXACT_LIMIT` players are followed with a normal approximation until
+few enough players are left for the exact chain.
+
+Players are interchangeable in this model, so everyone has the same
+chance of winning. (In real games, acting earlier in the roster is a
+very slight advantage.)
+
+    python sbrs.py config.json --estimate
+"""
+
+import json
+import math
+
+EXACT_LIMIT = 64
+"""Largest number of players the exact turn model is used for."""
+
+SUDDEN_DEATH_FRACTION = 0.1
+"""Sudden death starts when this fraction of the players (or fewer) are left."""
+
+MAX_TURNS = 100000
+"""The estimate stops after this many turns."""
+
+
+class SBRSEstimate:
+    """
+    Estimated outcome of a free-for-all game.
+
+    Attributes:
+        players (int): The number of players.
+        turns (list): `turns[t]` is the chance the game ends on turn `t + 1`.
+        survival (list): `survival[t]` is the chance a given player is still
+                         alive at the end of turn `t + 1`.
+        win_chance (float): Each player's chance of winning.
+    """
+
+    def __init__(self, players: int, turns: list, survival: list):
+        self.players = players
+        self.turns = turns
+        self.survival = survival
+        self.win_chance = 1 / players
+
+    def expected_turns(self) -> float:
+        """
+        Returns:
+            float: The average game length, in turns.
+        """
+        return sum(turn * chance for turn, chance in enumerate(self.turns, start=1))
+
+    def turn_percentile(self, fraction: float) -> int:
+        """
+        Args:
+            fraction (float): Between 0 and 1.
+
+        Returns:
+            int: The first turn by which at least `fraction` of games have ended.
+        """
+        total = 0.0
+        for turn, chance in enumerate(self.turns, start=1):
+            total += chance
+            if total >= fraction:
+                return turn
+        return len(self.turns)
+
+    def to_dict(self) -> dict:
+        """
+        Returns:
+            dict: The estimate as JSON-friendly data.
+        """
+        return {
+            "players": self.players,
+            "expected-turns": self.expected_turns(),
+            "median-turns": self.turn_percentile(0.5),
+            "win-chance": self.win_chance,
+            "turns": {str(turn): chance for turn, chance in enumerate(self.turns, start=1) if chance > 0},
+            "survival": self.survival,
+        }
+
+    def to_json(self, indent=4) -> str:
+        """
+        Returns:
+            str: The estimate as JSON.
+        """
+        return json.dumps(self.to_dict(), indent=indent)
+
+
+def _turn_table(limit: int, kill: float, die: float) -> list:
+    """
+    Works out how a single turn ends, for every number of players up to `limit`.
+
+    Args:
+        limit (int): The largest number of players.
+        kill (float): The chance that an acting player kills someone.
+        die (float): The chance that an acting player dies on their own.
+
+    Returns:
+        list: For `n` players at the start of the turn, `table[n]` is a pair of
+            the chance the game ends during the turn, and a list of the chances
+            of each number of players being left at its end.
+    """
+    stay = 1 - kill - die
+    # outcomes[u][a]: the turn's outcome when `u` alive players still have to
+    # act and `a` alive players already have
+    outcomes = [[None] * (limit + 1) for _ in range(limit + 1)]
+    for acted in range(limit + 1):
+        outcomes[0][acted] = (0.0, [0.0] * acted + [1.0])
+    for waiting in range(1, limit + 1):
+        for acted in range(limit + 1 - waiting):
+            alive = waiting + acted
+            if alive == 1:
+                outcomes[waiting][acted] = (1.0, [])
+                continue
+            left = [0.0] * (alive + 1)
+            if alive == 2:
+                # Any death ends the game
+                end = kill + die
+            else:
+                # Killing someone who hasn't acted yet, or someone who has
+                end = 0.0
+                if waiting >= 2:
+                    end += _mix(left, kill * (waiting - 1) / (alive - 1), outcomes[waiting - 2][acted + 1])
+                end += _mix(left, kill * acted / (alive - 1) + die, outcomes[waiting - 1][acted])
+            end += _mix(left, stay, outcomes[waiting - 1][acted + 1])
+            outcomes[waiting][acted] = (end, left)
+    return [outcomes[n][0] if n else (0.0, [1.0]) for n in range(limit + 1)]
+
+
+def _mix(left: list, chance: float, outcome: tuple) -> float:
+    """Adds an outcome's player counts to `left`, weighted by `chance`. Returns the weighted chance of the game ending."""
+    if not chance:
+        return 0.0
+    for count, count_chance in enumerate(outcome[1]):
+        left[count] += chance * count_chance
+    return chance * outcome[0]
+
+
+def survival_fraction(kill: float, die: float) -> float:
+    """
+    The expected fraction of players that survive a turn, for large games.
+
+    Args:
+        kill (float): The chance that an acting player kills someone.
+        die (float): The chance that an acting player dies on their own.
+
+    Returns:
+        float: The fraction of players alive at the end of a turn.
+    """
+    if die <= 0:
+        return math.exp(-kill)
+    return (1 - die) ** ((die + kill) / die)
+
+
+def _normal_chances(mean: float, variance: float, limit: int) -> list:
+    """Spreads a normal distribution over the whole numbers 0 to `limit`."""
+    deviation = math.sqrt(max(variance, 1e-12))
+    chances = [0.0] * (limit + 1)
+    previous = 0.0
+    for count in range(limit + 1):
+        cumulative = 0.5 * (1 + math.erf((count + 0.5 - mean) / (deviation * math.sqrt(2))))
+        chances[count] = cumulative - previous
+        previous = cumulative
+    chances[limit] += 1 - previous
+    return chances
+
+
+def estimate(
+    players: int,
+    attack_chance: float,
+    passive_death_chance: float,
+    attack_success_chance: float,
+    sudden_death: bool = True,
+    tolerance: float = 1e-12,
+    action_weights: tuple = (1, 1, 1),
+) -> SBRSEstimate:
+    """
+    Estimates how a free-for-all game with the vanilla rules plays out.
+
+    Args:
+        players (int): The number of players.
+        attack_chance (float): The config's `attack-chance`.
+        passive_death_chance (float): The config's passive death chance.
+        attack_success_chance (float): The config's attack death chance.
+        sudden_death (bool): Whether sudden death happens (it doesn't with classic behavior).
+        tolerance (float): The estimate stops once the chance the game is still going drops below this.
+        action_weights (tuple): The weights of the attack, passive and passive-death actions.
+
+    Returns:
+        SBRSEstimate: The estimate.
+
+    Raises:
+        ValueError: If there are fewer than two players, or nobody can ever die.
+    """
+    if players < 2:
+        raise ValueError("At least two players are needed.")
+    total = sum(action_weights)
+    if total <= 0:
+        raise ValueError("At least one action needs a positive weight.")
+    attack, _, passive_death = (weight / total for weight in action_weights)
+    kill = attack_chance * attack_success_chance * attack
+    die = passive_death_chance * passive_death
+    sudden_kill = attack
+    sudden_die = passive_death
+    if kill + die <= 0:
+        raise ValueError("Nobody can die with these chances, so the game never ends.")
+
+    threshold = players * SUDDEN_DEATH_FRACTION if sudden_death else -1
+    turns = []
+    survival = []
+
+    # Large games: follow the mean and variance of the number of players
+    # alive until it is small enough for the exact chain
+    mean = float(players)
+    variance = 0.0
+    in_sudden_death = False
+    while mean > EXACT_LIMIT and len(turns) < MAX_TURNS:
+        if not in_sudden_death and mean <= threshold:
+            in_sudden_death = True
+        rate = survival_fraction(*((sudden_kill, sudden_die) if in_sudden_death else (kill, die)))
+        variance = rate * rate * variance + rate * (1 - rate) * mean
+        mean *= rate
+        turns.append(0.0)
+        survival.append(mean / players)
+
+    limit = min(players, EXACT_LIMIT)
+    if players > EXACT_LIMIT:
+        start = _normal_chances(mean, variance, limit)
+    else:
+        start = [0.0] * limit + [1.0]
+    # Chances for the number of players alive, before and after sudden death began
+    normal = [0.0] * (limit + 1) if in_sudden_death else start
+    sudden = start if in_sudden_death else [0.0] * (limit + 1)
+    # Anyone left at 1 or 0 players already won during the large game phase
+    ended = normal[0] + normal[1] + sudden[0] + sudden[1]
+    normal[0] = normal[1] = sudden[0] = sudden[1] = 0.0
+    if turns:
+        turns[-1] += ended
+
+    normal_table = _turn_table(limit, kill, die)
+    sudden_table = _turn_table(limit, sudden_kill, sudden_die) if sudden_death else None
+    remaining = 1.0 - ended
+    while remaining > tolerance and len(turns) < MAX_TURNS:
+        # Sudden death is checked at the start of every turn
+        for count in range(2, limit + 1):
+            if normal[count] and count <= threshold:
+                sudden[count] += normal[count]
+                normal[count] = 0.0
+        next_normal = [0.0] * (limit + 1)
+        next_sudden = [0.0] * (limit + 1)
+        ended = 0.0
+        for chances, table, result in ((normal, normal_table, next_normal), (sudden, sudden_table, next_sudden)):
+            for count in range(2, limit + 1):
+                chance = chances[count]
+                if not chance:
+                    continue
+                end, left = table[count]
+                ended += chance * end
+                for left_count, left_chance in enumerate(left):
+                    result[left_count] += chance * left_chance
+        normal, sudden = next_normal, next_sudden
+        turns.append(ended)
+        remaining -= ended
+        alive = sum(count * (normal[count] + sudden[count]) for count in range(limit + 1))
+        # Games that ended this turn still have their winner alive
+        survival.append((alive + (1.0 - remaining)) / players)
+    return SBRSEstimate(players, turns, survival)
+
+
+def estimate_config(config) -> SBRSEstimate:
+    """
+    Estimates how a game of a loaded config plays out.
+
+    Args:
+        config (SBRSConfig): The game configuration.
+
+    Returns:
+        SBRSEstimate: The estimate.
+
+    Raises:
+        ValueError: If the config uses teams or per-player type action weights.
+    """
+    if config.use_teams:
+        raise ValueError("Estimates are only available for free-for-all games.")
+    weights = config.config.get("action-weights", {})
+    if any(isinstance(weight, dict) for weight in weights.values()):
+        raise ValueError("Estimates are only available when every player type uses the same action weights.")
+    return estimate(
+        len(config.players),
+        config.attack_chance,
+        config.passive_death_chance,
+        config.attack_success_chance,
+        sudden_death=not config.classic_behavior,
+        action_weights=tuple(weights.get(name, 1) for name in ("attack", "passive", "passive-death")),
+    )
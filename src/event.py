@@ -0,0 +1,41 @@
+"""
+    SBRSEvent object.
+"""
+
+class SBRSEvent:
+    """
+        Represents something that happened in a game, before it is turned into text.
+
+        Actions emit events with `SBRSGame.emit()`. Events are only rendered
+        into messages if a sink that consumes text is attached.
+
+        Attributes:
+            kind (str): What happened. Message types (such as "attack-success")
+                        use the matching messages; other kinds are engine messages
+                        (such as "new-turn") or "print" for raw `game_print()` text.
+            turn (int): The turn the event happened on.
+            actor (SBRSPlayer | SBRSTeam | None): Who caused the event.
+            target (SBRSPlayer | None): Who the event happened to, if anyone else.
+            template (SBRSMessageTemplate | None): The message to render the event with.
+            players (tuple): Extra players involved (for example, in passive messages).
+            amount (int | None): A number to show (kills, remaining players...).
+            label (str | None): Text to use instead of the actor's name, or the
+                                text of a "print" event.
+    """
+
+    __slots__ = ("kind", "turn", "actor", "target", "template", "players", "amount", "label")
+
+    def __init__(
+        self, kind, turn, actor=None, target=None, template=None, players=(), amount=None, label=None
+    ):  # pylint: disable=too-many-arguments
+        self.kind = kind
+        self.turn = turn
+        self.actor = actor
+        self.target = target
+        self.template = template
+        self.players = players
+        self.amount = amount
+        self.label = label
+
+    def __repr__(self):
+        return f"SBRSEvent({self.kind!r}, turn={self.turn}, actor={self.actor!r}, target={self.target!r})"
@@ -0,0 +1,327 @@
+"""
+Compact binary event logs for SBRS.
+
+`SBRSEventLogSink` writes a game's events to a `.sbrslog` file instead of
+rendering them as text. Each event is stored as a handful of integers
+(turn, kind, player index, target index, template id...) in an array, and
+the file is written as a streaming zlib-compressed sequence of frames, so
+it can be read back even if the game was stopped partway through.
+
+Names, kinds and message texts are written once, the first time they
+appear, and referred to by index afterwards.
+
+The log can be converted to JSONL or back to the usual human-readable text:
+
+    python event_log.py logs/sbrs-<timestamp>.sbrslog --jsonl out.jsonl
+    python event_log.py logs/sbrs-<timestamp>.sbrslog --text out.log
+"""
+
+import json
+import struct
+import sys
+import zlib
+from array import array
+
+try:
+    from .event import SBRSEvent
+    from .message_template import SBRSMessageTemplate
+    from .renderer import SBRSRenderer
+    from .version import __version__
+except ImportError:
+    from event import SBRSEvent
+    from message_template import SBRSMessageTemplate
+    from renderer import SBRSRenderer
+    from version import __version__
+
+MAGIC = b"SBRSLOG1"
+"""The first bytes of every event log file."""
+
+FRAME_HEADER = struct.Struct("<cI")
+"""Frame type and payload length."""
+
+FRAME_INFO = b"H"
+FRAME_STRING = b"S"
+FRAME_ENTITY = b"P"
+FRAME_EVENTS = b"E"
+
+NONE = -1
+"""Stored in place of a missing index."""
+
+NO_AMOUNT = -(2 ** 31)
+"""Stored in place of a missing amount."""
+
+EVENT_FIELDS = 8
+"""Integers stored per event before its extra players:
+turn, kind, actor, target, template, label, amount, number of extra players."""
+
+
+class SBRSEventLogSink:
+    """
+    An output sink that writes events to a compact binary log.
+
+    Attributes:
+        path (str): The file being written.
+    """
+
+    wants_text = False
+    wants_plain = False
+    wants_events = True
+
+    def __init__(self, path: str, info: dict | None = None, level: int = 6):
+        """
+        Args:
+            path (str): The file to write to. Overwritten if it exists.
+            info (dict | None): Extra information to store at the start of the log.
+            level (int): The zlib compression level.
+        """
+        self.path = path
+        self.file = open(path, "wb")  # pylint: disable=consider-using-with
+        self.file.write(MAGIC)
+        self._compressor = zlib.compressobj(level)
+        self._events = array("i")
+        self._frames = []
+        self._strings = {}
+        self._entities = {}
+        self._entity_refs = []
+        info = {"sbrs-version": __version__, **(info or {})}
+        self._frame(FRAME_INFO, json.dumps(info).encode("utf-8"))
+
+    def write(self, msg, plain):
+        pass
+
+    def write_event(self, event):
+        players = [self._entity(player) for player in event.players]
+        row = (
+            event.turn,
+            self._string(event.kind),
+            self._entity(event.actor),
+            self._entity(event.target),
+            NONE if event.template is None else self._string(event.template),
+            NONE if event.label is None else self._string(event.label),
+            NO_AMOUNT if event.amount is None else event.amount,
+            len(players),
+        )
+        # Definitions above may have flushed pending events, so look the array up afterwards
+        self._events.extend(row)
+        if players:
+            self._events.extend(players)
+
+    def flush(self):
+        if self._events:
+            self._frame(FRAME_EVENTS, self._events.tobytes())
+            self._events = array("i")
+        if self._frames:
+            data = self._compressor.compress(b"".join(self._frames))
+            self._frames.clear()
+            self.file.write(data + self._compressor.flush(zlib.Z_SYNC_FLUSH))
+            self.file.flush()
+
+    def close(self):
+        if not self.file.closed:
+            self.flush()
+            self.file.write(self._compressor.flush())
+            self.file.close()
+
+    def _frame(self, frame_type, payload):
+        # Pending events go first so every reference is defined before it's used
+        if frame_type != FRAME_EVENTS and self._events:
+            self._frames.append(FRAME_HEADER.pack(FRAME_EVENTS, len(self._events) * self._events.itemsize))
+            self._frames.append(self._events.tobytes())
+            self._events = array("i")
+        self._frames.append(FRAME_HEADER.pack(frame_type, len(payload)))
+        self._frames.append(payload)
+
+    def _string(self, text):
+        index = self._strings.get(text)
+        if index is None:
+            index = self._strings[text] = len(self._strings)
+            self._frame(FRAME_STRING, json.dumps([index, str(text)]).encode("utf-8"))
+        return index
+
+    def _entity(self, entity):
+        if entity is None:
+            return NONE
+        key = id(entity)
+        index = self._entities.get(key)
+        if index is None:
+            index = self._entities[key] = len(self._entity_refs)
+            # Keep a reference so the id can't be reused by another object
+            self._entity_refs.append(entity)
+            is_team = not hasattr(entity, "kills")
+            self._frame(FRAME_ENTITY, json.dumps([index, entity.name, is_team]).encode("utf-8"))
+        return index
+
+
+class LoggedEntity:
+    """
+    A player or team read back from an event log.
+
+    Attributes:
+        name (str): The player's or team's name.
+        is_team (bool): Whether this is a team.
+    """
+
+    def __init__(self, name: str, is_team: bool = False):
+        self.name = name
+        self.is_team = is_team
+
+    def __str__(self):
+        return self.name
+
+    def __repr__(self):
+        return self.name
+
+
+def read_event_log(path: str):
+    """
+    Reads the events in an event log.
+
+    Args:
+        path (str): The log file.
+
+    Returns:
+        tuple: The info stored at the start of the log (dict), and a generator
+            of `SBRSEvent`s. Players and teams are `LoggedEntity` objects and
+            templates are `SBRSMessageTemplate`s.
+
+    Raises:
+        ValueError: If the file is not an SBRS event log.
+    """
+    file = open(path, "rb")  # pylint: disable=consider-using-with
+    if file.read(len(MAGIC)) != MAGIC:
+        file.close()
+        raise ValueError(f"{path} is not an SBRS event log.")
+    frames = _read_frames(file)
+    frame_type, payload = next(frames, (None, None))
+    if frame_type != FRAME_INFO:
+        file.close()
+        raise ValueError(f"{path} is missing its header.")
+    return json.loads(payload), _read_events(file, frames)
+
+
+def _read_frames(file):
+    decompressor = zlib.decompressobj()
+    data = bytearray()
+    while True:
+        chunk = file.read(1 << 16)
+        if chunk:
+            data += decompressor.decompress(chunk)
+        # Walk the frames with an offset, and only drop the read ones once per chunk
+        offset = 0
+        while len(data) - offset >= FRAME_HEADER.size:
+            frame_type, length = FRAME_HEADER.unpack_from(data, offset)
+            start = offset + FRAME_HEADER.size
+            end = start + length
+            if len(data) < end:
+                break
+            yield frame_type, bytes(data[start:end])
+            offset = end
+        del data[:offset]
+        if not chunk:
+            return
+
+
+def _read_events(file, frames):
+    strings = {}
+    templates = {}
+    entities = {}
+    try:
+        for frame_type, payload in frames:
+            if frame_type == FRAME_STRING:
+                index, text = json.loads(payload)
+                strings[index] = text
+            elif frame_type == FRAME_ENTITY:
+                index, name, is_team = json.loads(payload)
+                entities[index] = LoggedEntity(name, is_team)
+            elif frame_type == FRAME_EVENTS:
+                values = array("i")
+                values.frombytes(payload)
+                i = 0
+                while i < len(values):
+                    turn, kind, actor, target, template, label, amount, count = values[i:i + EVENT_FIELDS]
+                    i += EVENT_FIELDS
+                    players = tuple(entities[player] for player in values[i:i + count])
+                    i += count
+                    if template != NONE and template not in templates:
+                        templates[template] = SBRSMessageTemplate(strings[template])
+                    yield SBRSEvent(
+                        strings[kind],
+                        turn,
+                        entities.get(actor),
+                        entities.get(target),
+                        templates.get(template),
+                        players,
+                        None if amount == NO_AMOUNT else amount,
+                        None if label == NONE else strings[label],
+                    )
+    finally:
+        file.close()
+
+
+def event_to_dict(event: SBRSEvent) -> dict:
+    """
+    Converts an event read from a log into a JSON-friendly dictionary.
+
+    Args:
+        event (SBRSEvent): The event.
+
+    Returns:
+        dict: The event's fields, with names instead of objects.
+    """
+    return {
+        "turn": event.turn,
+        "kind": event.kind,
+        "actor": None if event.actor is None else event.actor.name,
+        "target": None if event.target is None else event.target.name,
+        "template": None if event.template is None else str(event.template),
+        "players": [player.name for player in event.players],
+        "amount": event.amount,
+        "label": event.label,
+    }
+
+
+def convert_to_jsonl(path: str, out):
+    """
+    Writes an event log as JSON lines: one header line, then one line per event.
+
+    Args:
+        path (str): The log file.
+        out (TextIO): Where to write the JSON lines.
+    """
+    info, events = read_event_log(path)
+    out.write(json.dumps({"info": info}) + "\n")
+    for event in events:
+        out.write(json.dumps(event_to_dict(event)) + "\n")
+
+
+def convert_to_text(path: str, out):
+    """
+    Writes an event log as the same plain text a game log would contain.
+
+    Args:
+        path (str): The log file.
+        out (TextIO): Where to write the text.
+    """
+    _, events = read_event_log(path)
+    renderer = SBRSRenderer({}, False)
+    for event in events:
+        out.write(renderer.render_event(event)[1] + "\n")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Convert SBRS event logs")
+    parser.add_argument("log", help="Path to the .sbrslog file")
+    output = parser.add_mutually_exclusive_group()
+    output.add_argument("--jsonl", metavar="PATH", help="Write events as JSON lines ('-' for stdout)")
+    output.add_argument("--text", metavar="PATH", help="Write the human-readable log ('-' for stdout)")
+    args = parser.parse_args()
+
+    target = args.jsonl or args.text or "-"
+    convert = convert_to_jsonl if args.jsonl else convert_to_text
+    if target == "-":
+        convert(args.log, sys.stdout)
+    else:
+        with open(target, "w", encoding="utf-8") as f:
+            convert(args.log, f)
@@ -4,6 +4,7 @@ Load functions for SBRS.
 
 # pylint: disable=broad-exception-caught, broad-exception-raised
 
+import itertools
 import json
 import logging
 import os
@@ -11,17 +12,82 @@ import sys
 import time
 import traceback
 
-from colorama import Fore, Style
-
 try:
     from .version import __version__
+    from .message_template import compile_messages
     from .player import SBRSPlayer
+    from .player_table import SBRSPlayerTable
+    from .roster import read_lines, read_roster, roster_format, zip_roster
+    from .sbrs_config import Fore, Style
     from .team import SBRSTeam
 except ImportError:
     from version import __version__
+    from message_template import compile_messages
     from player import SBRSPlayer
+    from player_table import SBRSPlayerTable
+    from roster import read_lines, read_roster, roster_format, zip_roster
+    from sbrs_config import Fore, Style
     from team import SBRSTeam
 
+def find_file(configpath: str, filename: str) -> str | None:
+    """
+    Finds a file named in a config. It can be relative to the current
+    folder, or to the folder the config file is in.
+
+    Args:
+        configpath (str): The path to the config file.
+        filename (str): The file named in the config.
+
+    Returns:
+        str | None: The path to the file, or None if it doesn't exist.
+    """
+    if os.path.exists(filename):
+        return filename
+    path = os.path.join(os.path.dirname(configpath), filename)
+    if os.path.exists(path):
+        return path
+    return None
+
+
+def message_files(configpath: str, config: dict) -> list:
+    """
+    Args:
+        configpath (str): The path to the config file.
+        config (dict): The loaded config file.
+
+    Returns:
+        list: The paths to the config's extra message files.
+    """
+    files = []
+    for messagefile in config.get("extra-message-files", []):
+        # Find the path to the file
+        if not os.path.exists(messagefile):
+            messagefile = os.path.join(os.path.dirname(configpath), messagefile)
+        files.append(messagefile)
+    return files
+
+
+def default_messages_file(configpath: str) -> str | None:
+    """
+    Finds the default messages.json: in the current folder, next to the
+    config file, or next to SBRS itself.
+
+    Args:
+        configpath (str): The path to the config file.
+
+    Returns:
+        str | None: The path to messages.json, or None if there isn't one.
+    """
+    for path in (
+        "messages.json",
+        f"{os.path.dirname(configpath)}/messages.json",
+        f"{os.path.dirname(__file__)}/messages.json",
+    ):
+        if os.path.exists(path):
+            return path
+    return None
+
+
 def load_config(configpath: str) -> tuple:
     """
     Loads the config file.
@@ -32,9 +98,10 @@ def load_config(configpath: str) -> tuple:
     Returns:
         tuple: A tuple containing:
             config (dict): The loaded config file.
-            players (list): A list of players.
-            playertypes (list): A list of player types.
-            teams (list | None): A list of teams. None if teams mode is disabled.
+            players (Iterable): The player names, or (name, type, team) rows for a
+                combined roster. Files are read lazily, by `load_players()`.
+            playertypes (Iterable | None): The player types. None to use Default for all players.
+            teams (Iterable | None): The team names, one per player. None if teams mode is disabled.
     """
     try:
         with open(configpath, encoding="utf-8") as f:
@@ -54,95 +121,55 @@ def load_config(configpath: str) -> tuple:
             # so check there too
             if "files" in config:
                 try:
-                    # players
-                    if "players" in config["files"]:
-                        if os.path.exists(config["files"]["players"]):
-                            with open(
-                                config["files"]["players"], encoding="utf-8"
-                            ) as f:
-                                cfg_players = f.readlines()
-                        elif os.path.exists(
-                            os.path.join(
-                                os.path.dirname(configpath), config["files"]["players"]
-                            )
-                        ):
-                            with open(
-                                os.path.join(
-                                    os.path.dirname(configpath),
-                                    config["files"]["players"],
-                                ),
-                                encoding="utf-8",
-                            ) as f:
-                                cfg_players = f.readlines()
-                        else:
+                    files = config["files"]
+                    cfg_playertypes = None
+                    cfg_teams = None
+                    # combined roster (name, type and team in one file)
+                    if "roster" in files:
+                        roster_path = find_file(configpath, files["roster"])
+                        if roster_path is None:
                             raise FileNotFoundError(
-                                f"Players file ({config['files']['players']}) does not exist."
+                                f"Roster file ({files['roster']}) does not exist."
                             )
-                        cfg_players = [
-                            player.strip()
-                            for player in cfg_players
-                            if player.strip() != ""
-                        ]
+                        if roster_format(roster_path) is None:
+                            raise ValueError(
+                                f"Roster file ({files['roster']}) must end in .csv, .ndjson or .jsonl."
+                            )
+                        cfg_players = read_roster(roster_path)
 
-                    # playertypes
-                    if "playertypes" in config["files"]:
-                        if os.path.exists(config["files"]["playertypes"]):
-                            with open(
-                                config["files"]["playertypes"], encoding="utf-8"
-                            ) as f:
-                                cfg_playertypes = f.readlines()
-                        elif os.path.exists(
-                            os.path.join(
-                                os.path.dirname(configpath),
-                                config["files"]["playertypes"],
+                    # players
+                    elif "players" in files:
+                        players_path = find_file(configpath, files["players"])
+                        if players_path is None:
+                            raise FileNotFoundError(
+                                f"Players file ({files['players']}) does not exist."
                             )
-                        ):
-                            with open(
-                                os.path.join(
-                                    os.path.dirname(configpath),
-                                    config["files"]["playertypes"],
-                                ),
-                                encoding="utf-8",
-                            ) as f:
-                                cfg_playertypes = f.readlines()
+                        cfg_players = read_lines(players_path)
 
+                    # playertypes
+                    if "roster" in files:
+                        pass
+                    elif "playertypes" in files:
+                        playertypes_path = find_file(configpath, files["playertypes"])
+                        if playertypes_path is not None:
+                            cfg_playertypes = read_lines(playertypes_path)
                         else:
                             print(
-                                f"{Fore.YELLOW}Playertypes file ({config['files']['playertypes']}) does not exist. Defaulting to Default for all players."
+                                f"{Fore.YELLOW}Playertypes file ({files['playertypes']}) does not exist. Defaulting to Default for all players."
                             )
-                            cfg_playertypes = ["Default"] * len(cfg_players)
-                        cfg_playertypes = [
-                            playertype.strip()
-                            for playertype in cfg_playertypes
-                            if playertype.strip() != ""
-                        ]
-                        # replace empty playertypes with default
-                        cfg_playertypes = [
-                            "Default" if playertype == "" else playertype
-                            for playertype in cfg_playertypes
-                        ]
                     else:
                         print(
                             f"{Fore.YELLOW}Playertypes not specified in config file. Defaulting to Default for all players."
                         )
-                        cfg_playertypes = ["Default"] * len(cfg_players)
 
                     # teams
-                    if "teams" in config["files"] and use_teams:
-                        if os.path.exists(config["files"]["teams"]):
-                            with open(config["files"]["teams"], encoding="utf-8") as f:
-                                cfg_teams = f.readlines()
-                                cfg_teams = [
-                                    team.strip()
-                                    for team in cfg_teams
-                                    if team.strip() != ""
-                                ]
-                        else:
+                    if "teams" in files and "roster" not in files and use_teams:
+                        teams_path = find_file(configpath, files["teams"])
+                        if teams_path is None:
                             raise FileNotFoundError(
-                                f"Teams file ({config['files']['teams']}) does not exist."
+                                f"Teams file ({files['teams']}) does not exist."
                             )
-                    else:
-                        cfg_teams = None
+                        cfg_teams = read_lines(teams_path)
                 except Exception as e:
                     raise Exception(
                         f"Unable to parse files: {e.__class__.__name__}: {e}"
@@ -150,13 +177,14 @@ def load_config(configpath: str) -> tuple:
             else:
                 try:
                     cfg_players = config["players"]
+                    cfg_teams = None
                     try:
                         cfg_playertypes = config["playertypes"]
                     except KeyError:
                         print(
                             f"{Fore.YELLOW}Playertypes not specified in config file. Defaulting to Default."
                         )
-                        cfg_playertypes = ["Default"] * len(cfg_players)
+                        cfg_playertypes = None
                     if use_teams:
                         cfg_teams = config["teams"]
                 except Exception as e:
@@ -179,6 +207,7 @@ def load_config(configpath: str) -> tuple:
                     "end-turn",
                     "winner",
                     "most-kills",
+                    "team-dead",
                 ]:
                     if color not in message_colors:
                         message_colors[color] = "white"
@@ -212,36 +241,24 @@ def load_config(configpath: str) -> tuple:
                     "end-turn",
                     "winner",
                     "most-kills",
+                    "team-dead",
                 ]:
                     message_colors[color] = "white"
             messages = {}
             # Load extra message files
-            if "extra-message-files" in config:
-                for messagefile in config["extra-message-files"]:
-                    # Find the path to the file
-                    if not os.path.exists(messagefile):
-                        messagefile = os.path.join(
-                            os.path.dirname(configpath), messagefile
-                        )
-                    messages = {**messages, **load_messages(messagefile)}
+            for messagefile in message_files(configpath, config):
+                messages = {**messages, **load_messages(messagefile)}
             # Load default messages
+            default_messages = default_messages_file(configpath)
             if (
                 "load-default-messages" in config
                 and not config["load-default-messages"] is False
             ):
-                if os.path.exists("messages.json"):
-                    load_messages("messages.json")
-                elif os.path.exists(f"{os.path.dirname(configpath)}/messages.json"):
-                    load_messages(f"{os.path.dirname(configpath)}/messages.json")
-                elif os.path.exists(f"{os.path.dirname(__file__)}/messages.json"):
-                    load_messages(f"{os.path.dirname(__file__)}/messages.json")
+                if default_messages:
+                    load_messages(default_messages)
             elif not "load-default-messages" in config:
-                if os.path.exists("messages.json"):
-                    messages = {**messages, **load_messages("messages.json")}
-                elif os.path.exists(f"{os.path.dirname(configpath)}/messages.json"):
-                    messages = {**messages, **load_messages(f"{os.path.dirname(configpath)}/messages.json")}
-                elif os.path.exists(f"{os.path.dirname(__file__)}/messages.json"):
-                    messages = {**messages, **load_messages(f"{os.path.dirname(__file__)}/messages.json")}
+                if default_messages:
+                    messages = {**messages, **load_messages(default_messages)}
             # Additional settings go here...
             print(
                 f'{Fore.GREEN}Loaded config file "{configpath}" successfully.{Style.RESET_ALL}'
@@ -261,13 +278,13 @@ def load_config(configpath: str) -> tuple:
 
 # Load messages
 def load_messages(messagefile=None) -> dict:
-    """Loads messages from a JSON file."""
+    """Loads messages from a JSON file and compiles them into `SBRSMessageTemplate`s."""
     messages = {}
     try:
         if messagefile:
             if os.path.exists(messagefile):
                 with open(messagefile, encoding="utf-8") as f:
-                    messages.update(json.load(f))
+                    messages.update(compile_messages(json.load(f)))
             else:
                 print(
                     f"{Fore.YELLOW}Provided messages file ({messagefile}) does not exist. Skipping."
@@ -288,40 +305,64 @@ def load_messages(messagefile=None) -> dict:
     return messages
 
 
-def load_players(playernames, playertypes, teams: list, use_teams=False):
+def load_players(playernames, playertypes, teams, use_teams=False):
     """
     Builds the player list with SBRSPlayer objects from the previously loaded player files.
     Also builds the teams if specified.
 
+    Everything is done in one pass over the roster, so files returned by
+    `load_config()` are streamed rather than read into memory first.
+
     Args:
-        teams (list): List of teams to build.
-        cfg_playernames (list): List of player names to build.
-        cfg_playertypes (list): List of player types to build.
+        playernames (Iterable): The player names, or (name, type, team) rows from `read_roster()`.
+        playertypes (Iterable | None): The player types. Players past the end get "Default".
+        teams (Iterable | None): The team names, one per player.
+        use_teams (bool): If True, players are put in teams.
 
     Returns:
         tuple: A tuple containing:
             - players (list): A list of SBRSPlayer objects.
-            - remaining_players (list): A list of SBRSPlayer objects that were not loaded.
-            - teams (list): A list of SBRSTeam objects.
+            - teams (list | None): A list of SBRSTeam objects. None if teams mode is disabled.
+
+    Raises:
+        ValueError: If two players have the same name.
     """
     players = []
+    team_objects = {}
+    table = SBRSPlayerTable()
+    seen = set()
     try:
-        for player in playernames:
-            if use_teams:
-                if teams[playernames.index(player)] not in teams:
-                    teams.append(SBRSTeam(teams[playernames.index(player)]))
-            if player not in players:
-                try:
-                    target_type = playertypes[playernames.index(player)]
-                except IndexError:
-                    target_type = "Default"
-                players.append(
-                    SBRSPlayer(
-                        player,
-                        team=(teams[playernames.index(player)] if use_teams else None),
-                        playertype=target_type,
-                    )
+        names = iter(playernames)
+        first = next(names, None)
+        if first is None:
+            rows = ()
+        elif isinstance(first, tuple):
+            rows = itertools.chain([first], names)
+        else:
+            rows = zip_roster(
+                itertools.chain([first], names), playertypes, teams if use_teams else None
+            )
+        for name, playertype, team_name in rows:
+            if name in seen:
+                raise ValueError(
+                    f"Player names are not unique ({name} is listed more than once). \
+                    Please make sure player names are unique."
                 )
+            seen.add(name)
+            team = None
+            if use_teams:
+                if team_name is None:
+                    raise ValueError(f"No team given for player {name}.")
+                team = team_objects.get(team_name)
+                if team is None:
+                    team = team_objects[team_name] = SBRSTeam(team_name)
+            player = SBRSPlayer(name, team, playertype, table)
+            players.append(player)
+            if team is not None:
+                # Same as team.add_player(), for a player that is already on the team
+                team.players.append(player)
+                team.alive_count += 1
+        teams = list(team_objects.values()) if use_teams else None
         print(f"{Fore.GREEN}Players loaded successfully.")
     except Exception as e:
         print(
@@ -331,6 +372,8 @@ def load_players(playernames, playertypes, teams: list, use_teams=False):
         # sys.exit kills pytest for some unexplainable reason so wrap in main check
         if __name__ == "__main__":
             sys.exit(1)
+        else:
+            raise
     return players, teams
 
 
@@ -416,7 +459,7 @@ def load_everything(configpath=None, nosave=False) -> tuple:
         tuple: A tuple containing:
             - config (dict): The config file.
             - players (list): A list of SBRSPlayer objects.
-            - playertypes (list): A list of SBRSPlayer types.
+            - playertypes (list): Each player's type.
             - teams (list): A list of SBRSTeam objects.
             - messages (dict): The messages file.
             - sbrs_game_logger (logging.Logger | None): The logger for the game.
@@ -424,6 +467,8 @@ def load_everything(configpath=None, nosave=False) -> tuple:
     """
     config, players, playertypes, teams, messages = load_config(configpath)
     players, teams = load_players(players, playertypes, teams, config["use-teams"])
+    table = SBRSPlayerTable.adopt(players)
+    playertypes = [table.type_names[code] for code in table.types]
     sbrs_game_logger = initialize_logger(nosave, configpath)
     verification_checks(players, messages)
 
@@ -0,0 +1,219 @@
+"""
+    SBRSMessageTemplate object.
+"""
+
+import re
+
+PLACEHOLDER_PATTERN = re.compile(r"\{(player[1-4]?|target|amount)\}")
+"""Matches the placeholders SBRS fills in when rendering a message."""
+
+MAX_MESSAGE_PLAYERS = 4
+"""The highest `{playerN}` placeholder a message can use."""
+
+
+class SBRSMessageTemplate(str):
+    """
+        A message that has been split into literal text and placeholder slots.
+
+        Templates are still strings, so addons that use `str.replace()` on
+        messages keep working. The engine uses `render()` instead, which
+        fills every slot in a single join.
+
+        Attributes:
+            segments (tuple): Literal text and slot names, alternating. Even
+                              indexes are text, odd indexes are slot names.
+            slots (frozenset): The names of the slots the message uses.
+            player_count (int): The number of players the message needs,
+                                based on its highest `{playerN}` slot (at least 1).
+    """
+
+    def __new__(cls, text):
+        template = super().__new__(cls, text)
+        template.segments = tuple(PLACEHOLDER_PATTERN.split(text))
+        template.slots = frozenset(template.segments[1::2])
+        template.player_count = max(
+            [1] + [int(slot[6:]) for slot in template.slots if slot[6:].isdigit()]
+        )
+        return template
+
+    def __reduce__(self):
+        # Pickle the compiled segments, so loading a cached config doesn't parse every message again
+        return (_restore_template, (str(self), self.segments, self.player_count))
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        # Templates are never changed after they are built, so copies can share them
+        return self
+
+    def render(self, values: dict) -> str:
+        """
+            Fills in the message's slots.
+
+            Args:
+                values (dict): The text to put in each slot, by slot name.
+                               Slots without a value are left as they are.
+
+            Returns:
+                str: The rendered message.
+        """
+        parts = list(self.segments)
+        for i in range(1, len(parts), 2):
+            name = parts[i]
+            parts[i] = values[name] if name in values else f"{{{name}}}"
+        return "".join(parts)
+
+    def render_pair(self, values: dict) -> tuple:
+        """
+            Fills in the message's slots, building a colored and a plain version at once.
+
+            Args:
+                values (dict): An `(ansi, plain)` pair of text for each slot, by slot name.
+                               Slots without a value are left as they are.
+
+            Returns:
+                tuple: The rendered `(ansi, plain)` messages.
+        """
+        ansi_parts = list(self.segments)
+        plain_parts = list(self.segments)
+        for i in range(1, len(ansi_parts), 2):
+            name = ansi_parts[i]
+            if name in values:
+                ansi_parts[i], plain_parts[i] = values[name]
+            else:
+                ansi_parts[i] = plain_parts[i] = f"{{{name}}}"
+        return "".join(ansi_parts), "".join(plain_parts)
+
+
+def _restore_template(text: str, segments: tuple, player_count: int) -> SBRSMessageTemplate:
+    """
+        Rebuilds a pickled template from its compiled parts, without parsing it.
+    """
+    template = str.__new__(SBRSMessageTemplate, text)
+    template.segments = segments
+    template.slots = frozenset(segments[1::2])
+    template.player_count = player_count
+    return template
+
+
+def compile_messages(messages: dict) -> dict:
+    """
+        Compiles every message in a loaded messages file into an `SBRSMessageTemplate`.
+
+        Args:
+            messages (dict): The messages, by message type and player type.
+
+        Returns:
+            dict: The same dictionary, with the messages replaced by templates.
+    """
+    for player_types in messages.values():
+        for player_type, type_messages in player_types.items():
+            player_types[player_type] = [
+                message if isinstance(message, SBRSMessageTemplate)
+                else SBRSMessageTemplate(message)
+                for message in type_messages
+            ]
+    return messages
+
+
+def bucket_by_player_count(pool: list) -> list:
+    """
+        Groups messages by how many players they need.
+
+        Args:
+            pool (list): The compiled messages to group.
+
+        Returns:
+            list: A list where index `n` holds every message that needs at most `n` players.
+    """
+    return [
+        [message for message in pool if message.player_count <= count]
+        for count in range(MAX_MESSAGE_PLAYERS + 1)
+    ]
+
+
+class SBRSMessagePools:
+    """
+        Merged message pools, by message type and player type.
+
+        A player's messages are its own player type's messages followed by
+        the Default ones. Pools are merged once and then reused, so picking a
+        message is a single index into a flat list.
+
+        If messages are changed at runtime, the affected pools must be
+        invalidated. `SBRSGame.add_message()` does this automatically; code
+        that edits `SBRSConfig.messages` directly should call `invalidate()`.
+    """
+
+    def __init__(self, messages: dict, player_types=()):
+        """
+            Initializes the SBRSMessagePools object.
+
+            Args:
+                messages (dict): The compiled messages, by message type and player type.
+                player_types (iterable): Player types to build pools for right away.
+                                         Other player types are built when first used.
+        """
+        self.messages = messages
+        self._pools = {}
+        self._passive_pools = {}
+        for message_type, type_messages in messages.items():
+            for player_type in set(type_messages) | set(player_types):
+                self.get(message_type, player_type)
+
+    def get(self, message_type: str, player_type: str) -> list:
+        """
+            Gets the merged pool for a message type and player type.
+
+            Args:
+                message_type (str): The type of message.
+                player_type (str): The type of player.
+
+            Returns:
+                list: The messages to pick from.
+
+            Raises:
+                KeyError: If the message type does not exist.
+        """
+        pool = self._pools.get((message_type, player_type))
+        if pool is None:
+            type_messages = self.messages[message_type]
+            pool = list(type_messages.get("Default", []))
+            if player_type != "Default" and player_type in type_messages:
+                pool = type_messages[player_type] + pool
+            self._pools[(message_type, player_type)] = pool
+        return pool
+
+    def get_passive(self, player_type: str, max_players: int) -> list:
+        """
+            Gets the passive messages for a player type that need at most `max_players` players.
+
+            Args:
+                player_type (str): The type of player.
+                max_players (int): The number of players available for the message.
+
+            Returns:
+                list: The messages to pick from. May be empty.
+        """
+        buckets = self._passive_pools.get(player_type)
+        if buckets is None:
+            buckets = bucket_by_player_count(self.get("passive", player_type))
+            self._passive_pools[player_type] = buckets
+        return buckets[min(max_players, MAX_MESSAGE_PLAYERS)]
+
+    def invalidate(self, message_type: str | None = None):
+        """
+            Drops cached pools so they are rebuilt from `messages` on next use.
+
+            Args:
+                message_type (str | None): The message type to invalidate. None invalidates everything.
+        """
+        if message_type is None:
+            self._pools.clear()
+            self._passive_pools.clear()
+            return
+        for key in [key for key in self._pools if key[0] == message_type]:
+            del self._pools[key]
+        if message_type == "passive":
+            self._passive_pools.clear()
@@ -0,0 +1,278 @@
+"""
+Output sinks for SBRS.
+
+A sink receives every line printed by `SBRSGame.game_print()`, and/or the
+`SBRSEvent`s behind them. Sinks buffer what they receive and only write it
+out when flushed, which the game does at the end of every turn.
+
+Events are only rendered into text if at least one sink has `wants_text`
+set, so games without text sinks don't pay for building messages at all.
+"""
+
+import queue
+import sys
+import threading
+
+ANSI_RESET = "\x1b[0m"
+"""ANSI code that resets all colors."""
+
+
+class SBRSOutputSink:
+    """
+    Base class for output sinks.
+
+    Attributes:
+        wants_text (bool): If True, the sink receives rendered messages through `write()`.
+        wants_plain (bool): If True, the sink needs the plain (colorless) version of messages.
+        wants_events (bool): If True, the sink receives events through `write_event()`.
+    """
+
+    wants_text = True
+    wants_plain = False
+    wants_events = False
+
+    def write(self, msg: str, plain: str | None):
+        """
+        Receives a message. Sinks should buffer it until `flush()`.
+
+        Args:
+            msg (str): The message, possibly with color codes.
+            plain (str | None): The message without color codes. Only
+                guaranteed to be given if `wants_plain` is True.
+        """
+        raise NotImplementedError
+
+    def write_event(self, event):
+        """
+        Receives an event. Only called if `wants_events` is True.
+
+        Args:
+            event (SBRSEvent): The event.
+        """
+
+    def flush(self):
+        """Writes out any buffered messages."""
+
+    def close(self):
+        """Flushes the sink and releases anything it holds."""
+        self.flush()
+
+
+class ConsoleSink(SBRSOutputSink):
+    """
+    Prints messages to the console (or any text stream).
+    """
+
+    def __init__(self, stream=None, use_color=False):
+        """
+        Args:
+            stream (TextIO | None): The stream to write to. Defaults to the current `sys.stdout`.
+            use_color (bool): If True, colors are reset after every line so they
+                don't bleed into the next one.
+        """
+        self.stream = stream
+        self.use_color = use_color
+        self.buffer = []
+
+    def write(self, msg, plain):
+        self.buffer.append(msg)
+        if self.use_color:
+            self.buffer.append(ANSI_RESET)
+        self.buffer.append("\n")
+
+    def flush(self):
+        if self.buffer:
+            stream = self.stream if self.stream is not None else sys.stdout
+            stream.write("".join(self.buffer))
+            stream.flush()
+            self.buffer.clear()
+
+
+class FileSink(SBRSOutputSink):
+    """
+    Writes plain messages to a text file.
+    """
+
+    wants_plain = True
+
+    def __init__(self, path: str, mode: str = "a"):
+        """
+        Args:
+            path (str): The file to write to.
+            mode (str): The mode to open the file in.
+        """
+        self.file = open(path, mode, encoding="utf-8")  # pylint: disable=consider-using-with
+        self.buffer = []
+
+    def write(self, msg, plain):
+        self.buffer.append(plain)
+
+    def flush(self):
+        if self.buffer:
+            self.file.write("\n".join(self.buffer) + "\n")
+            self.file.flush()
+            self.buffer.clear()
+
+    def close(self):
+        self.flush()
+        self.file.close()
+
+
+class LoggerSink(SBRSOutputSink):
+    """
+    Writes plain messages to a `logging.Logger`, one logging call per flush.
+    """
+
+    wants_plain = True
+
+    def __init__(self, logger):
+        """
+        Args:
+            logger (logging.Logger): The logger to write to.
+        """
+        self.logger = logger
+        self.buffer = []
+
+    def write(self, msg, plain):
+        self.buffer.append(plain)
+
+    def flush(self):
+        if self.buffer:
+            self.logger.info("\n".join(self.buffer))
+            self.buffer.clear()
+
+
+class MemorySink(SBRSOutputSink):
+    """
+    Keeps messages in memory.
+
+    Attributes:
+        lines (list): The messages received so far.
+    """
+
+    def __init__(self, plain: bool = True):
+        """
+        Args:
+            plain (bool): If True, keep the plain versions of messages.
+        """
+        self.wants_plain = plain
+        self.lines = []
+
+    def write(self, msg, plain):
+        self.lines.append(plain if self.wants_plain else msg)
+
+
+class EventSink(SBRSOutputSink):
+    """
+    Keeps events in memory, without rendering any text.
+
+    Attributes:
+        events (list): The events received so far.
+    """
+
+    wants_text = False
+    wants_events = True
+
+    def __init__(self):
+        self.events = []
+
+    def write(self, msg, plain):
+        pass
+
+    def write_event(self, event):
+        self.events.append(event)
+
+
+class NullSink(SBRSOutputSink):
+    """
+    Throws everything away. Games with only null sinks never render messages.
+    """
+
+    wants_text = False
+
+    def write(self, msg, plain):
+        pass
+
+
+class BackgroundSink(SBRSOutputSink):
+    """
+    Hands messages to another sink on a background thread.
+
+    Messages are batched per flush and put on a bounded queue, which a
+    writer thread drains into the wrapped sink. Slow sinks (such as log
+    files) then don't hold up the game. If the queue fills up, `flush()`
+    waits for the writer to catch up.
+
+    If the wrapped sink raises, the writer thread throws away everything
+    after it, and the error is raised by the next `write()`, `flush()` or
+    `close()`.
+    """
+
+    _STOP = object()
+
+    def __init__(self, sink: SBRSOutputSink, max_batches: int = 64):
+        """
+        Args:
+            sink (SBRSOutputSink): The sink to write to.
+            max_batches (int): How many flushed batches can wait in the queue.
+        """
+        self.sink = sink
+        self.wants_text = sink.wants_text
+        self.wants_plain = sink.wants_plain
+        self.wants_events = sink.wants_events
+        self.buffer = []
+        self.queue = queue.Queue(max_batches)
+        self.error = None
+        self.thread = threading.Thread(target=self._run, name="sbrs-output", daemon=True)
+        self.thread.start()
+
+    def write(self, msg, plain):
+        self._check()
+        self.buffer.append((msg, plain))
+
+    def write_event(self, event):
+        self._check()
+        self.buffer.append((event, None))
+
+    def flush(self):
+        self._check()
+        if self.buffer:
+            self.queue.put(self.buffer)
+            self.buffer = []
+
+    def close(self):
+        if self.thread.is_alive():
+            if self.error is None:
+                self.flush()
+            self.buffer = []
+            self.queue.put(self._STOP)
+            self.thread.join()
+        self._check()
+
+    def _check(self):
+        """Raises the wrapped sink's error, if it has failed."""
+        if self.error is not None:
+            raise self.error
+
+    def _run(self):
+        while True:
+            batch = self.queue.get()
+            if batch is self._STOP:
+                if self.error is None:
+                    try:
+                        self.sink.close()
+                    except Exception as e:  # pylint: disable=broad-except
+                        self.error = e
+                return
+            if self.error is not None:
+                # Keep draining the queue, so flush() never waits on a dead sink
+                continue
+            try:
+                for msg, plain in batch:
+                    if isinstance(msg, str):
+                        self.sink.write(msg, plain)
+                    else:
+                        self.sink.write_event(msg)
+                self.sink.flush()
+            except Exception as e:  # pylint: disable=broad-except
+                self.error = e
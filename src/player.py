@@ -8,11 +8,19 @@ Copyright (c) 2024 Starlii10
 Insert license here
 """
 
-from team import SBRSTeam
+try:
+    from .player_table import SBRSPlayerTable
+    from .team import SBRSTeam
+except ImportError:
+    from player_table import SBRSPlayerTable
+    from team import SBRSTeam
 
 class SBRSPlayer:
     """
     Represents a player in SBRS.
+
+    Players are views onto a row of an `SBRSPlayerTable`, which holds the
+    actual data. Players created without a table get a table of their own.
     
     Attributes:
         name (str): The name of the player.
@@ -23,22 +31,108 @@ class SBRSPlayer:
         alive (bool): Whether or not the player is alive. If dead, the player's turn is skipped..
         kills (int): The number of kills the player has.
         addon_data (dict): A dictionary of data that addons can use.
+        alive_slot (int | None): The player's position in the game's alive set.
+                                 None if the player is dead or not in a game.
+        team_slot (int | None): The player's position in its team's partition of the alive set.
+                                None if the player is dead or not in a game.
+        row (int): The player's row in its table.
     """
 
+    __slots__ = ("_table", "_row", "alive_slot", "team_slot", "_alive_set")
+
     # Boring python class stuff
-    def __init__(self, name: str, team: SBRSTeam | None = None, playertype: str = "Default"):
-        self.name = name
+    def __init__(
+        self,
+        name: str,
+        team: SBRSTeam | None = None,
+        playertype: str = "Default",
+        table: SBRSPlayerTable | None = None,
+    ):
+        if table is None:
+            table = SBRSPlayerTable()
+        self._table = table
+        self._row = table.append(self, name, team, playertype)
+        self.alive_slot = None
+        """The player's position in the game's alive set. None if the player is dead or not in a game."""
+        self.team_slot = None
+        """The player's position in its team's partition of the alive set. None if the player is dead or not in a game."""
+        self._alive_set = None
+
+    @property
+    def name(self) -> str:
         """The name of the player."""
-        self.team = team
+        return self._table.names[self._row]
+
+    @name.setter
+    def name(self, value: str):
+        self._table.names[self._row] = value
+
+    @property
+    def team(self):
         """The team the player is on. If None, the player is not on a team (default for FFA)."""
-        self.type = playertype
+        team_id = self._table.teams[self._row]
+        return None if team_id < 0 else self._table.team_objects[team_id]
+
+    @team.setter
+    def team(self, value):
+        self._table.teams[self._row] = self._table.team_id(value)
+
+    @property
+    def type(self) -> str:
         """The player's type. Determines what type of messages to use. (default is "Default")."""
-        self.alive = True
+        return self._table.type_names[self._table.types[self._row]]
+
+    @type.setter
+    def type(self, value: str):
+        self._table.types[self._row] = self._table.type_code(value)
+
+    @property
+    def alive(self) -> bool:
         """Whether or not the player is alive. If dead, the player's turn is skipped.."""
-        self.kills = 0
+        return self._table.alive[self._row] == 1
+
+    @alive.setter
+    def alive(self, value: bool):
+        # Keep the game's alive set and team counts in step, like kill() does
+        if not value:
+            self.kill()
+            return
+        table = self._table
+        row = self._row
+        if table.alive[row]:
+            return
+        table.alive[row] = 1
+        team_id = table.teams[row]
+        if team_id >= 0 and isinstance(table.team_objects[team_id], SBRSTeam):
+            table.team_objects[team_id].alive_count += 1
+        if self._alive_set is not None:
+            self._alive_set.add(self)
+
+    @property
+    def kills(self) -> int:
         """The number of kills the player has."""
-        self.addon_data = {}
+        return self._table.kills[self._row]
+
+    @kills.setter
+    def kills(self, value: int):
+        self._table.kills[self._row] = value
+
+    @property
+    def addon_data(self) -> dict:
         """A dictionary of data that addons can use."""
+        data = self._table.addon_data.get(self._row)
+        if data is None:
+            data = self._table.addon_data[self._row] = {}
+        return data
+
+    @addon_data.setter
+    def addon_data(self, value: dict):
+        self._table.addon_data[self._row] = value
+
+    @property
+    def row(self) -> int:
+        """The player's row in its table."""
+        return self._row
 
     def __str__(self):
         return self.name
@@ -93,4 +187,13 @@ class SBRSPlayer:
 
     def kill(self):
         """Kills the player."""
-        self.alive = False
+        table = self._table
+        row = self._row
+        if not table.alive[row]:
+            return
+        table.alive[row] = 0
+        team_id = table.teams[row]
+        if team_id >= 0 and isinstance(table.team_objects[team_id], SBRSTeam):
+            table.team_objects[team_id].alive_count -= 1
+        if self._alive_set is not None:
+            self._alive_set.remove(self)
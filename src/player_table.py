@@ -0,0 +1,154 @@
+"""
+    SBRSPlayerTable object.
+"""
+
+from array import array
+
+
+class SBRSPlayerTable:
+    """
+        Stores the players of a game as columns, one row per player.
+
+        `SBRSPlayer` objects are small views onto a row, so per-player data
+        lives in a few compact arrays instead of millions of separate objects.
+        Code that works on the whole roster at once (such as the vector engine
+        and checkpoints) can use the columns directly.
+
+        Attributes:
+            names (list): Each player's name.
+            types (array): Each player's type, as an index into `type_names`.
+            type_names (list): The distinct player types.
+            teams (array): Each player's team, as an index into `team_objects`, or -1 for no team.
+            team_objects (list): The distinct teams.
+            alive (bytearray): 1 for each alive player, 0 for each dead one.
+            kills (array): Each player's kills.
+            addon_data (dict): Each player's addon data, by row. Only players whose
+                               addon data has been used have an entry.
+            players (list): The `SBRSPlayer` view for each row.
+    """
+
+    def __init__(self):
+        """
+            Initializes an empty SBRSPlayerTable object.
+        """
+        self.names = []
+        self.types = array("H")
+        self.type_names = []
+        self._type_codes = {}
+        self.teams = array("i")
+        self.team_objects = []
+        self._team_ids = {}
+        self.alive = bytearray()
+        self.kills = array("q")
+        self.addon_data = {}
+        self.players = []
+
+    def __len__(self):
+        return len(self.names)
+
+    def __getitem__(self, row):
+        return self.players[row]
+
+    def __iter__(self):
+        return iter(self.players)
+
+    def append(self, player, name: str, team, playertype: str, alive: bool = True, kills: int = 0) -> int:
+        """
+            Adds a row for a player. Called by `SBRSPlayer` itself.
+
+            Args:
+                player (SBRSPlayer): The view for the row.
+                name (str): The player's name.
+                team (SBRSTeam | None): The player's team.
+                playertype (str): The player's type.
+                alive (bool): Whether the player is alive.
+                kills (int): The player's kills.
+
+            Returns:
+                int: The new row.
+        """
+        row = len(self.names)
+        self.names.append(name)
+        self.types.append(self.type_code(playertype))
+        self.teams.append(self.team_id(team))
+        self.alive.append(1 if alive else 0)
+        self.kills.append(kills)
+        self.players.append(player)
+        return row
+
+    def type_code(self, playertype: str) -> int:
+        """
+            Args:
+                playertype (str): A player type.
+
+            Returns:
+                int: The type's index in `type_names`. New types are added.
+        """
+        code = self._type_codes.get(playertype)
+        if code is None:
+            code = self._type_codes[playertype] = len(self.type_names)
+            self.type_names.append(playertype)
+        return code
+
+    def team_id(self, team) -> int:
+        """
+            Args:
+                team (SBRSTeam | None): A team.
+
+            Returns:
+                int: The team's index in `team_objects`, or -1 for no team. New teams are added.
+        """
+        if team is None:
+            return -1
+        team_id = self._team_ids.get(team)
+        if team_id is None:
+            team_id = self._team_ids[team] = len(self.team_objects)
+            self.team_objects.append(team)
+        return team_id
+
+    def is_packed(self, players) -> bool:
+        """
+            Checks whether a list of players is exactly this table's rows, in order.
+
+            Args:
+                players (list): The players.
+
+            Returns:
+                bool: True if `players[i]` is row `i` of this table for every row.
+        """
+        return len(players) == len(self.players) and all(
+            a is b for a, b in zip(players, self.players)
+        )
+
+    @classmethod
+    def adopt(cls, players):
+        """
+            Returns a table whose rows are `players`, in order. If the players
+            already are such a table, it is returned. Otherwise, their data is
+            copied into a new table and the players become views onto it.
+
+            Args:
+                players (list): The players.
+
+            Returns:
+                SBRSPlayerTable: The table.
+        """
+        if players:
+            table = players[0]._table  # pylint: disable=protected-access
+            if table.is_packed(players):
+                return table
+        table = cls()
+        for player in players:
+            old_table, old_row = player._table, player._row  # pylint: disable=protected-access
+            row = table.append(
+                player,
+                old_table.names[old_row],
+                player.team,
+                player.type,
+                old_table.alive[old_row],
+                old_table.kills[old_row],
+            )
+            if old_row in old_table.addon_data:
+                table.addon_data[row] = old_table.addon_data[old_row]
+            player._table, player._row = table, row  # pylint: disable=protected-access
+        return table
@@ -0,0 +1,177 @@
+"""
+Timing instrumentation for SBRS.
+
+A profiled game times every action, every addon hook and the main parts
+of the engine, and reports how often each ran and how long it took:
+
+    python sbrs.py config.json --profile --report profile.json
+
+Or from Python:
+
+    game = SBRSGame(config, profiler=SBRSProfiler())
+    game.run_game()
+    print(game.profiler.format_report())
+
+Names start with what was timed: "action:" for actions, "hook:" for
+addon hooks (by addon module) and "phase:" for parts of the engine.
+Times are inclusive, so an action's time includes the messages it prints.
+
+Games without a profiler don't time anything.
+"""
+
+import json
+import random
+import time
+from array import array
+
+SAMPLE_LIMIT = 100000
+"""At most this many timings are kept per name for percentiles. Counts and totals are always exact."""
+
+
+class SBRSTimings:
+    """
+    The timings recorded for one name.
+
+    Attributes:
+        calls (int): How many times it ran.
+        total (float): The total time, in seconds.
+        longest (float): The longest single run, in seconds.
+        samples (array): Individual timings, for percentiles. A uniform sample
+                         once there are more than `SAMPLE_LIMIT`.
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.total = 0.0
+        self.longest = 0.0
+        self.samples = array("d")
+
+    def percentile(self, fraction: float) -> float:
+        """
+        Args:
+            fraction (float): Between 0 and 1.
+
+        Returns:
+            float: The time `fraction` of the runs took at most, in seconds.
+        """
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+    def to_dict(self) -> dict:
+        """
+        Returns:
+            dict: The timings as JSON-friendly data, in seconds.
+        """
+        return {
+            "calls": self.calls,
+            "total": self.total,
+            "mean": self.total / self.calls if self.calls else 0.0,
+            "p50": self.percentile(0.5),
+            "p90": self.percentile(0.9),
+            "p99": self.percentile(0.99),
+            "max": self.longest,
+        }
+
+
+class SBRSProfiler:
+    """
+    Records how long the parts of a game take.
+
+    Attributes:
+        timings (dict): An `SBRSTimings` for each name.
+    """
+
+    def __init__(self):
+        self.timings = {}
+        # Separate from the `random` module, so profiling doesn't change games
+        self._rng = random.Random(0)
+
+    def record(self, name: str, seconds: float):
+        """
+        Records one run of something.
+
+        Args:
+            name (str): What ran, such as "action:attack".
+            seconds (float): How long it took.
+        """
+        timings = self.timings.get(name)
+        if timings is None:
+            timings = self.timings[name] = SBRSTimings()
+        timings.calls += 1
+        timings.total += seconds
+        if seconds > timings.longest:
+            timings.longest = seconds
+        if len(timings.samples) < SAMPLE_LIMIT:
+            timings.samples.append(seconds)
+        else:
+            # Reservoir sampling keeps a uniform sample of every run
+            slot = self._rng.randrange(timings.calls)
+            if slot < SAMPLE_LIMIT:
+                timings.samples[slot] = seconds
+
+    def call(self, name: str, function, *args):
+        """
+        Calls a function and records how long it took.
+
+        Args:
+            name (str): The name to record it under.
+            function (Callable): The function.
+            *args: Arguments for the function.
+
+        Returns:
+            The function's return value.
+        """
+        start = time.perf_counter()
+        try:
+            return function(*args)
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def wrap(self, name: str, function):
+        """
+        Args:
+            name (str): The name to record calls under.
+            function (Callable): The function to time.
+
+        Returns:
+            Callable: A function that calls `function` and records how long it took.
+        """
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                self.record(name, time.perf_counter() - start)
+
+        timed.__wrapped__ = function
+        return timed
+
+    def to_dict(self) -> dict:
+        """
+        Returns:
+            dict: The timings for each name, slowest total first.
+        """
+        ordered = sorted(self.timings.items(), key=lambda item: item[1].total, reverse=True)
+        return {name: timings.to_dict() for name, timings in ordered}
+
+    def to_json(self, indent=4) -> str:
+        """
+        Returns:
+            str: The timings as a JSON report.
+        """
+        return json.dumps(self.to_dict(), indent=indent)
+
+    def format_report(self) -> str:
+        """
+        Returns:
+            str: The timings as a table, slowest total first. Times are in milliseconds.
+        """
+        lines = [f"{'name':<40} {'calls':>10} {'total':>10} {'mean':>9} {'p50':>9} {'p90':>9} {'p99':>9} {'max':>9}"]
+        for name, row in self.to_dict().items():
+            lines.append(
+                f"{name:<40} {row['calls']:>10} {row['total'] * 1000:>10.2f} {row['mean'] * 1000:>9.4f} "
+                + f"{row['p50'] * 1000:>9.4f} {row['p90'] * 1000:>9.4f} {row['p99'] * 1000:>9.4f} {row['max'] * 1000:>9.4f}"
+            )
+        return "\n".join(lines)
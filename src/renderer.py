@@ -0,0 +1,126 @@
+"""
+    SBRSRenderer object.
+"""
+
+import random
+
+try:
+    from .sbrs_config import COLOR_CODES
+except ImportError:
+    from sbrs_config import COLOR_CODES
+
+ENGINE_MESSAGES = {
+    "new-turn": ("Turn {turn} - {amount} players remaining\n", "new-turn"),
+    "team-dead": ("Team {actor} has been eliminated.\n", "team-dead"),
+    "no-deaths": ("No one died on this turn.\n", "passive"),
+    "nothing-happened": ("Nothing happened this turn.\n", "passive"),
+    "sudden-death": ("SUDDEN DEATH - All attacks are guaranteed to succeed\n", "attack-success"),
+    "game-stopped": ("\nGame stopped by user.", "end-turn"),
+}
+"""Text and message color for events that don't use messages from the messages file."""
+
+
+class SBRSRenderer:
+    """
+        Turns `SBRSEvent`s into messages.
+
+        Attributes:
+            color_table (dict): The ANSI color code for each message color.
+            use_color (bool): If False, messages are rendered without color codes.
+            random (random.Random): Picks messages, and the extra players shown in them.
+                                    Kept apart from the `random` module, so a game plays
+                                    the same whether or not anything is rendered.
+    """
+
+    def __init__(self, color_table: dict, use_color: bool, rng=None):
+        """
+            Initializes the SBRSRenderer object.
+
+            Args:
+                color_table (dict): The ANSI color code for each message color.
+                use_color (bool): If False, messages are rendered without color codes.
+                rng (random.Random | None): The random number generator for picking
+                                            messages. Defaults to a new, unseeded one.
+        """
+        self.color_table = color_table
+        self.use_color = use_color
+        self.random = rng if rng is not None else random.Random()
+
+    def render_message(self, message, color: str, values: dict) -> tuple:
+        """
+            Renders a message in a message color, with colored slot values.
+
+            Args:
+                message (SBRSMessageTemplate): The message to render.
+                color (str): The message color for the message.
+                values (dict): A `(text, message color)` pair for each slot, by slot name.
+
+            Returns:
+                tuple: The rendered `(ansi, plain)` messages.
+        """
+        if not self.use_color:
+            text = message.render({slot: value for slot, (value, _) in values.items()})
+            return text, text
+        table = self.color_table
+        base = table[color]
+        ansi, plain = message.render_pair({
+            slot: (table[value_color] + value + base, value)
+            for slot, (value, value_color) in values.items()
+        })
+        return base + ansi, plain
+
+    def render_event(self, event) -> tuple:
+        """
+            Turns an event into a message.
+
+            Args:
+                event (SBRSEvent): The event to render.
+
+            Returns:
+                tuple: The rendered `(ansi, plain)` messages.
+        """
+        if event.kind == "print":
+            return event.label, event.label
+        if event.template is None:
+            if event.kind == "end-turn":
+                if not self.use_color:
+                    return "------ TURN ENDED ------\n", "------ TURN ENDED ------\n"
+                return (
+                    f"------ {self.color_table['end-turn']}TURN ENDED {COLOR_CODES['white']}------\n",
+                    "------ TURN ENDED ------\n",
+                )
+            text, color = ENGINE_MESSAGES[event.kind]
+            text = text.format(turn=event.turn, amount=event.amount, actor=event.actor)
+            return (self.color_table[color] if self.use_color else "") + text, text
+        if event.kind == "most-kills":
+            return self._render_most_kills(event)
+        values = {}
+        if event.actor is not None or event.label is not None:
+            values["player"] = (event.label if event.label is not None else event.actor.name, "generic-player")
+        if event.target is not None:
+            values["target"] = (event.target.name, "target-player")
+        for i, player in enumerate(event.players, start=1):
+            values[f"player{i}"] = (player.name, "generic-player")
+        if event.amount is not None:
+            values["amount"] = (str(event.amount), "generic-player")
+        return self.render_message(event.template, event.kind, values)
+
+    def _render_most_kills(self, event) -> tuple:
+        generic = self.color_table['generic-player'] if self.use_color else ""
+        most = self.color_table['most-kills'] if self.use_color else ""
+        names = [player.name for player in event.players]
+        if len(names) == 1:
+            players_plain = names[0]
+            players_ansi = f"{generic}{names[0]}{most}"
+        elif len(names) == 2:
+            players_plain = f"{names[0]} and {names[1]}"
+            players_ansi = f"{generic}{names[0]} {most}and {generic}{names[1]}{most}"
+        else:
+            players_plain = ", ".join(names[:-1]) + f", and {names[-1]}"
+            players_ansi = "".join(f"{generic}{name}{most}, " for name in names[:-1])
+            players_ansi += f"{most}and {generic}{names[-1]}{most}"
+        ansi, plain = event.template.render_pair({
+            "player": (players_ansi, players_plain),
+            "amount": (f"{generic}{event.amount}{most}", str(event.amount)),
+        })
+        return most + ansi, plain
@@ -0,0 +1,171 @@
+"""
+Roster files for SBRS.
+
+Rosters can be given as up to three plain text files with one entry per
+line (players, playertypes and teams), or as one combined file with a row
+per player:
+
+    players.csv      name,type,team
+                     Alice,Default,Red
+                     Bob,,Blue
+
+    players.ndjson   {"name": "Alice", "type": "Default", "team": "Red"}
+                     {"name": "Bob", "team": "Blue"}
+
+The "type" and "team" columns are optional. Every file is read lazily, one
+line at a time, so a roster is loaded in a single pass without keeping
+whole files in memory. Large files are memory-mapped.
+"""
+
+import csv
+import json
+import mmap
+import os
+
+MMAP_MIN_BYTES = 1 << 20
+"""Files at least this large are memory-mapped by default."""
+
+ROSTER_FORMATS = {".csv": "csv", ".ndjson": "ndjson", ".jsonl": "ndjson"}
+"""Combined roster formats, by file extension."""
+
+
+def read_lines(path: str, use_mmap: bool | None = None):
+    """
+    Reads the non-empty lines of a text file, with surrounding whitespace removed.
+
+    Args:
+        path (str): The file.
+        use_mmap (bool | None): Whether to memory-map the file. None (default)
+            maps files of at least `MMAP_MIN_BYTES`.
+
+    Yields:
+        str: Each non-empty line.
+    """
+    if use_mmap is None:
+        use_mmap = os.path.getsize(path) >= MMAP_MIN_BYTES
+    if use_mmap and os.path.getsize(path) > 0:
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            for line in iter(mapped.readline, b""):
+                line = line.decode("utf-8").strip()
+                if line:
+                    yield line
+        return
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield line
+
+
+def roster_format(path: str) -> str | None:
+    """
+    Args:
+        path (str): A roster file.
+
+    Returns:
+        str | None: "csv" or "ndjson", or None if the file is not a combined roster.
+    """
+    return ROSTER_FORMATS.get(os.path.splitext(path)[1].lower())
+
+
+def read_roster(path: str, use_mmap: bool | None = None):
+    """
+    Reads a combined CSV or NDJSON roster file.
+
+    Args:
+        path (str): The roster file.
+        use_mmap (bool | None): Whether to memory-map the file (see `read_lines()`).
+
+    Yields:
+        tuple: The name, type and team of each player. Missing or empty
+            types are "Default", and missing or empty teams are None.
+
+    Raises:
+        ValueError: If the file is not a valid roster.
+    """
+    kind = roster_format(path)
+    if kind is None:
+        raise ValueError(f"Roster file ({path}) must end in .csv, .ndjson or .jsonl.")
+    lines = read_lines(path, use_mmap)
+    if kind == "ndjson":
+        for number, line in enumerate(lines, start=1):
+            row = json.loads(line)
+            if not isinstance(row, dict) or not row.get("name"):
+                raise ValueError(f"Roster file ({path}) line {number} has no player name.")
+            # Clean up types and teams the same way as in CSV rosters
+            playertype = _cell(row.get("type"))
+            team = _cell(row.get("team"))
+            yield str(row["name"]).strip(), playertype or "Default", team or None
+        return
+
+    rows = csv.reader(lines)
+    header = [column.strip().lower() for column in next(rows, [])]
+    if "name" not in header:
+        raise ValueError(f'Roster file ({path}) needs a header row with a "name" column.')
+    name_column = header.index("name")
+    type_column = header.index("type") if "type" in header else None
+    team_column = header.index("team") if "team" in header else None
+    for row in rows:
+        row += [""] * (len(header) - len(row))
+        name = row[name_column].strip()
+        if not name:
+            continue
+        playertype = row[type_column].strip() if type_column is not None else ""
+        team = row[team_column].strip() if team_column is not None else ""
+        yield name, playertype or "Default", team or None
+
+
+def _cell(value) -> str:
+    """Turns an NDJSON value into text like a CSV cell: stripped, and empty if missing."""
+    return "" if value is None else str(value).strip()
+
+
+def zip_roster(playernames, playertypes=None, teams=None):
+    """
+    Combines separate player, playertype and team lists into roster rows.
+
+    Args:
+        playernames (Iterable): The player names.
+        playertypes (Iterable | None): The player types. Players past the end get "Default".
+        teams (Iterable | None): The team names, one per player. None if teams mode is disabled.
+
+    Yields:
+        tuple: The name, type and team of each player.
+
+    Raises:
+        ValueError: If there are fewer teams than players.
+    """
+    types = iter(playertypes or ())
+    team_names = iter(teams) if teams is not None else None
+    for name in playernames:
+        playertype = next(types, None) or "Default"
+        team = None
+        if team_names is not None:
+            team = next(team_names, None)
+            if team is None:
+                raise ValueError(f"No team given for player {name}.")
+        yield name, playertype, team
+
+
+def write_roster(path: str, rows):
+    """
+    Writes a combined roster file. The format is picked from the extension.
+
+    Args:
+        path (str): The file to write.
+        rows (Iterable): The name, type and team of each player.
+    """
+    kind = roster_format(path)
+    if kind is None:
+        raise ValueError(f"Roster file ({path}) must end in .csv, .ndjson or .jsonl.")
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        if kind == "ndjson":
+            for name, playertype, team in rows:
+                row = {"name": name, "type": playertype}
+                if team is not None:
+                    row["team"] = team
+                f.write(json.dumps(row) + "\n")
+            return
+        writer = csv.writer(f, lineterminator="\n")
+        writer.writerow(["name", "type", "team"])
+        writer.writerows((name, playertype, team or "") for name, playertype, team in rows)
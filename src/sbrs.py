@@ -11,28 +11,51 @@ Insert license here
 # I'm not dealing with all of this. SO
 # pylint: disable=redefined-outer-name, global-statement
 
-import argparse
-import importlib
-import os
 import random
+import re
 import sys
+import time
 import traceback
+from array import array
 from typing import Union
 
-import colorama
-from colorama import Back, Fore, Style
-
 # Use relative imports if installed as a package
 try:
     from .action import SBRSAction
+    from .alias_table import SBRSAliasTable
+    from .addon_loader import addon_hooks, addon_manifest, base_addon_class
+    from .alive_set import SBRSAliveSet
     from .version import __version__
-    from .load_functions import load_everything
-    from .sbrs_config import SBRSConfig
+    from .load_functions import initialize_logger, load_everything
+    from .message_template import SBRSMessagePools, SBRSMessageTemplate
+    from .event import SBRSEvent
+    from .config_cache import load_cache, save_cache
+    from .output_sinks import BackgroundSink, ConsoleSink, EventSink, LoggerSink, SBRSOutputSink
+    from .profiler import SBRSProfiler
+    from .player_table import SBRSPlayerTable
+    from .renderer import SBRSRenderer
+    from .sbrs_config import Fore, SBRSConfig
+    from .team import SBRSTeam
+    from .turn_summary import SBRSTurnSummary, game_winner
+    from .vector_engine import AUTO_MIN_PLAYERS, SBRSVectorEngine
 except ImportError:
     from action import SBRSAction
+    from alias_table import SBRSAliasTable
+    from addon_loader import addon_hooks, addon_manifest, base_addon_class
+    from alive_set import SBRSAliveSet
     from version import __version__
-    from load_functions import load_everything
-    from sbrs_config import SBRSConfig
+    from load_functions import initialize_logger, load_everything
+    from message_template import SBRSMessagePools, SBRSMessageTemplate
+    from event import SBRSEvent
+    from config_cache import load_cache, save_cache
+    from output_sinks import BackgroundSink, ConsoleSink, EventSink, LoggerSink, SBRSOutputSink
+    from profiler import SBRSProfiler
+    from player_table import SBRSPlayerTable
+    from renderer import SBRSRenderer
+    from sbrs_config import Fore, SBRSConfig
+    from team import SBRSTeam
+    from turn_summary import SBRSTurnSummary, game_winner
+    from vector_engine import AUTO_MIN_PLAYERS, SBRSVectorEngine
 
 # Python version check
 if sys.version_info[0] < 3 or sys.version_info[1] < 10:
@@ -40,10 +63,11 @@ if sys.version_info[0] < 3 or sys.version_info[1] < 10:
         "Python 3.10 or above is required to run SBRS."
     )
 
-colorama.init(autoreset=True)
+ANSI_PATTERN = re.compile(r"\x1b\[[0-9;]*m")
+"""Matches ANSI color codes, for stripping them from messages."""
 
 DEFAULT_COLORS = {
-    f"{color}: white"
+    color: "white"
     for color in [
         "passive",
         "passive-death",
@@ -56,25 +80,77 @@ DEFAULT_COLORS = {
         "end-turn",
         "winner",
         "most-kills",
+        "team-dead",
     ]
 }
 
 
+GAME_HOOKS = {
+    "start_turn": ("start_turn", "begin_turn"),
+    "pre_action": ("pre_action",),
+    "post_action": ("post_action",),
+    "end_turn": ("end_turn",),
+    "game_over": ("game_over", "end_game"),
+}
+"""The hooks in `SBRSGame.hooks`, and the addon methods called for each."""
+
+PROFILED_PHASES = {
+    "turn": "simulate_turn",
+    "vector-turn": "_play_vector_turn",
+    "after-action": "after_action",
+    "game-over": "game_over",
+    "emit": "emit",
+    "render": "render_event",
+    "game-print": "game_print",
+    "flush-output": "flush_output",
+    "checkpoint": "checkpoint",
+}
+"""Engine phases timed by `SBRSGame.profiler`, and the methods they time."""
+
+_colorama_initialized = False
+
+
 # Basic functions
-def basic_init(configpath, nosave):
+def init_colors():
+    """
+    Wraps stdout with colorama so ANSI colors work on every terminal.
+    Only needed when printing colors to a terminal; does nothing if called again.
+    """
+    global _colorama_initialized
+    if not _colorama_initialized:
+        import colorama  # pylint: disable=import-outside-toplevel
+
+        colorama.init(autoreset=True)
+        _colorama_initialized = True
+
+
+def basic_init(configpath, nosave, color=None, use_cache=True):
     """
     Fully loads a configuration file. Should be passed to `SBRSGame` to initialize the game.
 
     Args:
         configpath (str): The path to the config file.
         nosave (bool): If True, the game will not be saved.
+        color (bool | None): If True, messages are printed with colors. If False,
+            messages are built without any color codes. None (default) enables
+            colors only when stdout is a terminal.
+        use_cache (bool): If True (default), the loaded config is cached in the user's
+            cache folder and reused until any of its files change (see config_cache.py).
 
     Returns:
         SBRSConfig: The game configuration.
     """
-    config, players, playertypes, teams, messages, sbrs_game_logger = load_everything(
-        configpath, nosave
-    )
+    cached = load_cache(configpath) if use_cache else None
+    if cached is not None:
+        config, players, playertypes, teams, messages = cached
+        print(f'{Fore.GREEN}Loaded config file "{configpath}" from cache.')
+        sbrs_game_logger = initialize_logger(nosave, configpath)
+    else:
+        config, players, playertypes, teams, messages, sbrs_game_logger = load_everything(
+            configpath, nosave
+        )
+        if use_cache:
+            save_cache(configpath, (config, players, playertypes, teams, messages))
 
     # Config variables
     message_colors = (
@@ -91,6 +167,11 @@ def basic_init(configpath, nosave):
         config["show-kills-only"] if "show-kills-only" in config else False
     )
 
+    if color is None:
+        color = sys.stdout.isatty()
+    if color:
+        init_colors()
+
     return SBRSConfig(
         config=config,
         players=players,
@@ -99,6 +180,7 @@ def basic_init(configpath, nosave):
         messages=messages,
         sbrs_game_logger=sbrs_game_logger,
         message_colors=message_colors,
+        use_color=color,
         classic_behavior=classic_behavior,
         sudden_death=sudden_death,
         passive_death_chance=passive_death_chance,
@@ -120,73 +202,135 @@ class SBRSGame:
         addons (list): A list of loaded addons.
         actions (list): A list of actions that can be chosen from.
         config (SBRSConfig): The game configuration.
-        remaining_players (list): A list of remaining players in the game.
+        alive (SBRSAliveSet): The players that are still alive.
+        remaining_players (SBRSAliveView): A read-only view of the remaining players in the game.
+        remaining_teams (int): The number of teams that still have alive players.
+        message_pools (SBRSMessagePools): Merged message pools, by message type and player type.
+        renderer (SBRSRenderer): Turns events into messages.
+        sinks (list): The output sinks that receive printed messages.
         turn (int): The current turn number.
         sudden_death (bool): If True, sudden death is enabled.
+        sudden_death_at (float | None): Sudden death starts once this many players are left.
         something_happened (bool): If True, a game print happened this turn.
         finished (bool): If True, the game is finished and should exit.
+        checkpoint_path (str | None): If set, checkpoints are saved here while the game runs.
+        checkpoint_every (int): How many turns to wait between checkpoints.
+        engine (str): Which turn engine to use: "python", "vector" or "auto".
+        vector_engine (SBRSVectorEngine | None): The vector engine, once it has been used.
+        profiler (SBRSProfiler | None): Records how long actions, hooks and engine phases take.
     """
 
-    def __init__(self, config):
+    def __init__(self, config, sinks=None, engine="auto", profiler=None):
         """
             NOTE: This function is also responsible for loading addons.
+
+            Args:
+                config (SBRSConfig): The game configuration.
+                sinks (list | None): The output sinks to print to. Defaults to the
+                    console, plus the game logger if there is one.
+                engine (str): Which turn engine to use. "python" plays players one at
+                    a time. "vector" resolves whole turns with NumPy, but only supports
+                    the vanilla actions. "auto" (default) uses the vector engine for large
+                    turns when NumPy is installed and no addon has changed the actions.
+                profiler (SBRSProfiler | None): If given, every action, addon hook and engine
+                    phase is timed (see profiler.py). Slows the game down slightly.
         """
         self.addons: list = []
         """A list of loaded addons."""
         self.actions: list = []
         """A list of actions that can be chosen from."""
+        self._action_tables: dict | None = None
+        self._action_count: int = 0
+        self._weighted_types: set = set()
+        # Weights are checked once every addon has added its actions
+        self._check_actions: bool = False
         self.config: SBRSConfig = config
         """The game configuration."""
-        self.remaining_players: list = config.players
-        """A list of remaining players in the game."""
+        self.player_table: SBRSPlayerTable = SBRSPlayerTable.adopt(config.players)
+        """The players' data, one row per player in roster order."""
+        self.alive: SBRSAliveSet = SBRSAliveSet(config.players)
+        """The players that are still alive. Updated by `SBRSPlayer.kill()`."""
+        self._remaining_players = self.alive.view()
+        self.message_pools: SBRSMessagePools = SBRSMessagePools(
+            config.messages, set(player.type for player in config.players)
+        )
+        """Merged message pools. Call `message_pools.invalidate()` after editing `config.messages` directly."""
+        # Seeded from `random`, so seeded games pick the same messages too
+        self.renderer: SBRSRenderer = SBRSRenderer(
+            config.color_table, config.use_color, random.Random(random.getrandbits(64))
+        )
+        """Turns events into messages."""
+        if sinks is None:
+            sinks = [ConsoleSink(use_color=config.use_color)]
+            if config.sbrs_game_logger:
+                sinks.append(LoggerSink(config.sbrs_game_logger))
+        self.sinks: list = list(sinks)
+        """The output sinks that receive printed messages."""
+        self._text_sinks: list = []
+        self._event_sinks: list = []
+        self._wants_plain: bool = False
+        self._update_sinks()
         self.sudden_death: bool = False
         """Whether sudden death is enabled."""
+        self.sudden_death_at: float | None = len(config.players) * 0.1
+        """
+        Sudden death starts once this many players (or fewer) are left. None if
+        something else decides when it starts, such as the arena controller (see arena.py).
+        """
         self.something_happened: bool = False
         """Whether a game print happened this turn."""
         self.turn: int = 0
         """The current turn number."""
         self.finished: bool = False
         """Whether the game is finished."""
+        self.checkpoint_path: str | None = None
+        """If set, checkpoints are saved here while the game runs."""
+        self.checkpoint_every: int = 10
+        """How many turns to wait between checkpoints."""
+        self._checkpoint_writer = None
+        if engine not in ("python", "vector", "auto"):
+            raise ValueError(f"Unknown engine \"{engine}\".")
+        self.engine: str = engine
+        """Which turn engine to use: "python", "vector" or "auto"."""
+        self.vector_engine: SBRSVectorEngine | None = None
+        """The vector engine, once it has been used."""
+        self.profiler: SBRSProfiler | None = profiler
+        """Records how long actions, hooks and engine phases take. None if the game isn't profiled."""
+        if profiler is not None:
+            self._instrument()
 
         # Load basic_game_behavior.
         # This needs to be handled separately because it should ALWAYS be loaded
         # as it implements the vanilla SBRS behavior. Without it, no actions would
         # be available, and the game would be useless if not crash instantly.
         try:
-            self.addons.append(importlib.import_module("basic_game_behavior").Addon())
+            self.addons.append(base_addon_class()())
             self.addons[-1].initgame(self)
         except Exception as e:  # pylint: disable=broad-except
             raise Exception(  # pylint: disable=broad-exception-raised
                 f"{Fore.RED}Couldn't load SBRS base game behavior."
             ) from e
 
-        # Load addons
-        for _, _, files in os.walk(f"{os.path.dirname(__file__)}/addons"):
-            for filename in files:
-                if filename.endswith(".py"):
-                    print(f"{Fore.YELLOW}Loading addon: {Fore.CYAN}{filename}")
-                    try:
-                        addon = importlib.import_module(f"addons.{filename[:-3]}")
-                        # Check for addon.Addon to initialize from
-                        if not hasattr(addon, "Addon"):
-                            raise ValueError(
-                                'Addon does not have an "Addon" class. Was it renamed (the class MUST be named "Addon")?'
-                            )
-                        self.addons.append(addon.Addon())
-                    except Exception as e:  # pylint: disable=broad-except
-                        print(
-                            f"{Fore.RED}Unable to load addon {filename}.\n"
-                            + "".join(
-                                traceback.format_exception(type(e), e, e.__traceback__)
-                            )
-                        )
+        # Load addons. They are found and imported once per process (see addon_loader.py)
+        loaded = []
+        for info in addon_manifest(SBRSAddon):
+            if info.addon_class is None:
+                continue
+            try:
+                self.addons.append(info.addon_class())
+                loaded.append((info, self.addons[-1]))
+            except Exception as e:  # pylint: disable=broad-except
+                print(
+                    f"{Fore.RED}Unable to load addon {info.filename}.\n"
+                    + "".join(
+                        traceback.format_exception(type(e), e, e.__traceback__)
+                    )
+                )
 
         # Run initgame on addons
-        for addon in self.addons:
-            if addon == self.addons[-1]:
-                # Skip the base game behavior addon. This was
-                # initialized earlier.
-                continue
+        for addon in self.addons[1:]:
+            # The base game behavior addon (the first one) was
+            # initialized earlier.
             if not hasattr(addon, "initgame"):
                 continue
             if not callable(addon.initgame):
@@ -194,6 +338,58 @@ class SBRSGame:
                     f"{Fore.YELLOW}Addon \"{addon.__class__.__name__}\"'s \"initgame\" method is not callable! Skipping..."
                 )
             addon.initgame(self)
+        self._check_actions = True
+        self.check_action_weights()
+
+        self.hooks: dict = {}
+        """The addon methods to call for each hook, in addon order. See `rebuild_hooks()`."""
+        self.rebuild_hooks()
+
+        # Record the actions each addon adds in the manifest
+        for info, addon in loaded:
+            if info.actions is None:
+                info.actions = tuple(
+                    action.name for action in self.actions if getattr(action.function, "__self__", None) is addon
+                )
+
+    def rebuild_hooks(self):
+        """
+        Builds the lists of addon methods to call for each hook. Addons that
+        don't override a hook (and so would only run `SBRSAddon`'s empty
+        method) are left out, so they cost nothing.
+
+        Called once when the game is created. Call it again after changing `addons`.
+
+        The hooks are "start_turn", "pre_action", "post_action", "end_turn"
+        and "game_over". The older names `begin_turn` and `end_game` are
+        called with `start_turn` and `game_over`.
+        """
+        hooks = {name: [] for name in GAME_HOOKS}
+        for addon in self.addons:
+            overridden = addon_hooks(type(addon), SBRSAddon)
+            for name, methods in GAME_HOOKS.items():
+                for method in methods:
+                    if method in overridden:
+                        hook = getattr(addon, method)
+                        if self.profiler is not None:
+                            hook = self.profiler.wrap(f"hook:{type(addon).__module__}.{method}", hook)
+                        hooks[name].append(hook)
+        self.hooks = hooks
+
+    def _instrument(self):
+        """Times the engine's phases by replacing its methods on this game only."""
+        for phase, method in PROFILED_PHASES.items():
+            setattr(self, method, self.profiler.wrap(f"phase:{phase}", getattr(self, method)))
+
+    @property
+    def remaining_players(self):
+        """A read-only view of the remaining players in the game."""
+        return self._remaining_players
+
+    @property
+    def remaining_teams(self):
+        """The number of teams that still have alive players."""
+        return self.alive.team_count
 
     def add_action(self, action: SBRSAction):
         """
@@ -203,13 +399,16 @@ class SBRSGame:
             action (SBRSAction): The action to add.
 
         Raises:
-            ValueError: If the action is None, has no function, or already exists.
+            ValueError: If the action is None, has no function, or already exists,
+                or if once it's added, some players can't take any action (see
+                `check_action_weights()`).
         """
         if action is None or action.function is None:
             raise ValueError("SBRSAction must have a function.")
         if action.name in [a.name for a in self.actions]:
             raise ValueError(f"An SBRSAction with the name \"{action.name}\" already exists.")
         self.actions.append(action)
+        self.invalidate_actions()
 
     def remove_action(self, action: Union[SBRSAction, str]):
         """
@@ -221,41 +420,245 @@ class SBRSGame:
         Raises:
             ValueError: If the action is not in the game.
         """
+        name = action if isinstance(action, str) else getattr(action, "name", action)
         if isinstance(action, str):
             action = next((a for a in self.actions if a.name == action), None)
-        if action is None:
-            raise ValueError(f"SBRSAction with name {action.name} does not exist.")
+        if action is None or action not in self.actions:
+            raise ValueError(f"SBRSAction with name {name} does not exist.")
         self.actions.remove(action)
+        self.invalidate_actions()
+
+    def invalidate_actions(self):
+        """
+        Makes the game rebuild its tables for picking actions. `add_action()` and
+        `remove_action()` do this already; call it after changing an action's weights.
 
-    def game_print(self, msg: str):
-        """
-        Prints a message to the console and the game logger.
-        """
-        print(msg)
-        if self.config.sbrs_game_logger:
-            # check for color codes and erase them
-            msg = msg.replace(Fore.RED, "")
-            msg = msg.replace(Fore.GREEN, "")
-            msg = msg.replace(Fore.BLUE, "")
-            msg = msg.replace(Fore.WHITE, "")
-            msg = msg.replace(Fore.YELLOW, "")
-            msg = msg.replace(Back.RED, "")
-            msg = msg.replace(Back.GREEN, "")
-            msg = msg.replace(Back.BLUE, "")
-            msg = msg.replace(Back.WHITE, "")
-            msg = msg.replace(Style.RESET_ALL, "")
-            msg = msg.replace("\x1b[35m", "")
-            msg = msg.replace("\x1b[36m", "")
-            self.config.sbrs_game_logger.info(msg)
+        Raises:
+            ValueError: If some players can't take any action (see `check_action_weights()`).
+        """
+        self._action_tables = None
+        if self._check_actions:
+            self.check_action_weights()
+
+    def check_action_weights(self):
+        """
+        Checks that every player has an action to take: at least one action needs
+        a positive weight, both for players without weights of their own and for
+        every player type with weights. Done when the game is created and
+        whenever the actions change, so a bad config fails before the game starts.
+
+        Raises:
+            ValueError: If every action has a weight of 0 for some players.
+        """
+        if not self.actions:
+            return
+        player_types = {None}
+        for action in self.actions:
+            player_types.update(action.type_weights)
+        for player_type in player_types:
+            if not any(
+                action.weight if player_type is None else action.weight_for(player_type) for action in self.actions
+            ):
+                players = "players without weights of their own" if player_type is None else f"\"{player_type}\" players"
+                raise ValueError(f"Every action has a weight of 0 for {players}.")
+
+    def _action_table(self, player_type: str | None) -> SBRSAliasTable | None:
+        """
+        Builds the table for picking actions for a player type (None for types
+        without weights of their own). None when every action has the same weight.
+        """
+        weights = [
+            action.weight if player_type is None else action.weight_for(player_type)
+            for action in self.actions
+        ]
+        if weights and not any(weights):
+            # Weights were changed without invalidate_actions()
+            self.check_action_weights()
+        if not weights or weights.count(weights[0]) == len(weights):
+            # Equal weights are just random.choice()
+            return None
+        return SBRSAliasTable(self.actions, weights)
+
+    def pick_action(self, player) -> SBRSAction:
+        """
+        Picks a random action for a player, using the actions' weights. Takes
+        the same time no matter how many actions there are.
+
+        Args:
+            player (SBRSPlayer): The player who will take the action.
+
+        Returns:
+            SBRSAction: The action.
+        """
+        tables = self._action_tables
+        if tables is None or self._action_count != len(self.actions):
+            # Tables are built when first needed, and kept until the actions change
+            tables = self._action_tables = {}
+            self._action_count = len(self.actions)
+            self._weighted_types = set()
+            for action in self.actions:
+                self._weighted_types.update(action.type_weights)
+        key = None
+        if self._weighted_types and player.type in self._weighted_types:
+            key = player.type
+        try:
+            table = tables[key]
+        except KeyError:
+            table = tables[key] = self._action_table(key)
+        if table is None:
+            return random.choice(self.actions)
+        return table.pick()
+
+    def add_sink(self, sink: SBRSOutputSink):
+        """
+        Adds an output sink to the game.
+
+        Args:
+            sink (SBRSOutputSink): The sink to add.
+        """
+        self.sinks.append(sink)
+        self._update_sinks()
+
+    def remove_sink(self, sink: SBRSOutputSink):
+        """
+        Flushes and removes an output sink from the game.
+
+        Args:
+            sink (SBRSOutputSink): The sink to remove.
+
+        Raises:
+            ValueError: If the sink is not in the game.
+        """
+        self.sinks.remove(sink)
+        sink.flush()
+        self._update_sinks()
+
+    def _update_sinks(self):
+        self._text_sinks = [sink for sink in self.sinks if sink.wants_text]
+        self._event_sinks = [sink for sink in self.sinks if sink.wants_events]
+        self._wants_plain = any(sink.wants_plain for sink in self._text_sinks)
+
+    @property
+    def listening(self):
+        """Whether any sink wants events or text. If not, emitting an event does nothing."""
+        return bool(self._text_sinks or self._event_sinks)
+
+    def flush_output(self):
+        """
+        Flushes every output sink. Called at the end of every turn.
+        """
+        for sink in self.sinks:
+            sink.flush()
+
+    def close_output(self):
+        """
+        Flushes and closes every output sink. Called when `run_game()` finishes.
+        """
+        for sink in self.sinks:
+            sink.close()
+
+    def game_print(self, msg: str, plain: str | None = None, color: str | None = None):
+        """
+        Prints a message to every output sink (by default, the console and the game logger).
+
+        Args:
+            msg (str): The message to print. May contain color codes.
+            plain (str | None): The message without color codes. If not given,
+                color codes are stripped from `msg` when needed.
+            color (str | None): A message color to print the whole message in.
+                When given, `msg` should not contain color codes.
+        """
+        if color is not None:
+            plain = msg
+            msg = self.config.color_table[color] + msg
+        if plain is None and self._wants_plain:
+            plain = ANSI_PATTERN.sub("", msg) if self.config.use_color else msg
+        for sink in self._text_sinks:
+            sink.write(msg, plain)
+        if self._event_sinks:
+            event = SBRSEvent("print", self.turn, label=plain if plain is not None else ANSI_PATTERN.sub("", msg))
+            for sink in self._event_sinks:
+                sink.write_event(event)
         self.something_happened = True
 
+    def emit(
+        self, kind: str, actor=None, target=None, template=None, players=(), amount=None, label=None
+    ):  # pylint: disable=too-many-arguments
+        """
+        Reports that something happened. This is how actions should print messages.
+
+        The event is passed to event sinks and, if any sink consumes text,
+        rendered into a message. With neither attached, nothing is built.
+
+        Args:
+            kind (str): What happened. Either a message type (such as "attack-success"),
+                or an engine message (see `renderer.ENGINE_MESSAGES`).
+            actor (SBRSPlayer | SBRSTeam | None): Who caused the event.
+            target (SBRSPlayer | None): Who the event happened to.
+            template (SBRSMessageTemplate | None): The message to use. If not given for a
+                message type, a random message for the actor's player type is picked.
+            players (tuple): Extra players involved. For passive messages, this is
+                `{player1}`, `{player2}`... in order.
+            amount (int | None): A number to show in the message.
+            label (str | None): Text to show instead of the actor's name.
+
+        Returns:
+            SBRSEvent | None: The event, or None if no sink was listening.
+        """
+        self.something_happened = True
+        if not (self._text_sinks or self._event_sinks):
+            return None
+        if template is None and kind in self.config.messages:
+            template = self.random_message(kind, getattr(actor, "type", "Default"))
+        event = SBRSEvent(kind, self.turn, actor, target, template, players, amount, label)
+        for sink in self._event_sinks:
+            sink.write_event(event)
+        if self._text_sinks:
+            msg, plain = self.render_event(event)
+            for sink in self._text_sinks:
+                sink.write(msg, plain)
+        return event
+
+    def render_event(self, event: SBRSEvent) -> tuple:
+        """
+        Turns an event into a message.
+
+        Args:
+            event (SBRSEvent): The event to render.
+
+        Returns:
+            tuple: The rendered `(ansi, plain)` messages.
+        """
+        return self.renderer.render_event(event)
+
+    def console_print(self, msg: str):
+        """
+        Prints a message to console sinks only. Used for things that
+        shouldn't end up in logs, such as separators between turns.
+        """
+        for sink in self.sinks:
+            if isinstance(sink, ConsoleSink):
+                sink.write(msg, msg)
+
     def message_color(self, color: str):
         """
         Gets the color code for a message color using the loaded config.
         """
-        color = self.config.message_colors[color]
-        color_code = getattr(Fore, color.upper())
-        return color_code
+        return self.config.color_table[color]
+
+    def render_message(self, message: SBRSMessageTemplate, color: str, values: dict) -> tuple:
+        """
+        Renders a message in a message color, with colored slot values.
+
+        Args:
+            message (SBRSMessageTemplate): The message to render.
+            color (str): The message color for the message.
+            values (dict): A `(text, message color)` pair for each slot, by slot name.
+
+        Returns:
+            tuple: The rendered `(ansi, plain)` messages, to pass to `game_print()`.
+        """
+        return self.renderer.render_message(message, color, values)
 
     def random_message(self, message_type: str, player_type: str):
         """
@@ -269,111 +672,417 @@ class SBRSGame:
         Returns:
             str: The random message.
         """
-        if player_type == "Default":
-            return random.choice(self.config.messages[message_type]["Default"])
-        try:
-            return random.choice(
-                self.config.messages[message_type][player_type]
-                + self.config.messages[message_type]["Default"]
-            )
-        except KeyError:
-            # Player type isn't in messages
-            return random.choice(self.config.messages[message_type]["Default"])
+        pool = self.message_pools.get(message_type, player_type)
+        return pool[int(self.renderer.random.random() * len(pool))]
+
+    def add_message(self, message_type: str, message: str, player_type: str = "Default"):
+        """
+        Adds a message to the game at runtime.
+
+        Args:
+            message_type (str): The type of message to add.
+            message (str): The message. Placeholders are compiled like loaded messages.
+            player_type (str): The type of player the message is for.
+        """
+        messages = self.config.messages.setdefault(message_type, {})
+        messages.setdefault(player_type, []).append(SBRSMessageTemplate(message))
+        self.message_pools.invalidate(message_type)
+
+    def random_passive_message(self, player_type: str, max_players: int):
+        """
+        Returns a random passive message that needs at most `max_players` players.
+
+        Args:
+            player_type (str): The type of player to get the message for.
+            max_players (int): The number of players available for the message.
+
+        Returns:
+            SBRSMessageTemplate | None: The random message, or None if no message fits.
+        """
+        pool = self.message_pools.get_passive(player_type, max_players)
+        if not pool:
+            return None
+        return pool[int(self.renderer.random.random() * len(pool))]
 
     def game_over(self):
         """
         Runs the game over logic on all addons.
         """
-        for addon in self.addons:
-            if hasattr(addon, "game_over"):
-                addon.game_over(self)
+        for hook in self.hooks["game_over"]:
+            hook(self)
         self.finished = True
 
+    def checkpoint(self, path: str | None = None, wait: bool = True):
+        """
+        Saves the state of the game, so it can be continued later with `restore()`.
+
+        The state is captured immediately. Compressing and writing it happens
+        in the background if `wait` is False.
+
+        NOTE: If the game is stopped partway through a turn, the rest of that
+        turn is skipped when the checkpoint is restored.
+
+        Args:
+            path (str | None): The file to save to. Defaults to `checkpoint_path`.
+            wait (bool): If False, the file is written on a background thread.
+
+        Raises:
+            ValueError: If no path is given and `checkpoint_path` is not set.
+            TypeError: If any addon_data isn't JSON-compatible.
+        """
+        # pylint: disable=import-outside-toplevel
+        try:
+            from .checkpoint import SBRSCheckpointWriter, encode_extra, pack_bitmap, roster_hash, uint_array
+        except ImportError:
+            from checkpoint import SBRSCheckpointWriter, encode_extra, pack_bitmap, roster_hash, uint_array
+
+        path = path or self.checkpoint_path
+        if not path:
+            raise ValueError("No checkpoint path given.")
+        players = self.config.players
+        table = self.player_table
+        partitions = self.alive.partitions()
+        header = {
+            "turn": self.turn,
+            "finished": self.finished,
+            "sudden-death": self.sudden_death,
+            "chances": {
+                "attack": self.config.attack_chance,
+                "passive-death": self.config.passive_death_chance,
+                "attack-success": self.config.attack_success_chance,
+            },
+            "players": len(players),
+            "roster": roster_hash(players),
+            "partitions": [
+                [None if team is None else str(team), len(partition)] for team, partition in partitions
+            ],
+        }
+        extra = {
+            "random": random.getstate(),
+            "message-random": self.renderer.random.getstate(),
+            "numpy-random": None if self.vector_engine is None else self.vector_engine.rng.bit_generator.state,
+            "player-data": {str(row): data for row, data in table.addon_data.items() if data},
+            "team-data": {
+                str(team): team.addon_data
+                for team in set(player.team for player in players)
+                if team is not None and getattr(team, "addon_data", None)
+            },
+        }
+        sections = {
+            "alive": pack_bitmap(table.alive),
+            "kills": uint_array(table.kills),
+            "alive-order": uint_array(player.row for player in self.alive),
+            "partition-order": uint_array(
+                player.row for _, partition in partitions for player in partition
+            ),
+            "extra": encode_extra(extra),
+        }
+        if self._checkpoint_writer is None:
+            self._checkpoint_writer = SBRSCheckpointWriter()
+        self._checkpoint_writer.write(path, header, sections, wait)
+
+    def wait_for_checkpoint(self):
+        """
+        Waits until a checkpoint being written in the background is on disk.
+
+        Raises:
+            Exception: If writing it failed.
+        """
+        if self._checkpoint_writer is not None:
+            self._checkpoint_writer.wait()
+
+    def restore(self, path: str):
+        """
+        Continues the game from a checkpoint saved by `checkpoint()`.
+        The game must have been created from the same roster.
+
+        Args:
+            path (str): The checkpoint file.
+
+        Raises:
+            ValueError: If the file is not a checkpoint of this game's roster.
+        """
+        # pylint: disable=import-outside-toplevel
+        try:
+            from .checkpoint import (
+                decode_extra, decode_snapshot, random_state, read_uint_array, roster_hash, unpack_bitmap,
+            )
+        except ImportError:
+            from checkpoint import (
+                decode_extra, decode_snapshot, random_state, read_uint_array, roster_hash, unpack_bitmap,
+            )
+
+        self.wait_for_checkpoint()
+        with open(path, "rb") as f:
+            header, sections = decode_snapshot(f.read())
+        players = self.config.players
+        if header["roster"] != roster_hash(players):
+            raise ValueError(f"Checkpoint {path} was saved from a different roster.")
+
+        table = self.player_table
+        table.alive[:] = bytes(unpack_bitmap(sections["alive"], len(players)))
+        table.kills[:] = array("q", read_uint_array(sections["kills"]))
+        teams = {str(team): team for team in table.team_objects}
+        for team in teams.values():
+            if isinstance(team, SBRSTeam):
+                team.alive_count = 0
+        for player, is_alive in zip(players, table.alive):
+            player.alive_slot = None
+            player.team_slot = None
+            player._alive_set = None  # pylint: disable=protected-access
+            if is_alive and isinstance(player.team, SBRSTeam):
+                player.team.alive_count += 1
+
+        order = read_uint_array(sections["partition-order"])
+        partitions = []
+        position = 0
+        for team_name, size in header["partitions"]:
+            partitions.append((
+                None if team_name is None else teams[team_name],
+                [players[i] for i in order[position:position + size]],
+            ))
+            position += size
+        self.alive = SBRSAliveSet.from_order(
+            [players[i] for i in read_uint_array(sections["alive-order"])], partitions
+        )
+        self._remaining_players = self.alive.view()
+
+        extra = decode_extra(sections["extra"])
+        self.vector_engine = None
+        if extra.get("numpy-random") is not None:
+            self.vector_engine = SBRSVectorEngine(self)
+            self.vector_engine.rng.bit_generator.state = extra["numpy-random"]
+        random.setstate(random_state(extra["random"]))
+        if extra.get("message-random") is not None:
+            self.renderer.random.setstate(random_state(extra["message-random"]))
+        for row, data in extra["player-data"].items():
+            players[int(row)].addon_data = data
+        for name, data in extra["team-data"].items():
+            teams[name].addon_data = data
+
+        self.turn = header["turn"]
+        self.finished = header["finished"]
+        self.sudden_death = header["sudden-death"]
+        self.config.attack_chance = header["chances"]["attack"]
+        self.config.passive_death_chance = header["chances"]["passive-death"]
+        self.config.attack_success_chance = header["chances"]["attack-success"]
+
+    def _stop(self):
+        """Saves a checkpoint if enabled, closes output and exits. Used when the user presses Ctrl-C."""
+        self.emit("game-stopped")
+        self.close_output()
+        if self.checkpoint_path and not self.finished:
+            self.checkpoint()
+            print(f"Checkpoint saved to {self.checkpoint_path}.")
+        print("Exiting...\n")
+        sys.exit(0)
+
+    def uses_vector_engine(self) -> bool:
+        """
+        Checks whether turns are resolved by the vector engine.
+
+        Returns:
+            bool: True if the vector engine will play the next turn.
+
+        Raises:
+            ValueError: If the engine is "vector" but the game can't use it.
+        """
+        if self.engine == "python":
+            return False
+        supported = SBRSVectorEngine.supports(self)
+        if self.engine == "vector" and not supported:
+            raise ValueError("The vector engine needs NumPy and only supports the vanilla actions.")
+        if self.engine == "auto" and len(self.alive) < AUTO_MIN_PLAYERS:
+            # Small turns are quicker one player at a time
+            return False
+        return supported
+
+    def after_action(self):
+        """
+        Announces eliminated teams and checks for game over. Called after every action.
+        """
+        if self.alive.eliminated_teams:
+            for team in self.alive.eliminated_teams:
+                self.emit("team-dead", team)
+            self.alive.eliminated_teams.clear()
+        if self.config.use_teams:
+            if self.alive.team_count == 1:
+                self.game_over()
+        else:
+            if len(self.remaining_players) == 1:
+                self.game_over()
+
+    def _play_vector_turn(self):
+        """Plays the whole turn with the vector engine."""
+        if self.vector_engine is None:
+            self.vector_engine = SBRSVectorEngine(self)
+        self.vector_engine.play_turn()
+
     def simulate_turn(self):
         """
         Simulates a single turn in the game.
         """
-        self.something_happened = False
         try:
-            self.game_print(
-                f"{self.message_color('new-turn')}Turn {self.turn} - {len(self.remaining_players)} players remaining\n"
-            )
-            for addon in self.addons:
-                if hasattr(addon, "begin_turn"):
-                    addon.begin_turn(self)
+            for _ in self.simulate_turn_steps():
+                pass
+        except KeyboardInterrupt:
+            self._stop()
+
+    def simulate_turn_steps(self, actions_per_step: int | None = None):
+        """
+        Simulates a single turn in the game, pausing every few player actions.
+        Lets a caller that shares the thread with other work (such as an
+        asyncio event loop) play long turns in slices.
+
+        Turns played by the vector engine are never split.
+
+        Args:
+            actions_per_step (int | None): Pause after this many player actions.
+                If None, the whole turn is played in one step.
+
+        Yields:
+            None: When the turn pauses. The turn is over when the generator is.
+        """
+        self.something_happened = False
+        self.emit("new-turn", amount=len(self.remaining_players))
+        for hook in self.hooks["start_turn"]:
+            hook(self)
+        if self.uses_vector_engine():
+            self._play_vector_turn()
+        else:
+            pre_action = self.hooks["pre_action"]
+            post_action = self.hooks["post_action"]
+            profiler = self.profiler
+            steps = 0
             for player in self.config.players:
                 if self.finished:
                     break
                 if player.alive:
                     # Random action
-                    action = random.choice(self.actions)
-                    action.function(self, player)
-                    # Remove dead players
-                    self.remaining_players = [
-                        p for p in self.remaining_players if p.alive
-                    ]
-                    # Remove dead players from teams
-                    for team in set(p.team for p in self.remaining_players):
-                        team_players = [p for p in self.remaining_players if p.team == team]
-                        if len(team_players) == 0:
-                            self.game_print(
-                                f"{self.message_color('team-dead')}Team {team} has been eliminated.\n"
-                            )
-                    # Check for game over
-                    if self.config.use_teams:
-                        if len(set(p.team for p in self.remaining_players)) == 1:
-                            self.game_over()
+                    action = self.pick_action(player)
+                    for hook in pre_action:
+                        hook(self, player, action)
+                    if profiler is None:
+                        action.function(self, player)
                     else:
-                        if len(self.remaining_players) == 1:
-                            self.game_over()
-            if not self.something_happened:
-                if self.config.show_kills_only:
-                    self.game_print(
-                        f"{self.message_color('passive')}No one died on this turn.\n"
-                    )
+                        profiler.call(f"action:{action.name}", action.function, self, player)
+                    for hook in post_action:
+                        hook(self, player, action)
+                    self.after_action()
+                    if actions_per_step is not None:
+                        steps += 1
+                        if steps >= actions_per_step:
+                            steps = 0
+                            yield
+        for hook in self.hooks["end_turn"]:
+            hook(self)
+        if not self.something_happened:
+            if self.config.show_kills_only:
+                self.emit("no-deaths")
+            else:
+                self.emit("nothing-happened")
+        self.emit("end-turn")
+        self.flush_output()
+
+    def iter_turns(self, actions_per_step: int | None = None):
+        """
+        Plays the game one turn at a time, yielding after each turn. Never
+        reads input, so it can be used to embed games in other programs:
+
+            for summary in game.iter_turns():
+                if summary.remaining <= 10:
+                    break
+
+        Nothing is played until the next summary is asked for. Stopping early
+        (with `break` or `close()`) flushes the output and leaves the game where
+        it is; calling `iter_turns()` again carries on from the next turn.
+        Output is closed when the game finishes.
+
+        Args:
+            actions_per_step (int | None): If given, also yield None every this many
+                player actions in the middle of turns (see `simulate_turn_steps()`).
+
+        Yields:
+            SBRSTurnSummary | None: What happened in the turn, or None mid-turn.
+        """
+        try:
+            while not self.finished:
+                # Stop the game if a checkpoint couldn't be written
+                if self._checkpoint_writer is not None:
+                    self._checkpoint_writer.check()
+                alive = len(self.alive)
+                self.turn += 1
+                if actions_per_step is None:
+                    self.simulate_turn()
                 else:
-                    self.game_print(
-                        f"{self.message_color('passive')}Nothing happened this turn.\n"
-                    )
-            self.game_print(
-                f"------ {self.message_color('end-turn')}TURN ENDED {Fore.WHITE}------\n"
-            )
-        except KeyboardInterrupt:
-            self.game_print(f"\n{self.message_color('end-turn')}Game stopped by user.")
-            print("Exiting...\n")
-            sys.exit(0)
+                    yield from self.simulate_turn_steps(actions_per_step)
+                if not self.finished and self.checkpoint_path and self.turn % self.checkpoint_every == 0:
+                    self.checkpoint(wait=False)
+                yield SBRSTurnSummary(
+                    self.turn,
+                    len(self.alive),
+                    self.remaining_teams,
+                    alive - len(self.alive),
+                    self.finished,
+                    game_winner(self) if self.finished else None,
+                )
+        finally:
+            self.wait_for_checkpoint()
+            if self.finished:
+                self.close_output()
+            else:
+                self.flush_output()
+
+    def iter_events(self):
+        """
+        Plays the game, yielding every event (see event.py) as it happens.
+        Events are handed over at the end of each turn, in the order they
+        happened. Like `iter_turns()`, the game can be stopped early and
+        nothing is played until more events are asked for.
+
+        Yields:
+            SBRSEvent: An event.
+        """
+        sink = EventSink()
+        self.add_sink(sink)
+        try:
+            for _ in self.iter_turns():
+                events = sink.events
+                sink.events = []
+                yield from events
+        finally:
+            if sink in self.sinks:
+                self.sinks.remove(sink)
+                self._update_sinks()
 
-    def run_game(self):
+    def run_game(self, interactive: bool = False):
         """
         The main game loop.
         Runs `simulate_turn()` until there is only one player left, then exits.
+
+        Args:
+            interactive (bool): If True, wait for the user to press enter after every turn.
         """
 
         if self.finished:
             print("Game already finished.")
 
-        while not self.finished:
-            self.turn += 1
-            self.simulate_turn()
-            if __name__ == "__main__":
+        for _ in self.iter_turns():
+            if interactive:
                 try:
-                    if not args.auto:
-                        input(
-                            "Press enter to simulate next turn"
-                            if not self.finished
-                            else "Press enter to exit"
-                        )
-                except KeyboardInterrupt:
-                    self.game_print(
-                        f"\n{self.message_color('end-turn')}Game stopped by user."
+                    input(
+                        "Press enter to simulate next turn"
+                        if not self.finished
+                        else "Press enter to exit"
                     )
-                    print("Exiting...\n")
-                    sys.exit(0)
+                except KeyboardInterrupt:
+                    self._stop()
                 except EOFError:
                     pass
-            if self.finished:
-                break
-            print("------\n")
+            if not self.finished:
+                self.console_print("------\n")
+        if self.profiler is not None:
+            print(self.profiler.format_report())
 
 
 # Addons
@@ -425,6 +1134,31 @@ class SBRSAddon:
         """
         pass
 
+    def pre_action(self, game: SBRSGame, player, action: SBRSAction):
+        """
+        Called right before a player takes an action.
+        Games with addons that use this (or `post_action()`) are always
+        played one player at a time, never by the vector engine.
+
+        Args:
+            game (sbrs.SBRSGame): The game being simulated
+            player (sbrs.SBRSPlayer): The player taking the action
+            action (sbrs.SBRSAction): The action being taken
+        """
+        pass
+
+    def post_action(self, game: SBRSGame, player, action: SBRSAction):
+        """
+        Called right after a player takes an action, before the game
+        checks whether it is over.
+
+        Args:
+            game (sbrs.SBRSGame): The game being simulated
+            player (sbrs.SBRSPlayer): The player who took the action
+            action (sbrs.SBRSAction): The action that was taken
+        """
+        pass
+
     def end_turn(self, game: SBRSGame):
         """
         Called when a turn ends.
@@ -434,7 +1168,7 @@ class SBRSAddon:
         """
         pass
 
-    def end_game(self, game: SBRSGame):
+    def game_over(self, game: SBRSGame):
         """
         Called when the game ends.
 
@@ -443,9 +1177,20 @@ class SBRSAddon:
         """
         pass
 
+    def end_game(self, game: SBRSGame):
+        """
+        Called when the game ends, after `game_over()`.
+
+        Args:
+            game (sbrs.SBRSGame): The game being simulated
+        """
+        pass
+
 
 # Main
 if __name__ == "__main__":
+    import argparse
+
     # Arguments
     parser = argparse.ArgumentParser()
     parser.add_argument("config", help="Path to the config file")
@@ -456,11 +1201,69 @@ if __name__ == "__main__":
     parser.add_argument(
         "--no-save", action="store_true", help="Disable saving the game to a log file"
     )
+    parser.add_argument(
+        "--no-color", action="store_true", help="Disable colored output"
+    )
+    parser.add_argument(
+        "--log-format",
+        choices=["text", "binary"],
+        default="text",
+        help="Save the game as a text log, or as a compact binary event log (see event_log.py)",
+    )
+    parser.add_argument(
+        "--batch", type=int, metavar="GAMES", help="Silently play this many games and report the results"
+    )
+    parser.add_argument(
+        "--tournament", type=int, metavar="HEAT_SIZE",
+        help="Play a tournament: split the roster into heats of this size and advance the winners until one is left",
+    )
+    parser.add_argument(
+        "--arenas", type=int, metavar="ARENAS",
+        help="Silently play one huge game split across this many arenas, each in its own process",
+    )
+    parser.add_argument(
+        "--merge-every", type=int, default=10, metavar="TURNS",
+        help="Turns between reshuffling survivors between --arenas (default 10)",
+    )
+    parser.add_argument(
+        "--workers", type=int,
+        help="Number of processes for --batch, --tournament or --arenas (defaults to the number of CPUs)",
+    )
+    parser.add_argument("--seed", type=int, help="Seed for --batch, --tournament or --arenas, for repeatable results")
+    parser.add_argument(
+        "--estimate", action="store_true", help="Calculate the odds of a free-for-all game without playing it"
+    )
+    parser.add_argument(
+        "--report", metavar="PATH",
+        help="Write the --batch, --tournament, --arenas, --estimate or --profile results to a JSON file"
+    )
+    parser.add_argument(
+        "--profile", action="store_true", help="Time every action, addon hook and engine phase, and report at game over"
+    )
+    parser.add_argument(
+        "--checkpoint", metavar="PATH", help="Save a checkpoint of the game here every few turns and on Ctrl-C"
+    )
+    parser.add_argument(
+        "--checkpoint-every", type=int, default=10, metavar="TURNS", help="Turns between checkpoints (default 10)"
+    )
+    parser.add_argument("--resume", metavar="PATH", help="Continue a game from a checkpoint")
+    parser.add_argument(
+        "--no-cache", action="store_true", help="Always load the config from scratch, without using or writing its cache"
+    )
+    parser.add_argument(
+        "--engine",
+        choices=["auto", "python", "vector"],
+        default="auto",
+        help="Turn engine. The vector engine needs NumPy and only plays the vanilla actions",
+    )
     args = parser.parse_args()
+    use_color = sys.stdout.isatty() and not args.no_color
+    if use_color:
+        init_colors()
 
     # Startup prints
     print(
-        f"""{Fore.BLUE}Starlii's Battle Royale Simulator {__version__}
+        f"""{Fore.BLUE if use_color else ''}Starlii's Battle Royale Simulator {__version__}
 A Hunger Games Simulator-like game written in Python
 based on the original Scratch version
 https://github.com/Starlii10/sbrs
@@ -469,11 +1272,102 @@ Copyright (c) 2025 Starlii10
 Insert license here\n"""
     )
 
+    # pylint: disable=import-outside-toplevel
+    if args.estimate:
+        try:
+            from .estimator import estimate_config
+        except ImportError:
+            from estimator import estimate_config
+        estimate = estimate_config(basic_init(args.config, True, False, not args.no_cache))
+        if args.report:
+            with open(args.report, "w", encoding="utf-8") as f:
+                f.write(estimate.to_json())
+        print(
+            f"{estimate.players} players: {estimate.expected_turns():.2f} turns on average, "
+            + f"half of games end by turn {estimate.turn_percentile(0.5)}, "
+            + f"90% by turn {estimate.turn_percentile(0.9)}"
+        )
+        print(f"Each player wins {estimate.win_chance:.2%} of games.")
+        sys.exit(0)
+
+    if args.batch:
+        try:
+            from .batch import run_batch
+        except ImportError:
+            from batch import run_batch
+        result = run_batch(
+            basic_init(args.config, True, False, not args.no_cache), args.batch, args.workers, args.seed, args.engine
+        )
+        if args.report:
+            with open(args.report, "w", encoding="utf-8") as f:
+                f.write(result.to_json())
+        print(f"{result.games} games, {result.mean_turns():.2f} turns on average (seed {result.seed})")
+        for name, rate in list(result.win_rates().items())[:10]:
+            print(f"{name}: {rate:.2%}")
+        sys.exit(0)
+
+    if args.tournament:
+        try:
+            from .tournament import run_tournament
+        except ImportError:
+            from tournament import run_tournament
+        result = run_tournament(
+            basic_init(args.config, True, False, not args.no_cache), args.tournament, args.workers, args.seed, args.engine
+        )
+        if args.report:
+            with open(args.report, "w", encoding="utf-8") as f:
+                f.write(result.to_json())
+        for number, winners in enumerate(result.rounds, 1):
+            print(f"Round {number}: {len(winners)} heats")
+        print(f"Champion: {result.champion} ({result.heats()} heats played, seed {result.seed})")
+        for name, kills in result.kills.most_common(10):
+            print(f"{name}: {kills} kills")
+        sys.exit(0)
+
+    if args.arenas:
+        try:
+            from .arena import run_arenas
+        except ImportError:
+            from arena import run_arenas
+        result = run_arenas(
+            basic_init(args.config, True, False, not args.no_cache), args.arenas, max(1, args.merge_every),
+            args.workers, args.seed, args.engine,
+        )
+        if args.report:
+            with open(args.report, "w", encoding="utf-8") as f:
+                f.write(result.to_json())
+        for epoch in result.epochs:
+            print(f"Turn {epoch['turn']}: {epoch['players']} players in {epoch['arenas']} arenas")
+        print(f"Winner: {result.winner} after {result.turns} turns (seed {result.seed})")
+        for name, kills in result.leaderboard():
+            print(f"{name}: {kills} kills")
+        sys.exit(0)
+
     # Load config and game
     # Should there be an interactive prompt?
-    game_config = basic_init(args.config, args.no_save)
-    game = SBRSGame(game_config)
+    game_config = basic_init(args.config, args.no_save, use_color, not args.no_cache)
+    # Write the log on a background thread so it never holds up the game
+    sinks = [ConsoleSink(use_color=use_color)]
+    if game_config.sbrs_game_logger and args.log_format == "binary":
+        try:
+            from .event_log import SBRSEventLogSink
+        except ImportError:
+            from event_log import SBRSEventLogSink
+        sinks.append(BackgroundSink(SBRSEventLogSink(
+            f"logs/sbrs-{int(time.time())}.sbrslog", {"config": args.config}
+        )))
+    elif game_config.sbrs_game_logger:
+        sinks.append(BackgroundSink(LoggerSink(game_config.sbrs_game_logger)))
+    game = SBRSGame(game_config, sinks, args.engine, SBRSProfiler() if args.profile else None)
+    game.checkpoint_path = args.checkpoint or args.resume
+    game.checkpoint_every = max(1, args.checkpoint_every)
+    if args.resume:
+        game.restore(args.resume)
+        print(f"Resuming from turn {game.turn + 1}.")
     if not args.auto:
         input("Initialization finished. Press enter to begin, or ctrl-c to exit.")
     print("------\n")
-    game.run_game()
+    game.run_game(interactive=not args.auto)
+    if args.profile and args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            f.write(game.profiler.to_json())
@@ -3,8 +3,46 @@ The configuration file for sbrs.
 """
 
 from dataclasses import dataclass
+from types import SimpleNamespace
 import logging
 
+COLOR_CODES = {
+    "black": "\x1b[30m",
+    "red": "\x1b[31m",
+    "green": "\x1b[32m",
+    "yellow": "\x1b[33m",
+    "blue": "\x1b[34m",
+    "magenta": "\x1b[35m",
+    "cyan": "\x1b[36m",
+    "white": "\x1b[37m",
+}
+"""ANSI codes for the supported message colors (the same codes as colorama's `Fore`)."""
+
+Fore = SimpleNamespace(**{color.upper(): code for color, code in COLOR_CODES.items()}, RESET="\x1b[39m")
+"""Foreground color codes, like colorama's `Fore`. Used so colorama is only imported by `init_colors()`."""
+
+Style = SimpleNamespace(RESET_ALL="\x1b[0m")
+"""Like colorama's `Style`."""
+
+
+def build_color_table(message_colors, use_color=True):
+    """
+    Resolves message colors into ANSI codes.
+
+    Args:
+        message_colors (dict | None): The color name for each message color.
+        use_color (bool): If False, every code is an empty string.
+
+    Returns:
+        dict: The ANSI code for each message color.
+    """
+    if not message_colors:
+        return {}
+    if not use_color:
+        return {name: "" for name in message_colors}
+    return {name: COLOR_CODES[color.lower()] for name, color in message_colors.items()}
+
+
 @dataclass
 class SBRSConfig:
     """
@@ -15,10 +53,13 @@ class SBRSConfig:
         players (list): A list of SBRSPlayer objects.
         playertypes (list): A list of SBRSPlayer types.
         teams (list): A list of SBRSTeam objects.
-        messages (dict): The messages file.
+        messages (dict): The messages file, compiled into `SBRSMessageTemplate`s.
         sbrs_game_logger (logging.Logger | None): The logger for the game.
             None if there was an error initializing the logger, or if saving was disabled.
         message_colors (dict): The colors for the messages.
+        use_color (bool): If True, messages are printed with ANSI color codes.
+        color_table (dict): The ANSI color code for each message color.
+            Every code is an empty string if `use_color` is False.
         classic_behavior (bool): If True, classic behavior is enabled.
         sudden_death (bool): If True, sudden death is enabled.
         passive_death_chance (int): The chance of a passive death per turn.
@@ -37,6 +78,8 @@ class SBRSConfig:
     messages: dict
     sbrs_game_logger: logging.Logger | None
     message_colors: dict
+    use_color: bool
+    color_table: dict
     classic_behavior: bool
     sudden_death: bool
     passive_death_chance: int
@@ -66,7 +109,8 @@ class SBRSConfig:
         show_kills_only=None,
         turns=None,
         use_teams=None,
-        actions=None
+        actions=None,
+        use_color=True
     ):
         self.config = config
         self.players = players
@@ -75,6 +119,8 @@ class SBRSConfig:
         self.messages = messages
         self.sbrs_game_logger = sbrs_game_logger
         self.message_colors = message_colors
+        self.use_color = use_color
+        self.color_table = build_color_table(message_colors, use_color)
         self.classic_behavior = classic_behavior
         self.sudden_death = sudden_death
         self.passive_death_chance = passive_death_chance
@@ -0,0 +1,478 @@
+"""
+Live game server for SBRS.
+
+Plays many games at once in one process, on an asyncio event loop, and
+streams every turn to whoever is watching over a line-based TCP connection:
+
+    python server.py normal=config.json big=big-config.json --port 8765
+
+Games can only be started from the configs the server was given. Clients
+send one JSON object per line and get one JSON object per line back:
+
+    {"cmd": "configs"}                     -> {"configs": ["big", "normal"]}
+    {"cmd": "start", "config": "normal"}   -> {"game": 1}
+    {"cmd": "start", "config": "normal", "watch": true}
+                                           -> {"game": 1, "watching": 1}, then every turn (see below)
+    {"cmd": "games"}                       -> {"games": [{"game": 1, "config": "normal", "turn": 3, ...}]}
+    {"cmd": "watch", "game": 1}            -> {"watching": 1}, then as every turn is played:
+                                              {"game": 1, "turn": 4, "lines": [...]}
+                                              ...
+                                              {"game": 1, "turn": 4, "lines": [...], "summary": {...}}
+
+A turn's lines are sent in chunks as it is played, and the message with its
+summary ends the turn. The last turn's summary has `"finished": true` and
+the winner. Anything that goes wrong is answered with {"error": "..."}.
+
+Games hand the event loop back every `actions_per_step` player actions, so
+one huge game never holds up the small ones for longer than that. For the
+same reason, games use the Python engine by default: the vector engine
+plays a whole turn at once. Viewers that fall too far behind are
+disconnected rather than slowing games down. Games that nobody is
+watching don't render or send anything at all.
+
+Games share their config, including its compiled messages; each game only
+gets its own players.
+
+All games share the `random` module, so games on the server can't be seeded.
+"""
+
+import asyncio
+import copy
+import itertools
+import json
+import os
+
+try:
+    from .load_functions import load_players
+    from .output_sinks import MemorySink
+    from .sbrs import SBRSGame, basic_init
+except ImportError:
+    from load_functions import load_players
+    from output_sinks import MemorySink
+    from sbrs import SBRSGame, basic_init
+
+ACTIONS_PER_STEP = 500
+"""How many player actions a game plays before letting other games run."""
+
+VIEWER_BACKLOG = 1000
+"""How many messages can wait to be sent to a client before it is disconnected."""
+
+
+class SBRSConnection:
+    """
+    A connected client. Messages are queued and sent by `send_loop()`, so a
+    slow client never blocks the games it watches.
+
+    Attributes:
+        writer (asyncio.StreamWriter): The client's stream.
+        queue (asyncio.Queue): Encoded messages waiting to be sent.
+        closed (bool): Whether the connection has been closed.
+    """
+
+    def __init__(self, writer, backlog: int = VIEWER_BACKLOG):
+        self.writer = writer
+        self.queue = asyncio.Queue(backlog)
+        self.closed = False
+
+    def send(self, data: bytes) -> bool:
+        """
+        Queues an encoded message. Closes the connection if too many are waiting.
+
+        Args:
+            data (bytes): The message, as a line of JSON.
+
+        Returns:
+            bool: False if the connection is closed.
+        """
+        if self.closed:
+            return False
+        try:
+            self.queue.put_nowait(data)
+        except asyncio.QueueFull:
+            self.close()
+            return False
+        return True
+
+    def reply(self, message: dict) -> bool:
+        """
+        Queues a message.
+
+        Args:
+            message (dict): The message.
+
+        Returns:
+            bool: False if the connection is closed.
+        """
+        return self.send(encode(message))
+
+    async def send_loop(self):
+        """Sends queued messages until the connection is closed, or the client goes away."""
+        try:
+            while True:
+                data = await self.queue.get()
+                self.writer.write(data)
+                await self.writer.drain()
+        except ConnectionError:
+            self.close()
+
+    def close(self):
+        """Closes the connection. Messages that haven't been sent yet are dropped."""
+        if not self.closed:
+            self.closed = True
+            self.writer.close()
+
+
+class SBRSLiveGame:
+    """
+    A game being played by the server. Its lines are only rendered while it
+    has viewers.
+
+    Attributes:
+        id (int): The game's ID.
+        config_name (str): The name of the config it was started from.
+        game (SBRSGame): The game.
+        viewers (set): The `SBRSConnection`s watching the game.
+        task (asyncio.Task | None): The task playing the game.
+    """
+
+    def __init__(self, game_id: int, config_name: str, game: SBRSGame, sink: MemorySink):
+        self.id = game_id
+        self.config_name = config_name
+        self.game = game
+        self.viewers = set()
+        self.task = None
+        self._sink = sink
+
+    def status(self) -> dict:
+        """
+        Returns:
+            dict: The game's ID, config, turn and remaining players.
+        """
+        return {
+            "game": self.id,
+            "config": self.config_name,
+            "turn": self.game.turn,
+            "remaining": len(self.game.alive),
+            "finished": self.game.finished,
+        }
+
+    def watch(self, viewer: SBRSConnection):
+        """
+        Starts sending the game to a viewer.
+
+        Args:
+            viewer (SBRSConnection): The viewer.
+        """
+        if not self.viewers:
+            self.game.add_sink(self._sink)
+        self.viewers.add(viewer)
+
+    def unwatch(self, viewer: SBRSConnection):
+        """
+        Stops sending the game to a viewer. Once nobody is watching, the game stops rendering.
+
+        Args:
+            viewer (SBRSConnection): The viewer.
+        """
+        if viewer not in self.viewers:
+            return
+        self.viewers.discard(viewer)
+        if not self.viewers:
+            self.game.remove_sink(self._sink)
+            self._sink.lines = []
+
+    def publish(self, message: dict):
+        """
+        Sends a message to every viewer, dropping viewers that have disconnected.
+        Nothing is encoded if nobody is watching.
+
+        Args:
+            message (dict): The message.
+        """
+        if not self.viewers:
+            return
+        data = encode(message)
+        for viewer in list(self.viewers):
+            if not viewer.send(data):
+                self.unwatch(viewer)
+
+    async def play(self, actions_per_step: int):
+        """
+        Plays the game to the end, publishing the lines of every step and the
+        summary of every turn.
+
+        Args:
+            actions_per_step (int): Player actions between giving the event loop back.
+        """
+        turns = self.game.iter_turns(actions_per_step)
+        try:
+            for summary in turns:
+                lines = self._sink.lines
+                self._sink.lines = []
+                if summary is None:
+                    # Send what the step printed now, so no message holds a whole turn
+                    if lines:
+                        self.publish({"game": self.id, "turn": self.game.turn, "lines": lines})
+                else:
+                    self.publish({"game": self.id, "turn": summary.turn, "lines": lines, "summary": summary.to_dict()})
+                    if summary.finished:
+                        # Stop without giving the loop back, so nobody starts watching a finished game
+                        break
+                await asyncio.sleep(0)
+        finally:
+            turns.close()
+
+
+class SBRSServer:
+    """
+    Plays games on an asyncio event loop and streams them to clients.
+
+    Attributes:
+        config_paths (dict): The config files games can be started from, by name.
+        configs (dict): The loaded configs, by name. Filled by `start()`.
+        games (dict): The `SBRSLiveGame`s being played, by ID.
+        actions_per_step (int): Player actions a game plays before letting other games run.
+        max_games (int): How many games can be played at once.
+        engine (str): The turn engine games use (see `SBRSGame`).
+    """
+
+    def __init__(
+        self, configs: dict, actions_per_step: int = ACTIONS_PER_STEP, max_games: int = 100, engine: str = "python"
+    ):
+        """
+            Args:
+                configs (dict): Paths to the config files games can be started from, by name.
+                actions_per_step (int): Player actions a game plays before letting other games run.
+                max_games (int): How many games can be played at once.
+                engine (str): The turn engine games use. Defaults to "python", whose
+                    turns can be split up.
+        """
+        self.config_paths = dict(configs)
+        self.configs = {}
+        self._rosters = {}
+        self.games = {}
+        self.actions_per_step = max(1, actions_per_step)
+        self.max_games = max_games
+        self.engine = engine
+        self._ids = itertools.count(1)
+        self._server = None
+        self._connections = set()
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> int:
+        """
+        Loads the configs and starts listening.
+
+        Args:
+            host (str): The address to listen on. Defaults to this machine only.
+            port (int): The port to listen on. With 0, a free port is picked.
+
+        Returns:
+            int: The port the server is listening on.
+        """
+        for name, path in self.config_paths.items():
+            config = await asyncio.to_thread(basic_init, path, True, False)
+            self.configs[name] = config
+            self._rosters[name] = [
+                (player.name, player.type, str(player.team) if config.use_teams else None)
+                for player in config.players
+            ]
+        self._server = await asyncio.start_server(self.handle_client, host, port)
+        return self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self):
+        """Serves clients until cancelled."""
+        await self._server.serve_forever()
+
+    async def close(self):
+        """Stops every game, disconnects every client and stops listening."""
+        for live in list(self.games.values()):
+            live.task.cancel()
+        await asyncio.gather(*(live.task for live in self.games.values()), return_exceptions=True)
+        for connection in list(self._connections):
+            connection.close()
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    async def start_game(self, config_name: str) -> SBRSLiveGame:
+        """
+        Starts a game. It is set up on a worker thread, then played on the event loop.
+
+        Args:
+            config_name (str): The name of the config to play.
+
+        Returns:
+            SBRSLiveGame: The game.
+
+        Raises:
+            ValueError: If there is no config with that name, or too many games are being played.
+        """
+        if config_name not in self.configs:
+            raise ValueError(f"Unknown config \"{config_name}\".")
+        if len(self.games) >= self.max_games:
+            raise ValueError(f"Too many games are being played (the limit is {self.max_games}).")
+        game = await asyncio.to_thread(self._new_game, config_name)
+        live = SBRSLiveGame(next(self._ids), config_name, game, MemorySink())
+        self.games[live.id] = live
+        live.task = asyncio.create_task(self._play(live))
+        return live
+
+    def _new_game(self, config_name: str) -> SBRSGame:
+        config = copy.copy(self.configs[config_name])
+        # Only the players are played on; the rest of the config is shared, except
+        # the message lists, which addons can add to
+        config.players, config.teams = load_players(self._rosters[config_name], None, None, config.use_teams)
+        config.playertypes = [player.type for player in config.players]
+        config.messages = {
+            kind: {player_type: list(pool) for player_type, pool in pools.items()}
+            for kind, pools in config.messages.items()
+        }
+        return SBRSGame(config, [], self.engine)
+
+    async def _play(self, live: SBRSLiveGame):
+        try:
+            await live.play(self.actions_per_step)
+        finally:
+            self.games.pop(live.id, None)
+
+    async def handle_request(self, request: dict, connection: SBRSConnection) -> dict | None:
+        """
+        Answers one request from a client.
+
+        Args:
+            request (dict): The request.
+            connection (SBRSConnection): The client.
+
+        Returns:
+            dict | None: The reply, or None if it was already sent.
+
+        Raises:
+            ValueError: If the request is invalid.
+        """
+        command = request.get("cmd")
+        if command == "configs":
+            return {"configs": sorted(self.configs)}
+        if command == "games":
+            return {"games": [live.status() for live in self.games.values()]}
+        if command == "start":
+            live = await self.start_game(request.get("config"))
+            if not request.get("watch"):
+                return {"game": live.id}
+            # The game hasn't played yet, so the viewer sees every turn
+            connection.reply({"game": live.id, "watching": live.id})
+            live.watch(connection)
+            return None
+        if command == "watch":
+            live = self.games.get(request.get("game"))
+            if live is None:
+                raise ValueError(f"No game with ID {request.get('game')} is being played.")
+            # Reply first, so the first turn can't arrive before the reply
+            connection.reply({"watching": live.id})
+            live.watch(connection)
+            return None
+        raise ValueError(f"Unknown command \"{command}\".")
+
+    async def handle_client(self, reader, writer):
+        """
+        Serves one client until it disconnects.
+
+        Args:
+            reader (asyncio.StreamReader): The client's input.
+            writer (asyncio.StreamWriter): The client's output.
+        """
+        connection = SBRSConnection(writer)
+        self._connections.add(connection)
+        sender = asyncio.create_task(connection.send_loop())
+        try:
+            while not connection.closed:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    request = json.loads(line)
+                    if not isinstance(request, dict):
+                        raise ValueError("Requests must be JSON objects.")
+                    reply = await self.handle_request(request, connection)
+                except ValueError as e:
+                    reply = {"error": str(e)}
+                if reply is not None:
+                    connection.reply(reply)
+        except ConnectionError:
+            pass
+        finally:
+            for live in self.games.values():
+                live.unwatch(connection)
+            self._connections.discard(connection)
+            sender.cancel()
+            connection.close()
+
+
+def encode(message: dict) -> bytes:
+    """
+    Args:
+        message (dict): A message.
+
+    Returns:
+        bytes: The message as a line of JSON.
+    """
+    return (json.dumps(message) + "\n").encode("utf-8")
+
+
+def parse_configs(values: list) -> dict:
+    """
+    Args:
+        values (list): Configs from the command line, as NAME=PATH or just PATH
+                       (named after the file).
+
+    Returns:
+        dict: Config paths by name.
+    """
+    configs = {}
+    for value in values:
+        name, separator, path = value.partition("=")
+        if not separator:
+            path = value
+            name = os.path.splitext(os.path.basename(value))[0]
+        configs[name] = path
+    return configs
+
+
+async def serve(configs: dict, host: str, port: int, **options):
+    """
+    Runs a server until cancelled.
+
+    Args:
+        configs (dict): Config paths by name.
+        host (str): The address to listen on.
+        port (int): The port to listen on.
+        **options: Options for `SBRSServer`.
+    """
+    server = SBRSServer(configs, **options)
+    port = await server.start(host, port)
+    print(f"Serving {', '.join(sorted(configs))} on {host}:{port}")
+    try:
+        await server.serve_forever()
+    finally:
+        await server.close()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Serve live SBRS games")
+    parser.add_argument("configs", nargs="+", metavar="[NAME=]CONFIG", help="Configs clients can start games from")
+    parser.add_argument("--host", default="127.0.0.1", help="Address to listen on (default 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8765, help="Port to listen on (default 8765)")
+    parser.add_argument(
+        "--step", type=int, default=ACTIONS_PER_STEP, help="Player actions a game plays before letting other games run"
+    )
+    parser.add_argument("--max-games", type=int, default=100, help="How many games can be played at once")
+    parser.add_argument("--engine", choices=["auto", "python", "vector"], default="python", help="Turn engine")
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(
+            parse_configs(args.configs), args.host, args.port,
+            actions_per_step=args.step, max_games=args.max_games, engine=args.engine,
+        ))
+    except KeyboardInterrupt:
+        pass
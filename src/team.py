@@ -15,8 +15,11 @@ class SBRSTeam:
             name (str): The name of the team.
             players (list): A list of players in the team.
             addon_data (dict): A dictionary of data that addons can use.
+            alive_count (int): The number of players in the team that are still alive.
     """
 
+    __slots__ = ("name", "players", "addon_data", "alive_count")
+
     # Boring python class stuff
     def __init__(self, name):
         self.name = name
@@ -25,6 +28,8 @@ class SBRSTeam:
         """A list of players in the team."""
         self.addon_data = {}
         """A dictionary of data that addons can use."""
+        self.alive_count = 0
+        """The number of players in the team that are still alive. Updated by `SBRSPlayer.kill()`."""
 
     def __str__(self):
         return self.name
@@ -66,10 +71,7 @@ class SBRSTeam:
         return False
 
     def __bool__(self):
-        for player in self.players:
-            if player.alive:
-                return True
-        return False
+        return self.alive_count > 0
 
     def __len__(self):
         return len(self.players)
@@ -92,6 +94,8 @@ class SBRSTeam:
         """
         self.players.append(player)
         player.team = self
+        if player.alive:
+            self.alive_count += 1
 
     def remove_player(self, player):
         """
@@ -106,3 +110,5 @@ class SBRSTeam:
         """
         self.players.remove(player)
         player.team = None
+        if player.alive:
+            self.alive_count -= 1
@@ -0,0 +1,314 @@
+"""
+Tournaments for SBRS.
+
+Splits the roster into heats, plays every heat, and sends each heat's
+winner on to the next round, until one champion is left:
+
+    python sbrs.py config.json --tournament 100 --workers 16 --report report.json
+
+Or from Python:
+
+    result = run_tournament(basic_init("config.json", True, color=False), heat_size=100)
+    print(result.champion)
+
+Heats are played across a process pool. Each heat is handed to the pool as
+soon as every heat that feeds it has finished, so later rounds start while
+the rest of the earlier round is still being played, and a free worker
+always takes the next waiting heat. Workers are only sent the roster rows
+of their heat, and only send back its winner, kills and length.
+
+In team games, heats are made of whole teams, and the winning team moves
+on with all of its players.
+"""
+
+import contextlib
+import copy
+import json
+import os
+import random
+from collections import Counter, deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+try:
+    from .load_functions import load_players
+    from .output_sinks import NullSink
+    from .turn_summary import game_winner
+except ImportError:
+    from load_functions import load_players
+    from output_sinks import NullSink
+    from turn_summary import game_winner
+
+_worker_config = None
+
+
+class SBRSTournamentResult:
+    """
+    The results of a tournament.
+
+    Attributes:
+        seed (int | None): The seed the tournament was run with.
+        heat_size (int): The most players (or teams) in a heat.
+        champion (str | None): The winner of the last heat.
+        rounds (list): For each round, the winner of each heat in bracket order.
+                       Players (or teams) with a bye are listed as winning their heat.
+        kills (Counter): Each player's kills over the whole tournament. Players
+                         without kills are left out.
+        turns (Counter): How many heats lasted each number of turns.
+    """
+
+    def __init__(self, seed=None, heat_size=0):
+        self.seed = seed
+        self.heat_size = heat_size
+        self.champion = None
+        self.rounds = []
+        self.kills = Counter()
+        self.turns = Counter()
+
+    def add_heat(self, round_number: int, heat: int, winner, kills: dict, turns: int | None):
+        """
+        Records the result of one heat.
+
+        Args:
+            round_number (int): The heat's round, from 0.
+            heat (int): The heat's position in its round.
+            winner (str | None): The name of the winning player or team.
+            kills (dict): Kills in the heat, by player name.
+            turns (int | None): How many turns the heat lasted. None for a bye.
+        """
+        self.rounds[round_number][heat] = winner
+        self.kills.update(kills)
+        if turns is not None:
+            self.turns[turns] += 1
+
+    def heats(self) -> int:
+        """
+        Returns:
+            int: How many heats were played, not counting byes.
+        """
+        return sum(self.turns.values())
+
+    def to_dict(self) -> dict:
+        """
+        Returns:
+            dict: The result as JSON-friendly data. Histogram keys are strings.
+        """
+        return {
+            "seed": self.seed,
+            "heat-size": self.heat_size,
+            "champion": self.champion,
+            "heats": self.heats(),
+            "rounds": self.rounds,
+            "kills": dict(self.kills.most_common()),
+            "turns": {str(turns): count for turns, count in sorted(self.turns.items())},
+        }
+
+    def to_json(self, indent=4) -> str:
+        """
+        Returns:
+            str: The result as a JSON report.
+        """
+        return json.dumps(self.to_dict(), indent=indent)
+
+
+def split_evenly(items: list, size: int) -> list:
+    """
+    Splits a list into as few groups of at most `size` as possible, with group
+    sizes as close to each other as possible.
+
+    Args:
+        items (list): The items.
+        size (int): The largest group size.
+
+    Returns:
+        list: The groups, in order.
+    """
+    groups = -(-len(items) // size)
+    if groups <= 1:
+        return [items]
+    small, extra = divmod(len(items), groups)
+    result = []
+    start = 0
+    for i in range(groups):
+        end = start + small + (i < extra)
+        result.append(items[start:end])
+        start = end
+    return result
+
+
+def heat_seed(seed: int, round_number: int, heat: int) -> int:
+    """
+    Derives the seed of one heat, so a heat plays the same no matter which
+    worker plays it or when.
+
+    Args:
+        seed (int): The tournament's seed.
+        round_number (int): The heat's round.
+        heat (int): The heat's position in its round.
+
+    Returns:
+        int: A 64-bit seed.
+    """
+    return random.Random(f"{seed}:{round_number}:{heat}").getrandbits(64)
+
+
+def entrants(config) -> dict:
+    """
+    Groups the roster into tournament entrants.
+
+    Args:
+        config (SBRSConfig): The game configuration.
+
+    Returns:
+        dict: For each player (or team, in team games) in roster order, their
+              `(name, type, team)` roster rows.
+    """
+    result = {}
+    for player in config.players:
+        if config.use_teams:
+            team = str(player.team)
+            result.setdefault(team, []).append((player.name, player.type, team))
+        else:
+            result[player.name] = [(player.name, player.type, None)]
+    return result
+
+
+def play_heat(config, rows: list, seed: int, engine: str = "auto") -> tuple:
+    """
+    Plays one silent heat.
+
+    Args:
+        config (SBRSConfig): The game configuration, without players. It is copied, not modified.
+        rows (list): The heat's `(name, type, team)` roster rows.
+        seed (int): The seed for the heat's random numbers.
+        engine (str): The turn engine to use (see `SBRSGame`).
+
+    Returns:
+        tuple: The winner's name, the kills in the heat by player name (players
+               without kills are left out), and how many turns the heat lasted.
+    """
+    try:
+        from .sbrs import SBRSGame
+    except ImportError:
+        from sbrs import SBRSGame
+    config = copy.deepcopy(config)
+    config.players, config.teams = load_players(rows, None, None, config.use_teams)
+    config.playertypes = [player.type for player in config.players]
+    random.seed(seed)
+    game = SBRSGame(config, [NullSink()], engine)
+    game.run_game()
+    return (
+        game_winner(game),
+        {player.name: player.kills for player in config.players if player.kills},
+        game.turn,
+    )
+
+
+def _init_worker(config, engine):
+    global _worker_config  # pylint: disable=global-statement
+    _worker_config = (config, engine)
+
+
+def _play_worker_heat(rows, seed) -> tuple:
+    config, engine = _worker_config
+    # Addons and the player loader print; keep workers quiet
+    with open(os.devnull, "w", encoding="utf-8") as devnull, contextlib.redirect_stdout(devnull):
+        return play_heat(config, rows, seed, engine)
+
+
+def run_tournament(
+    config, heat_size: int, workers: int | None = None, seed: int | None = None, engine: str = "auto"
+) -> SBRSTournamentResult:
+    """
+    Plays a tournament of a config's roster.
+
+    The first round splits the roster into heats of at most `heat_size`
+    players (or teams). Every later round groups up to `heat_size` heats of
+    the round before, and its heats are played by their winners. A heat with
+    a single entrant is a bye.
+
+    Args:
+        config (SBRSConfig): The game configuration, from `basic_init()`.
+        heat_size (int): The most players (or teams) in a heat. At least 2.
+        workers (int | None): How many processes to use. Defaults to the number
+            of CPUs. With 1, heats are played in this process.
+        seed (int | None): The tournament's seed. If None, a random one is used.
+        engine (str): The turn engine to use (see `SBRSGame`).
+
+    Returns:
+        SBRSTournamentResult: The results.
+
+    Raises:
+        ValueError: If `heat_size` is less than 2, or the roster is empty.
+    """
+    if heat_size < 2:
+        raise ValueError("Heats need room for at least 2 players.")
+    if seed is None:
+        seed = random.SystemRandom().getrandbits(64)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    roster = entrants(config)
+    if not roster:
+        raise ValueError("The roster is empty.")
+    result = SBRSTournamentResult(seed, heat_size)
+
+    # The bracket: which entrants play the first round's heats, and which
+    # heats of the round before feed each heat after that
+    first_round = split_evenly(list(roster), heat_size)
+    feeders = [None]
+    heats = len(first_round)
+    while heats > 1:
+        feeders.append(split_evenly(list(range(heats)), heat_size))
+        heats = len(feeders[-1])
+    result.rounds = [[None] * len(first_round)] + [[None] * len(groups) for groups in feeders[1:]]
+    # The heat each heat's winner moves on to
+    next_heat = [
+        {feeder: heat for heat, group in enumerate(groups) for feeder in group} for groups in feeders[1:]
+    ]
+    waiting = [[len(group) for group in groups] for groups in feeders[1:]]
+
+    base = copy.copy(config)
+    base.players, base.playertypes, base.teams, base.sbrs_game_logger = [], [], None, None
+
+    ready = deque((0, heat, names) for heat, names in enumerate(first_round))
+
+    def finish(round_number, heat, winner, kills, turns):
+        result.add_heat(round_number, heat, winner, kills, turns)
+        if round_number + 1 == len(result.rounds):
+            result.champion = winner
+            return
+        following = next_heat[round_number][heat]
+        waiting[round_number][following] -= 1
+        if not waiting[round_number][following]:
+            group = feeders[round_number + 1][following]
+            # Heats that nobody survived send nobody on
+            names = [result.rounds[round_number][feeder] for feeder in group]
+            ready.append((round_number + 1, following, [name for name in names if name is not None]))
+
+    def playable():
+        """Takes the heats that are ready to play, settling byes on the way."""
+        while ready:
+            round_number, heat, names = ready.popleft()
+            if len(names) <= 1:
+                finish(round_number, heat, names[0] if names else None, {}, None)
+            else:
+                yield round_number, heat, [row for name in names for row in roster[name]]
+
+    if workers <= 1:
+        with open(os.devnull, "w", encoding="utf-8") as devnull, contextlib.redirect_stdout(devnull):
+            for round_number, heat, heat_rows in playable():
+                finish(
+                    round_number, heat, *play_heat(base, heat_rows, heat_seed(seed, round_number, heat), engine)
+                )
+        return result
+
+    with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(base, engine)) as pool:
+        running = {}
+        while ready or running:
+            for round_number, heat, heat_rows in playable():
+                future = pool.submit(_play_worker_heat, heat_rows, heat_seed(seed, round_number, heat))
+                running[future] = (round_number, heat)
+            if running:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    finish(*running.pop(future), *future.result())
+    return result
@@ -0,0 +1,65 @@
+"""
+    SBRSTurnSummary object, and working out who won a game.
+"""
+
+class SBRSTurnSummary:
+    """
+        What happened in one turn of a game. Yielded by `SBRSGame.iter_turns()`.
+
+        Attributes:
+            turn (int): The turn number.
+            remaining (int): How many players are alive after the turn.
+            remaining_teams (int): How many teams have alive players after the turn.
+            deaths (int): How many players died during the turn.
+            finished (bool): Whether the game ended this turn.
+            winner (str | None): The winning player (or team, in team games). Only set
+                                 once the game is finished.
+    """
+
+    __slots__ = ("turn", "remaining", "remaining_teams", "deaths", "finished", "winner")
+
+    def __init__(
+        self, turn, remaining, remaining_teams, deaths, finished=False, winner=None
+    ):  # pylint: disable=too-many-arguments
+        self.turn = turn
+        self.remaining = remaining
+        self.remaining_teams = remaining_teams
+        self.deaths = deaths
+        self.finished = finished
+        self.winner = winner
+
+    def to_dict(self) -> dict:
+        """
+            Returns:
+                dict: The summary as JSON-friendly data.
+        """
+        return {
+            "turn": self.turn,
+            "remaining": self.remaining,
+            "remaining-teams": self.remaining_teams,
+            "deaths": self.deaths,
+            "finished": self.finished,
+            "winner": self.winner,
+        }
+
+    def __repr__(self):
+        return (
+            f"SBRSTurnSummary(turn={self.turn}, remaining={self.remaining}, "
+            + f"deaths={self.deaths}, finished={self.finished}, winner={self.winner!r})"
+        )
+
+
+def game_winner(game):
+    """
+        Args:
+            game (SBRSGame): A finished game.
+
+        Returns:
+            str | None: The name of the winning player, or team in team games.
+    """
+    if not game.remaining_players:
+        return None
+    winner = game.remaining_players[0]
+    if game.config.use_teams and winner.team is not None:
+        return str(winner.team)
+    return winner.name
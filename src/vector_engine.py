@@ -0,0 +1,289 @@
+"""
+    SBRSVectorEngine object.
+
+    A turn engine for the vanilla ruleset that uses NumPy. Needs the optional
+    `numpy` package; `available()` says whether it can be used.
+"""
+
+import random
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+ATTACK = 0
+PASSIVE = 1
+PASSIVE_DEATH = 2
+BASIC_ACTIONS = ("attack", "passive", "passive-death")
+"""The actions added by `basic_game_behavior`, in the order the engine numbers them."""
+
+AUTO_MIN_PLAYERS = 1000
+"""With the "auto" engine, turns starting with fewer alive players than this use the reference engine."""
+
+RETARGET_LIMIT = 16
+"""How many times attacks on players who already died pick a new target before giving up."""
+
+# What each player ends up doing this turn
+NOTHING = 0
+KILL = 1
+ATTACK_FAIL = 2
+PASSIVE_ATTACK = 3
+PASSIVE_MESSAGE = 4
+DIE = 5
+
+
+def available() -> bool:
+    """
+        Returns:
+            bool: Whether NumPy is installed, so the engine can be used.
+    """
+    return np is not None
+
+
+class SBRSVectorEngine:
+    """
+        Resolves whole turns of the vanilla ruleset with array operations.
+
+        Every alive player's action and dice rolls for a turn are drawn at
+        once. Targets are picked from the players alive when the turn began.
+        Conflicts are then resolved as if players had acted one at a time in
+        roster order, like the reference engine does:
+
+        - An action by a player who was killed earlier in the turn is void.
+        - An attack on a player who was killed earlier in the turn picks a
+          new target. If it still can't find one alive after
+          `RETARGET_LIMIT` tries, it is void.
+
+        Each action's outcome only depends on actions earlier in the roster,
+        so this is solved by repeatedly recomputing every player's time of
+        death from the actions still considered valid, until nothing changes.
+
+        Anything after the game ends is dropped.
+
+        Attributes:
+            game (SBRSGame): The game being simulated.
+            rng (numpy.random.Generator): The engine's random number generator.
+                                          Seeded from the `random` module.
+    """
+
+    def __init__(self, game, rng=None):
+        """
+            Initializes the SBRSVectorEngine object.
+
+            Args:
+                game (SBRSGame): The game to simulate.
+                rng (numpy.random.Generator | None): The random number generator to use.
+                    Defaults to one seeded from the `random` module.
+
+            Raises:
+                ImportError: If NumPy is not installed.
+        """
+        if np is None:
+            raise ImportError("The vector engine needs NumPy.")
+        self.game = game
+        self.rng = rng if rng is not None else np.random.default_rng(random.getrandbits(64))
+        players = game.config.players
+        self._table = game.player_table
+        # Players on the same team can't attack each other. Without teams,
+        # every player is in a group of their own.
+        groups = {}
+        self._groups = np.array([
+            groups.setdefault(player.team, len(groups))
+            if game.config.use_teams and player.team is not None
+            else -1
+            for player in players
+        ], dtype=np.int64)
+        loners = self._groups < 0
+        self._groups[loners] = len(groups) + np.arange(int(loners.sum()))
+        self._alive = np.zeros(len(players), dtype=bool)
+        self._alive_count = -1
+        self._sync()
+
+    @staticmethod
+    def supports(game) -> bool:
+        """
+            Checks whether a game only uses the vanilla actions, without player
+            type weights or per-action hooks, so the engine can play it.
+
+            Args:
+                game (SBRSGame): The game.
+
+            Returns:
+                bool: True if the engine can be used.
+        """
+        if np is None or len(game.actions) != len(BASIC_ACTIONS):
+            return False
+        # Per-action hooks need every action to be played one at a time
+        if game.hooks["pre_action"] or game.hooks["post_action"]:
+            return False
+        base = game.addons[0] if game.addons else None
+        for action, name in zip(game.actions, BASIC_ACTIONS):
+            if action.name != name or getattr(action.function, "__self__", None) is not base:
+                return False
+            # Every player has to pick from the same weights
+            if action.type_weights:
+                return False
+        return True
+
+    def _sync(self):
+        """Rebuilds the alive mask if players were killed outside the engine."""
+        alive = self.game.alive
+        if len(alive) == self._alive_count:
+            return
+        self._alive[:] = np.frombuffer(bytes(self._table.alive), dtype=np.uint8)
+        self._alive_count = len(alive)
+
+    def play_turn(self):
+        """
+            Plays one turn: every alive player takes an action.
+        """
+        self._sync()
+        game = self.game
+        config = game.config
+        rng = self.rng
+        alive = np.flatnonzero(self._alive)
+        count = len(alive)
+        if count == 0:
+            return
+
+        weights = [action.weight for action in game.actions]
+        if not any(weights):
+            # Fail like the Python engine does
+            game.check_action_weights()
+        if weights.count(weights[0]) == len(weights):
+            actions = rng.integers(0, len(BASIC_ACTIONS), count)
+        else:
+            actions = rng.choice(len(BASIC_ACTIONS), count, p=np.array(weights) / sum(weights))
+        hit = rng.random(count) < config.attack_chance
+        success = rng.random(count) < config.attack_success_chance
+        dies = rng.random(count) < config.passive_death_chance
+
+        # Pick targets from the players alive at the start of the turn,
+        # skipping over the attacker's own group
+        groups = self._groups[alive]
+        order = np.argsort(groups, kind="stable")
+        unique, starts, sizes = np.unique(groups[order], return_index=True, return_counts=True)
+        group_of = np.searchsorted(unique, groups)
+        own_start = starts[group_of]
+        own_size = sizes[group_of]
+        choices = count - own_size
+
+        def pick(positions):
+            picks = (rng.random(len(positions)) * np.maximum(choices[positions], 1)).astype(np.int64)
+            picks += np.where(picks >= own_start[positions], own_size[positions], 0)
+            return alive[order[np.minimum(picks, count - 1)]]
+
+        targets = pick(np.arange(count))
+
+        outcome = np.full(count, NOTHING, dtype=np.int8)
+        attacking = actions == ATTACK
+        outcome[attacking & hit & (choices > 0) & success] = KILL
+        if not config.show_kills_only:
+            outcome[attacking & hit & (choices > 0) & ~success] = ATTACK_FAIL
+            if not config.classic_behavior:
+                outcome[attacking & ~hit] = PASSIVE_ATTACK
+        outcome[actions == PASSIVE] = PASSIVE_MESSAGE
+        outcome[(actions == PASSIVE_DEATH) & dies] = DIE
+
+        valid = self._resolve(alive, outcome, targets, pick)
+        if game.listening:
+            self._play_listening(alive, outcome, targets, valid)
+        else:
+            self._play_silent(alive, outcome, targets, valid)
+        self._sync()
+
+    def _resolve(self, alive, outcome, targets, pick):
+        """
+            Works out which actions actually happen. Attacks on players who
+            died earlier in the turn pick a new target (up to `RETARGET_LIMIT`
+            times), so targets end up uniform over the players still alive.
+            `targets` is updated in place.
+
+            Returns:
+                numpy.ndarray: For each alive player, whether their action happens.
+        """
+        count = len(alive)
+        times = np.arange(count)
+        killing = outcome == KILL
+        targeting = killing | (outcome == ATTACK_FAIL)
+        deadly = killing | (outcome == DIE)
+        valid = np.ones(count, dtype=bool)
+        retargets = 0
+        # Work with positions in `alive` rather than roster indices, so every
+        # array here is as small as the number of alive players
+        target_positions = np.searchsorted(alive, targets)
+        while True:
+            victims = np.where(killing, target_positions, times)
+            death_time = np.full(count, count, dtype=np.int64)
+            happens = valid & deadly
+            np.minimum.at(death_time, victims[happens], times[happens])
+            actor_alive = death_time >= times
+            target_dead = targeting & (death_time[target_positions] < times)
+            if retargets < RETARGET_LIMIT and np.any(actor_alive & target_dead):
+                # Only retarget once the rest of the turn is settled, so
+                # attacks aren't moved away from targets that turn out fine
+                if np.array_equal(actor_alive & ~target_dead, valid):
+                    stale = np.flatnonzero(actor_alive & target_dead)
+                    targets[stale] = pick(stale)
+                    target_positions[stale] = np.searchsorted(alive, targets[stale])
+                    retargets += 1
+                valid = actor_alive & ~target_dead
+                continue
+            updated = actor_alive & ~target_dead
+            if np.array_equal(updated, valid):
+                return valid
+            valid = updated
+
+    def _play_silent(self, alive, outcome, targets, valid):
+        game = self.game
+        players = game.config.players
+        remaining = game.alive
+        use_teams = game.config.use_teams
+        happens = np.flatnonzero(valid & ((outcome == KILL) | (outcome == DIE)))
+        actors = alive[happens].tolist()
+        kills = (outcome[happens] == KILL).tolist()
+        hit = targets[happens].tolist()
+        killers = []
+        victims = []
+        for actor, killed, target in zip(actors, kills, hit):
+            if killed:
+                killers.append(actor)
+                victims.append(target)
+            else:
+                victims.append(actor)
+            players[victims[-1]].kill()
+            # Nothing else is shown, so announcements only need to happen once
+            if (remaining.team_count if use_teams else len(remaining)) == 1:
+                break
+        table_kills = self._table.kills
+        for killer in killers:
+            table_kills[killer] += 1
+        self._alive[victims] = False
+        self._alive_count = len(remaining)
+        game.after_action()
+
+    def _play_listening(self, alive, outcome, targets, valid):
+        game = self.game
+        players = game.config.players
+        passive = game.actions[PASSIVE].function
+        for position in np.flatnonzero(valid & (outcome != NOTHING)).tolist():
+            player = players[alive[position]]
+            kind = outcome[position]
+            if kind == KILL:
+                target = players[targets[position]]
+                game.emit("attack-success", player, target)
+                target.kill()
+                player.kills += 1
+            elif kind == ATTACK_FAIL:
+                game.emit("attack-fail", player, players[targets[position]])
+            elif kind == PASSIVE_ATTACK:
+                game.emit("passive-attack", player)
+            elif kind == PASSIVE_MESSAGE:
+                passive(game, player)
+            else:
+                game.emit("passive-death", player)
+                player.kill()
+            game.after_action()
+            if game.finished:
+                return
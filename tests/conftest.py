@@ -0,0 +1,12 @@
+"""
+Shared test setup
+"""
+
+import pytest
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    """Keeps every test's config caches in its own folder."""
+    path = tmp_path / "cache"
+    monkeypatch.setenv("SBRS_CACHE_DIR", str(path))
+    return path
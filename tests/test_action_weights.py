@@ -0,0 +1,96 @@
+"""
+Unit tests: Action weights
+"""
+
+import json
+import os
+import random
+from collections import Counter
+
+import pytest
+from action import SBRSAction
+from alias_table import SBRSAliasTable
+from estimator import estimate
+from output_sinks import NullSink
+from sbrs import SBRSGame, basic_init
+
+def test_alias_table_distribution():
+    """Alias tables pick items in proportion to their weights."""
+    rng = random.Random(3)
+    table = SBRSAliasTable("abcd", [1, 2, 3, 0])
+    counts = Counter(table.pick(rng.random) for _ in range(60000))
+    assert counts["d"] == 0
+    for item, weight in zip("abc", [1, 2, 3]):
+        assert abs(counts[item] / 60000 - weight / 6) < 0.01
+
+def test_alias_table_invalid():
+    """Negative or all-zero weights are rejected."""
+    with pytest.raises(ValueError):
+        SBRSAliasTable("ab", [1, -1])
+    with pytest.raises(ValueError):
+        SBRSAliasTable("ab", [0, 0])
+
+def test_weighted_game_actions():
+    """Zero-weight actions are never picked, and type weights override the default."""
+    game = SBRSGame(basic_init("tests/configs/config-test_normal.json", True), [NullSink()], "python")
+    picks = []
+    for action in list(game.actions):
+        game.remove_action(action)
+    game.add_action(SBRSAction("wait", "Player waits", lambda game, player: picks.append("wait")))
+    game.add_action(SBRSAction(
+        "rest", "Player rests", lambda game, player: picks.append("rest"), weight=0, type_weights={"Sleeper": 1}
+    ))
+    player = game.config.players[0]
+    assert {game.pick_action(player).name for _ in range(100)} == {"wait"}
+    player.type = "Sleeper"
+    assert {game.pick_action(player).name for _ in range(200)} == {"wait", "rest"}
+    game.actions[0].type_weights = {"Sleeper": 0}
+    game.invalidate_actions()
+    assert {game.pick_action(player).name for _ in range(100)} == {"rest"}
+    game.actions[0].weight = 0
+    with pytest.raises(ValueError):
+        game.invalidate_actions()
+
+def test_weighted_config(tmp_path):
+    """"action-weights" in the config weights the vanilla actions, and the estimator uses them."""
+    with open("tests/configs/config-test_normal.json", encoding="utf-8") as f:
+        config = json.load(f)
+    config["files"] = {key: os.path.abspath(path) for key, path in config["files"].items()}
+    config["action-weights"] = {"attack": 0, "passive-death": {"Default": 2, "Tank": 0}}
+    path = tmp_path / "config.json"
+    path.write_text(json.dumps(config), encoding="utf-8")
+    game_config = basic_init(str(path), True)
+    game = SBRSGame(game_config, [NullSink()], "python")
+    attack, passive, passive_death = game.actions
+    assert (attack.weight, passive.weight, passive_death.weight) == (0, 1, 2)
+    assert passive_death.type_weights == {"Tank": 0}
+    player = game.config.players[0]
+    player.type = "Tank"
+    assert {game.pick_action(player).name for _ in range(100)} == {"passive"}
+    assert estimate(100, 0.3, 0.5, 0.5, action_weights=(2, 2, 2)).turns == estimate(100, 0.3, 0.5, 0.5).turns
+
+@pytest.mark.parametrize("weights", [
+    {"attack": 0, "passive": 0, "passive-death": 0},
+    {"attack": {"Default": 1, "Tank": 0}, "passive": {"Tank": 0}, "passive-death": {"Tank": 0}},
+])
+def test_all_zero_weights(tmp_path, weights):
+    """Configs where some players have no action to take fail before the game starts."""
+    with open("tests/configs/config-test_normal.json", encoding="utf-8") as f:
+        config = json.load(f)
+    config["files"] = {key: os.path.abspath(path) for key, path in config["files"].items()}
+    config["action-weights"] = weights
+    path = tmp_path / "config.json"
+    path.write_text(json.dumps(config), encoding="utf-8")
+    with pytest.raises(ValueError, match="weight of 0"):
+        SBRSGame(basic_init(str(path), True), [NullSink()], "python")
+
+@pytest.mark.parametrize("engine", ["python", "vector"])
+def test_all_zero_weights_engines(engine):
+    """Both engines refuse to play when weights are set to 0 behind the game's back."""
+    if engine == "vector":
+        pytest.importorskip("numpy")
+    game = SBRSGame(basic_init("tests/configs/config-test_normal.json", True), [NullSink()], engine)
+    for action in game.actions:
+        action.weight = 0
+    with pytest.raises(ValueError):
+        game.run_game()
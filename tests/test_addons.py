@@ -0,0 +1,99 @@
+"""
+Unit tests: Addon loading
+"""
+
+import subprocess
+import sys
+
+import pytest
+import addon_loader
+from action import SBRSAction
+from sbrs import SBRSAddon, SBRSGame, basic_init
+
+ADDON_SOURCE = '''
+from action import SBRSAction
+from sbrs import SBRSAddon
+
+IMPORTS = globals().get("IMPORTS", 0) + 1
+
+class Addon(SBRSAddon):
+    def initgame(self, game):
+        game.add_action(SBRSAction("wave", "Player waves", self.wave))
+
+    def end_turn(self, game):
+        pass
+
+    def wave(self, game, player):
+        pass
+'''
+
+@pytest.fixture
+def addon_dir(tmp_path, monkeypatch):
+    """Points the addon loader at a temporary addons folder with one addon in it."""
+    (tmp_path / "addons").mkdir()
+    (tmp_path / "addons" / "wave.py").write_text(ADDON_SOURCE, encoding="utf-8")
+    monkeypatch.setattr(addon_loader, "ADDON_DIR", str(tmp_path / "addons"))
+    monkeypatch.syspath_prepend(str(tmp_path))
+    for name in [name for name in sys.modules if name == "addons" or name.startswith("addons.")]:
+        monkeypatch.delitem(sys.modules, name)
+    addon_loader.addon_manifest(SBRSAddon, reload=True)
+    yield
+    monkeypatch.undo()
+    addon_loader.addon_manifest(SBRSAddon, reload=True)
+
+def test_addon_manifest(addon_dir):  # pylint: disable=redefined-outer-name,unused-argument
+    """Addons are imported once and the manifest records their hooks and actions."""
+    config = basic_init("tests/configs/config-test_normal.json", True)
+    first = SBRSGame(config)
+    second = SBRSGame(basic_init("tests/configs/config-test_normal.json", True))
+    assert sys.modules["addons.wave"].IMPORTS == 1
+    assert first.addons[1] is not second.addons[1]
+    assert isinstance(second.actions[-1], SBRSAction) and second.actions[-1].name == "wave"
+    (info,) = addon_loader.addon_manifest(SBRSAddon)
+    assert info.hooks == ("initgame", "end_turn")
+    assert info.actions == ("wave",)
+
+def test_lazy_imports():
+    """Importing sbrs doesn't import colorama or argparse."""
+    result = subprocess.run(
+        [sys.executable, "-c", "import sys, sbrs; print('colorama' in sys.modules, 'argparse' in sys.modules)"],
+        cwd="src", capture_output=True, text=True, check=True,
+    )
+    assert result.stdout.strip() == "False False"
+
+class CountingAddon(SBRSAddon):
+    """Counts actions and turns."""
+
+    def early_init(self):
+        self.actions = 0
+        self.turns = 0
+
+    def post_action(self, game, player, action):
+        self.actions += 1
+
+    def end_turn(self, game):
+        self.turns += 1
+
+def test_hook_dispatch():
+    """Only overridden hooks are dispatched, and per-action hooks run for every action."""
+    game = SBRSGame(basic_init("tests/configs/config-test_normal.json", True))
+    addon = CountingAddon()
+    game.addons.append(addon)
+    game.rebuild_hooks()
+    assert game.hooks["pre_action"] == []
+    assert game.hooks["post_action"] == [addon.post_action]
+    assert len(game.hooks["start_turn"]) == 1
+    game.run_game()
+    assert addon.turns == game.turn
+    assert addon.actions >= len(game.config.players)
+
+def test_sudden_death():
+    """The base addon's start_turn hook starts sudden death once 10% of players are left."""
+    game = SBRSGame(basic_init("tests/configs/config-test_stresstest.json", True), engine="python")
+    players = game.config.players
+    for player in players[len(players) // 10:]:
+        player.kill()
+    game.turn += 1
+    game.simulate_turn()
+    assert game.sudden_death
+    assert game.config.attack_chance == 1
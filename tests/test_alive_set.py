@@ -0,0 +1,86 @@
+"""
+Unit tests: Tracking alive players
+"""
+
+import pytest
+from alive_set import SBRSAliveSet
+from player import SBRSPlayer
+from sbrs import SBRSGame, basic_init
+
+def test_alive_set_kill():
+    """Killing a player removes it from the alive set and keeps slots consistent."""
+    players = [SBRSPlayer(f"Player{i}") for i in range(5)]
+    alive = SBRSAliveSet(players)
+    players[1].kill()
+    assert len(alive) == 4
+    assert players[1] not in alive
+    for slot, player in enumerate(alive):
+        assert player.alive_slot == slot
+
+def test_alive_set_double_kill():
+    """Killing a player twice does nothing the second time."""
+    players = [SBRSPlayer(f"Player{i}") for i in range(3)]
+    alive = SBRSAliveSet(players)
+    players[0].kill()
+    players[0].kill()
+    assert len(alive) == 2
+
+def test_remaining_players_read_only():
+    """`remaining_players` follows kills but cannot be reassigned."""
+    game = SBRSGame(basic_init("tests/configs/config-test_normal.json", True))
+    total = len(game.remaining_players)
+    game.config.players[0].kill()
+    assert len(game.remaining_players) == total - 1
+    with pytest.raises(AttributeError):
+        game.remaining_players = []
+
+def test_alive_setter():
+    """Setting `alive` kills and revives players like `kill()` does."""
+    game = SBRSGame(basic_init("tests/configs/config-test_teams.json", True))
+    player = game.config.players[0]
+    total, team_alive = len(game.remaining_players), player.team.alive_count
+    player.alive = False
+    assert len(game.remaining_players) == total - 1
+    assert player not in game.remaining_players
+    assert player.team.alive_count == team_alive - 1
+    player.alive = True
+    assert len(game.remaining_players) == total
+    assert player in game.remaining_players
+    assert player.team.alive_count == team_alive
+    for slot, alive in enumerate(game.alive):
+        assert alive.alive_slot == slot
+
+def test_team_elimination():
+    """Killing the last player of a team updates the team counters."""
+    game = SBRSGame(basic_init("tests/configs/config-test_teams.json", True))
+    assert game.remaining_teams == 2
+    team = game.config.teams[0]
+    for player in team:
+        assert team
+        player.kill()
+    assert not team
+    assert team.alive_count == 0
+    assert game.remaining_teams == 1
+    assert game.alive.eliminated_teams == [team]
+
+def test_sample_opponent():
+    """Opponents are never on the attacker's team, and running out of them is reported."""
+    game = SBRSGame(basic_init("tests/configs/config-test_teams.json", True))
+    attacker = game.config.teams[0][0]
+    for _ in range(100):
+        target = game.alive.sample_opponent(attacker)
+        assert target.team != attacker.team
+        assert target.alive
+    for player in game.config.teams[1]:
+        player.kill()
+    assert game.alive.sample_opponent(attacker) is None
+
+def test_sample_other():
+    """`sample_other` never picks the player itself."""
+    players = [SBRSPlayer(f"Player{i}") for i in range(3)]
+    alive = SBRSAliveSet(players)
+    for _ in range(100):
+        assert alive.sample_other(players[1]) is not players[1]
+    players[0].kill()
+    players[2].kill()
+    assert alive.sample_other(players[1]) is None
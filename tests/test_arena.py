@@ -0,0 +1,48 @@
+"""
+Unit tests: Sharded arenas
+"""
+
+import pytest
+from arena import run_arenas
+from sbrs import basic_init
+
+def test_arenas_game():
+    """A sharded game merges arenas as players die and ends with one winner."""
+    config = basic_init("tests/configs/config-test_stresstest.json", True, color=False)
+    result = run_arenas(config, 4, merge_every=3, workers=1, seed=5, min_arena_players=100)
+    names = {player.name for player in config.players}
+    assert result.winner in names
+    assert result.epochs[0] == {"turn": 1, "arenas": 4, "players": len(config.players)}
+    assert result.epochs[-1]["arenas"] == 1
+    assert [epoch["players"] for epoch in result.epochs] == sorted((epoch["players"] for epoch in result.epochs), reverse=True)
+    # Sudden death starts for the whole game once 10% of players are left
+    started = next(epoch for epoch in result.epochs if epoch["turn"] >= result.sudden_death_turn)
+    assert started["players"] <= len(config.players) * 0.1
+    assert set(result.kills) <= names and sum(result.kills.values()) <= len(config.players) - 1
+    # The config itself is left untouched
+    assert all(player.alive and player.kills == 0 for player in config.players)
+
+def test_arenas_same_seed_any_workers():
+    """The same seed gives the same game whether arenas run in one process or several."""
+    config = basic_init("tests/configs/config-test_stresstest.json", True, color=False)
+    single = run_arenas(config, 2, merge_every=5, workers=1, seed=2, min_arena_players=1000, shuffle=False)
+    pooled = run_arenas(config, 2, merge_every=5, workers=2, seed=2, min_arena_players=1000, shuffle=False)
+    assert single.to_dict() == pooled.to_dict()
+
+def test_arenas_teams():
+    """Team games end when one team is left in the whole game."""
+    config = basic_init("tests/configs/config-test_teams.json", True, color=False)
+    result = run_arenas(config, 3, merge_every=2, workers=1, seed=1, min_arena_players=2)
+    assert result.winner in ("Team1", "Team2")
+    with pytest.raises(ValueError):
+        run_arenas(config, 0)
+
+def test_arenas_too_few_players(capsys):
+    """Rosters too small to shard are played in one arena, and the user is told."""
+    config = basic_init("tests/configs/config-test_normal.json", True, color=False)
+    capsys.readouterr()
+    result = run_arenas(config, 4, workers=1, seed=1)
+    assert result.epochs[0]["arenas"] == 1
+    assert "instead of 4" in capsys.readouterr().out
+    stresstest = basic_init("tests/configs/config-test_stresstest.json", True, color=False)
+    assert run_arenas(stresstest, 4, workers=1, seed=1).epochs[0]["arenas"] == 4
@@ -0,0 +1,40 @@
+"""
+Unit tests: Batch runs
+"""
+
+import json
+
+from batch import SBRSBatchResult, run_batch
+from sbrs import basic_init
+
+def test_batch_totals():
+    """Every game in a batch has one winner and one length."""
+    config = basic_init("tests/configs/config-test_normal.json", True, color=False)
+    result = run_batch(config, 50, workers=1, seed=1)
+    assert result.games == 50
+    assert sum(result.wins.values()) == 50
+    assert sum(result.turns.values()) == 50
+    assert all(sum(histogram.values()) == 50 for histogram in result.kills.values())
+    # The config itself is left untouched
+    assert all(player.alive and player.kills == 0 for player in config.players)
+
+def test_batch_same_seed_any_workers():
+    """The same seed gives the same result whether games run in one process or several."""
+    config = basic_init("tests/configs/config-test_normal.json", True, color=False)
+    single = run_batch(config, 20, workers=1, seed=42)
+    pooled = run_batch(config, 20, workers=2, seed=42)
+    assert single.to_dict() == pooled.to_dict()
+
+def test_batch_report():
+    """Results can be merged and written as JSON."""
+    result = SBRSBatchResult(seed=3)
+    result.add_game("Bob", {"Bob": 2, "Joe": 0}, 4)
+    other = SBRSBatchResult()
+    other.add_game("Joe", {"Bob": 0, "Joe": 1}, 4)
+    result.merge(other)
+    report = json.loads(result.to_json())
+    assert report["games"] == 2
+    assert report["win-rates"] == {"Bob": 0.5, "Joe": 0.5}
+    assert report["kills"]["Bob"] == {"0": 1, "2": 1}
+    assert report["turns"] == {"4": 2}
+    assert report["mean-kills"]["Bob"] == 1.0
@@ -0,0 +1,109 @@
+"""
+Unit tests: Checkpoints
+"""
+
+import json
+import random
+
+import pytest
+
+from checkpoint import decode_snapshot
+from output_sinks import MemorySink
+from sbrs import SBRSGame, basic_init
+
+def play_turns(game, turns):
+    """Simulates a number of turns, the same way `run_game()` does."""
+    for _ in range(turns):
+        if game.finished:
+            break
+        game.turn += 1
+        game.simulate_turn()
+
+@pytest.mark.parametrize("config", ["config-test_normal.json", "config-test_teams.json"])
+def test_resume_matches_uninterrupted_game(config, tmp_path):
+    """A game restored from a checkpoint plays out exactly like one that never stopped."""
+    path = str(tmp_path / "game.sbrscheckpoint")
+    random.seed(5)
+    full = MemorySink()
+    game = SBRSGame(basic_init(f"tests/configs/{config}", True), [full])
+    play_turns(game, 2)
+    lines_before = len(full.lines)
+    game.checkpoint(path)
+    game.run_game()
+
+    resumed = MemorySink()
+    game = SBRSGame(basic_init(f"tests/configs/{config}", True), [resumed])
+    game.restore(path)
+    assert game.turn == 2
+    game.run_game()
+    assert resumed.lines == full.lines[lines_before:]
+
+def test_background_checkpoint(tmp_path):
+    """Checkpoints written in the background can be restored."""
+    path = str(tmp_path / "game.sbrscheckpoint")
+    game = SBRSGame(basic_init("tests/configs/config-test_normal.json", True), [MemorySink()])
+    play_turns(game, 1)
+    game.config.players[0].addon_data["hello"] = "world"
+    game.checkpoint(path, wait=False)
+    alive = [player.name for player in game.remaining_players]
+    kills = [player.kills for player in game.config.players]
+    game.wait_for_checkpoint()
+
+    restored = SBRSGame(basic_init("tests/configs/config-test_normal.json", True), [MemorySink()])
+    restored.restore(path)
+    assert [player.name for player in restored.remaining_players] == alive
+    assert [player.kills for player in restored.config.players] == kills
+    assert restored.config.players[0].addon_data == {"hello": "world"}
+
+def test_restore_other_roster(tmp_path):
+    """Checkpoints can't be restored into a game with different players."""
+    path = str(tmp_path / "game.sbrscheckpoint")
+    SBRSGame(basic_init("tests/configs/config-test_normal.json", True), [MemorySink()]).checkpoint(path)
+    game = SBRSGame(basic_init("tests/configs/config-test_teams.json", True), [MemorySink()])
+    with pytest.raises(ValueError):
+        game.restore(path)
+
+def test_background_checkpoint_error(tmp_path):
+    """A background checkpoint that can't be written raises its error instead of losing it."""
+    path = str(tmp_path / "missing" / "game.sbrscheckpoint")
+    game = SBRSGame(basic_init("tests/configs/config-test_normal.json", True), [MemorySink()])
+    game.checkpoint(path, wait=False)
+    with pytest.raises(OSError):
+        game.wait_for_checkpoint()
+    game.wait_for_checkpoint()
+
+    game.checkpoint_path = path
+    game.checkpoint_every = 1
+    with pytest.raises(OSError):
+        list(game.iter_turns())
+    assert not game.finished
+
+def test_checkpoint_is_plain_data(tmp_path):
+    """Checkpoints hold JSON rather than pickles, so addon_data has to be JSON-compatible."""
+    path = tmp_path / "game.sbrscheckpoint"
+    game = SBRSGame(basic_init("tests/configs/config-test_normal.json", True), [MemorySink()])
+    game.config.players[0].addon_data["lives"] = (1, 2)
+    game.checkpoint(str(path))
+    _, sections = decode_snapshot(path.read_bytes())
+    extra = json.loads(sections["extra"])
+    assert extra["player-data"] == {"0": {"lives": [1, 2]}}
+
+    game.config.players[0].addon_data["lives"] = object()
+    with pytest.raises(TypeError):
+        game.checkpoint(str(path))
+
+def test_resume_vector_engine(tmp_path):
+    """The vector engine's random numbers are restored too."""
+    pytest.importorskip("numpy")
+    path = str(tmp_path / "game.sbrscheckpoint")
+    random.seed(5)
+    game = SBRSGame(basic_init("tests/configs/config-test_stresstest.json", True), [MemorySink()], "vector")
+    play_turns(game, 1)
+    game.checkpoint(path)
+    play_turns(game, 1)
+    alive = sorted(player.name for player in game.remaining_players)
+
+    game = SBRSGame(basic_init("tests/configs/config-test_stresstest.json", True), [MemorySink()], "vector")
+    game.restore(path)
+    play_turns(game, 1)
+    assert sorted(player.name for player in game.remaining_players) == alive
@@ -0,0 +1,83 @@
+"""
+Unit tests: Config cache
+"""
+
+import copy
+import json
+import os
+import shutil
+
+import pytest
+
+import message_template
+from config_cache import cache_path, load_cache
+from sbrs import basic_init
+
+def copy_config(tmp_path):
+    """Copies the normal test config and its players into a temporary folder."""
+    for name in ("players-test.txt", "playertypes-test.txt"):
+        shutil.copy(f"tests/players/{name}", tmp_path / name)
+    with open("tests/configs/config-test_normal.json", encoding="utf-8") as f:
+        config = json.load(f)
+    config["files"] = {"players": "players-test.txt", "playertypes": "playertypes-test.txt"}
+    path = tmp_path / "config.json"
+    path.write_text(json.dumps(config), encoding="utf-8")
+    return str(path)
+
+def test_cache_reused(tmp_path):
+    """A second load comes from the cache and matches the first."""
+    path = copy_config(tmp_path)
+    first = basic_init(path, True, False)
+    assert os.path.exists(cache_path(path))
+    assert not any(name.endswith(".sbrscache") for name in os.listdir(tmp_path))
+    assert load_cache(path) is not None
+    second = basic_init(path, True, False)
+    assert [(p.name, p.type) for p in second.players] == [(p.name, p.type) for p in first.players]
+    assert second.messages.keys() == first.messages.keys()
+    assert second.playertypes == first.playertypes
+
+def test_cache_invalidated(tmp_path):
+    """Changing a roster file throws the cache away; touching it doesn't."""
+    path = copy_config(tmp_path)
+    basic_init(path, True, False)
+    players = tmp_path / "players-test.txt"
+    os.utime(players, ns=(0, 0))
+    assert load_cache(path) is not None
+    players.write_text(players.read_text(encoding="utf-8") + "\nNewPlayer\n", encoding="utf-8")
+    assert load_cache(path) is None
+    config = basic_init(path, True, False)
+    assert config.players[-1].name == "NewPlayer"
+
+def test_no_cache(tmp_path):
+    """Loading without the cache doesn't write one."""
+    path = copy_config(tmp_path)
+    basic_init(path, True, False, use_cache=False)
+    assert not os.path.exists(cache_path(path))
+
+@pytest.mark.skipif(not hasattr(os, "getuid"), reason="files have no owners here")
+def test_shared_cache_ignored(tmp_path, cache_dir):
+    """Caches that other users could have written are never loaded."""
+    path = copy_config(tmp_path)
+    basic_init(path, True, False)
+    assert load_cache(path) is not None
+    os.chmod(cache_path(path), 0o666)
+    assert load_cache(path) is None
+    os.chmod(cache_path(path), 0o600)
+    os.chmod(cache_dir, 0o777)
+    assert load_cache(path) is None
+
+def test_cache_hit_skips_parser(tmp_path, monkeypatch):
+    """Messages loaded from the cache, or copied, are never parsed again."""
+    path = copy_config(tmp_path)
+    first = basic_init(path, True, False)
+
+    class NoParsing:  # pylint: disable=too-few-public-methods
+        """Fails the test if a message is parsed."""
+        def split(self, text):
+            raise AssertionError(f"parsed {text!r}")
+
+    monkeypatch.setattr(message_template, "PLACEHOLDER_PATTERN", NoParsing())
+    second = basic_init(path, True, False)
+    template = second.messages["passive"]["Default"][0]
+    assert template.segments == first.messages["passive"]["Default"][0].segments
+    assert copy.deepcopy(second).messages["passive"]["Default"][0] is template
@@ -0,0 +1,38 @@
+"""
+Unit tests: Game estimates
+"""
+
+import pytest
+
+from batch import run_batch
+from estimator import estimate, estimate_config
+from sbrs import basic_init
+
+def test_estimate_matches_simulation():
+    """Estimated game lengths agree with simulated games."""
+    config = basic_init("tests/configs/config-test_classic.json", True, color=False)
+    estimated = estimate_config(config)
+    simulated = run_batch(config, 1500, workers=1, seed=7, engine="python")
+    assert abs(sum(estimated.turns) - 1) < 1e-9
+    assert abs(estimated.expected_turns() - simulated.mean_turns()) < 0.4
+    for turn in range(1, 15):
+        share = simulated.turns.get(turn, 0) / simulated.games
+        assert abs(estimated.turns[turn - 1] - share) < 0.035
+
+def test_estimate_large_game():
+    """Huge games are estimated quickly, and players only ever die."""
+    estimated = estimate(1000000, 0.3, 0.5, 0.5)
+    assert abs(sum(estimated.turns) - 1) < 1e-6
+    assert 15 < estimated.expected_turns() < 40
+    assert all(a >= b for a, b in zip(estimated.survival, estimated.survival[1:]))
+
+def test_estimate_sudden_death():
+    """Sudden death makes games shorter."""
+    assert estimate(500, 0.1, 0.1, 0.5).expected_turns() < estimate(500, 0.1, 0.1, 0.5, False).expected_turns()
+
+def test_estimate_rejects_teams():
+    """Team games can't be estimated."""
+    with pytest.raises(ValueError):
+        estimate_config(basic_init("tests/configs/config-test_teams.json", True, color=False))
+    with pytest.raises(ValueError):
+        estimate(10, 0, 0, 0)
@@ -0,0 +1,57 @@
+"""
+Unit tests: Binary event logs
+"""
+
+import io
+import json
+
+import pytest
+
+from event_log import SBRSEventLogSink, convert_to_jsonl, convert_to_text, read_event_log
+from output_sinks import BackgroundSink, MemorySink
+from sbrs import SBRSGame, basic_init
+
+def test_event_log_matches_text(tmp_path):
+    """Converting a binary log to text gives the same lines as a text sink."""
+    path = str(tmp_path / "game.sbrslog")
+    memory = MemorySink()
+    log = SBRSEventLogSink(path, {"config": "config-test_normal.json"})
+    game = SBRSGame(basic_init("tests/configs/config-test_normal.json", True), [memory, log])
+    game.run_game()
+    out = io.StringIO()
+    convert_to_text(path, out)
+    assert out.getvalue() == "".join(line + "\n" for line in memory.lines)
+
+def test_event_log_jsonl(tmp_path):
+    """JSONL export has a header line followed by one line per event."""
+    path = str(tmp_path / "game.sbrslog")
+    log = BackgroundSink(SBRSEventLogSink(path, {"config": "config-test_normal.json"}))
+    game = SBRSGame(basic_init("tests/configs/config-test_normal.json", True), [log])
+    game.run_game()
+    out = io.StringIO()
+    convert_to_jsonl(path, out)
+    lines = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert lines[0]["info"]["config"] == "config-test_normal.json"
+    assert lines[1]["kind"] == "new-turn"
+    assert lines[1]["turn"] == 1
+    assert lines[-1]["kind"] == "end-turn"
+    assert any(line["kind"] in ("winner", "team-winner") for line in lines[1:])
+
+def test_event_log_readable_before_close(tmp_path):
+    """Flushed events can be read even if the log was never closed."""
+    path = str(tmp_path / "game.sbrslog")
+    log = SBRSEventLogSink(path)
+    game = SBRSGame(basic_init("tests/configs/config-test_normal.json", True), [log])
+    game.simulate_turn()
+    _, events = read_event_log(path)
+    kinds = [event.kind for event in events]
+    assert kinds[0] == "new-turn"
+    assert kinds[-1] == "end-turn"
+    log.close()
+
+def test_not_an_event_log(tmp_path):
+    """Other files are rejected."""
+    path = tmp_path / "game.log"
+    path.write_text("Turn 1\n")
+    with pytest.raises(ValueError):
+        read_event_log(str(path))
@@ -0,0 +1,51 @@
+"""
+Unit tests: Stepping through games with generators
+"""
+
+import random
+
+from output_sinks import MemorySink, NullSink
+from sbrs import SBRSGame, basic_init
+
+def new_game(sinks=None) -> SBRSGame:
+    """Returns a seeded game of the normal test config."""
+    random.seed(3)
+    return SBRSGame(basic_init("tests/configs/config-test_normal.json", True), sinks or [NullSink()], "python")
+
+def test_iter_turns():
+    """Every turn is summarized, and the last summary has the winner."""
+    game = new_game()
+    summaries = list(game.iter_turns())
+    assert [summary.turn for summary in summaries] == list(range(1, game.turn + 1))
+    assert sum(summary.deaths for summary in summaries) == len(game.config.players) - 1
+    assert not any(summary.finished for summary in summaries[:-1])
+    assert summaries[-1].finished and summaries[-1].winner == game.remaining_players[0].name
+
+def test_iter_turns_cancel():
+    """Stopping early leaves the game where it was, and it can carry on later."""
+    game = new_game()
+    turns = game.iter_turns()
+    next(turns)
+    turns.close()
+    assert game.turn == 1 and not game.finished
+    assert next(game.iter_turns()).turn == 2
+
+def test_iter_events():
+    """Events are the same as an event sink would see, and the temporary sink is removed."""
+    sink = MemorySink()
+    game = new_game([sink])
+    events = list(game.iter_events())
+    assert game.sinks == [sink]
+    assert events[0].kind == "new-turn" and events[0].turn == 1
+    assert events[-1].kind == "end-turn" and events[-1].turn == game.turn
+    assert sum(event.kind == "end-turn" for event in events) == game.turn
+    assert any(event.kind == "winner" for event in events)
+
+def test_run_game_never_reads_input(monkeypatch):
+    """run_game() doesn't prompt unless asked to."""
+    def fail(*args):
+        raise AssertionError("input() was called")
+    monkeypatch.setattr("builtins.input", fail)
+    game = new_game()
+    game.run_game()
+    assert game.finished
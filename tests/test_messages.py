@@ -0,0 +1,69 @@
+"""
+Unit tests: Message templates
+"""
+
+from message_template import SBRSMessageTemplate, SBRSMessagePools, bucket_by_player_count
+from sbrs import SBRSGame, basic_init
+
+def test_template_slots():
+    """Templates know which slots they use and how many players they need."""
+    template = SBRSMessageTemplate("{player1} meets {player2} and {player3}")
+    assert template.slots == {"player1", "player2", "player3"}
+    assert template.player_count == 3
+    assert SBRSMessageTemplate("{player} dies").player_count == 1
+
+def test_template_render():
+    """Rendering fills known slots and leaves everything else alone."""
+    template = SBRSMessageTemplate("{player} hits {target} with {weapon}")
+    assert template.render({"player": "Bob", "target": "Joe"}) == "Bob hits Joe with {weapon}"
+    assert template.render({"player": "Bob"}) == "Bob hits {target} with {weapon}"
+    # Templates are still strings
+    assert template.replace("{player}", "Bob").startswith("Bob hits")
+
+def test_bucket_by_player_count():
+    """Buckets only hold messages that fit the number of players available."""
+    pool = [
+        SBRSMessageTemplate("{player1} waits"),
+        SBRSMessageTemplate("{player1} sees {player2}"),
+        SBRSMessageTemplate("{player1}, {player2}, {player3} and {player4} nap"),
+    ]
+    buckets = bucket_by_player_count(pool)
+    assert buckets[1] == ["{player1} waits"]
+    assert len(buckets[2]) == 2
+    assert len(buckets[3]) == 2
+    assert len(buckets[4]) == 3
+
+def test_message_pools():
+    """Pools merge a player type's messages with the Default ones."""
+    pools = SBRSMessagePools({
+        "passive": {
+            "Default": [SBRSMessageTemplate("{player1} waits")],
+            "Cat": [SBRSMessageTemplate("{player1} sees {player2}")],
+        },
+    })
+    assert pools.get("passive", "Cat") == ["{player1} sees {player2}", "{player1} waits"]
+    assert pools.get("passive", "Dog") == ["{player1} waits"]
+    assert pools.get_passive("Cat", 1) == ["{player1} waits"]
+
+def test_add_message_invalidates_pools():
+    """Messages added at runtime show up in the game's pools."""
+    game = SBRSGame(basic_init("tests/configs/config-test_normal.json", True))
+    before = len(game.message_pools.get("winner", "Default"))
+    game.add_message("winner", "{player} is the last one standing")
+    assert len(game.message_pools.get("winner", "Default")) == before + 1
+
+def test_render_message_colors():
+    """Colored and plain versions of a message are built together."""
+    game = SBRSGame(basic_init("tests/configs/config-test_normal.json", True, color=True))
+    message = SBRSMessageTemplate("{player} hits {target}")
+    ansi, plain = game.render_message(
+        message, "attack-success", {"player": ("Bob", "generic-player"), "target": ("Joe", "target-player")}
+    )
+    assert plain == "Bob hits Joe"
+    assert ansi.startswith(game.message_color("attack-success"))
+    assert game.message_color("generic-player") + "Bob" in ansi
+
+def test_no_color_mode():
+    """Without colors, every color code is empty."""
+    config = basic_init("tests/configs/config-test_normal.json", True, color=False)
+    assert not any(config.color_table.values())
@@ -0,0 +1,94 @@
+"""
+Unit tests: Output sinks
+"""
+
+import io
+import random
+
+import pytest
+
+from output_sinks import BackgroundSink, ConsoleSink, EventSink, FileSink, MemorySink, NullSink
+from sbrs import SBRSGame, basic_init
+
+def test_memory_sink_game():
+    """A game can run with only an in-memory sink attached."""
+    sink = MemorySink()
+    game = SBRSGame(basic_init("tests/configs/config-test_normal.json", True), [sink])
+    game.run_game()
+    assert sink.lines[0].startswith("Turn 1")
+    assert any("TURN ENDED" in line for line in sink.lines)
+
+def test_null_sink_game(capsys):
+    """Nothing is printed when only a null sink is attached."""
+    game = SBRSGame(basic_init("tests/configs/config-test_normal.json", True), [NullSink()])
+    capsys.readouterr()
+    game.run_game()
+    assert capsys.readouterr().out == ""
+
+def test_console_sink_buffers():
+    """Console output is only written when the sink is flushed."""
+    stream = io.StringIO()
+    sink = ConsoleSink(stream)
+    sink.write("hello", "hello")
+    assert stream.getvalue() == ""
+    sink.flush()
+    assert stream.getvalue() == "hello\n"
+
+def test_background_sink(tmp_path):
+    """The background writer delivers every flushed line to the wrapped sink."""
+    path = tmp_path / "game.log"
+    sink = BackgroundSink(FileSink(str(path)), max_batches=2)
+    for i in range(100):
+        sink.write(f"\x1b[31mline {i}", f"line {i}")
+        sink.flush()
+    sink.close()
+    assert path.read_text(encoding="utf-8").splitlines() == [f"line {i}" for i in range(100)]
+
+def test_background_sink_error():
+    """A sink that raises stops the background writer without blocking, and the error reaches the game."""
+    class BrokenSink(MemorySink):
+        """Fails on every flush."""
+        def flush(self):
+            raise OSError("disk full")
+
+    sink = BackgroundSink(BrokenSink(), max_batches=1)
+    with pytest.raises(OSError):
+        for i in range(100):
+            sink.write(f"line {i}", f"line {i}")
+            sink.flush()
+    with pytest.raises(OSError):
+        sink.close()
+    assert not sink.thread.is_alive()
+
+def test_event_sink_skips_rendering(monkeypatch):
+    """Events reach event sinks without ever being rendered into text."""
+    sink = EventSink()
+    game = SBRSGame(basic_init("tests/configs/config-test_normal.json", True), [sink])
+
+    def fail(_event):
+        raise AssertionError("events should not be rendered without a text sink")
+
+    monkeypatch.setattr(game, "render_event", fail)
+    game.run_game()
+    kinds = [event.kind for event in sink.events]
+    assert kinds[0] == "new-turn"
+    assert "winner" in kinds
+    assert all(event.template is not None for event in sink.events if event.kind == "attack-success")
+
+def test_render_event_matches_text_output():
+    """Rendering recorded events gives the same text a text sink received."""
+    events = EventSink()
+    text = MemorySink()
+    game = SBRSGame(basic_init("tests/configs/config-test_normal.json", True), [events, text])
+    game.run_game()
+    assert [game.render_event(event)[1] for event in events.events] == text.lines
+
+def test_sinks_dont_change_game():
+    """The same seed gives the same game with and without a text sink."""
+    results = []
+    for sink in (NullSink(), MemorySink(), EventSink()):
+        random.seed(11)
+        game = SBRSGame(basic_init("tests/configs/config-test_normal.json", True), [sink], "python")
+        game.run_game()
+        results.append((game.turn, game.remaining_players[0].name, [p.kills for p in game.config.players]))
+    assert results[0] == results[1] == results[2]
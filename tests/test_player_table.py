@@ -0,0 +1,59 @@
+"""
+Unit tests: Player table
+"""
+
+import copy
+
+import pytest
+from player import SBRSPlayer
+from player_table import SBRSPlayerTable
+from sbrs import SBRSGame, basic_init
+from team import SBRSTeam
+
+def test_player_views():
+    """Players read and write their data through the table's columns."""
+    table = SBRSPlayerTable()
+    team = SBRSTeam("Red")
+    players = [SBRSPlayer(f"Player{i}", team, "Bot", table=table) for i in range(3)]
+    players[1].kills = 2
+    players[2].kill()
+    assert [player.row for player in players] == [0, 1, 2]
+    assert list(table.kills) == [0, 2, 0]
+    assert table.alive == bytearray([1, 1, 0])
+    assert table.type_names == ["Bot"]
+    assert players[0].team is team
+    assert table.teams[0] == table.teams[2] == 0
+    with pytest.raises(AttributeError):
+        players[0].score = 1
+
+def test_game_adopts_table():
+    """Loaded players already share one table, which the game uses as is."""
+    config = basic_init("tests/configs/config-test_teams.json", True)
+    table = config.players[0]._table  # pylint: disable=protected-access
+    game = SBRSGame(config)
+    assert game.player_table is table
+    assert game.player_table.is_packed(config.players)
+
+def test_adopt_copies_players():
+    """Players from separate tables are copied into a new table, keeping their data."""
+    players = [SBRSPlayer(f"Player{i}") for i in range(3)]
+    players[0].kills = 4
+    players[1].alive = False
+    players[2].addon_data["lives"] = 3
+    table = SBRSPlayerTable.adopt(players)
+    assert table.is_packed(players)
+    assert list(table.kills) == [4, 0, 0]
+    assert table.alive == bytearray([1, 0, 1])
+    assert players[2].addon_data == {"lives": 3}
+    assert players[2].name == "Player2"
+
+def test_player_copy():
+    """Copied players keep their data and share a copied table."""
+    table = SBRSPlayerTable()
+    players = [SBRSPlayer(f"Player{i}", table=table) for i in range(2)]
+    players[0].kills = 1
+    copied = copy.deepcopy(players)
+    copied[0].kills = 5
+    assert players[0].kills == 1
+    assert copied[0]._table is copied[1]._table  # pylint: disable=protected-access
+    assert copied[1] == players[1]
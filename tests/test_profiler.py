@@ -0,0 +1,43 @@
+"""
+Unit tests: Profiling
+"""
+
+import json
+import random
+
+from output_sinks import NullSink
+from profiler import SBRSProfiler
+from sbrs import SBRSGame, basic_init
+
+def test_profiled_game():
+    """A profiled game records its actions, hooks and engine phases."""
+    game = SBRSGame(basic_init("tests/configs/config-test_normal.json", True), [NullSink()], profiler=SBRSProfiler())
+    game.run_game()
+    report = json.loads(game.profiler.to_json())
+    assert report["phase:turn"]["calls"] == game.turn
+    assert report["hook:basic_game_behavior.start_turn"]["calls"] == game.turn
+    assert report["phase:game-over"]["calls"] == 1
+    actions = sum(report[name]["calls"] for name in report if name.startswith("action:"))
+    assert actions == report["phase:after-action"]["calls"]
+    assert "name" in game.profiler.format_report()
+
+def test_profiling_keeps_results():
+    """Profiling doesn't change the random numbers a game uses."""
+    results = []
+    for profiler in (None, SBRSProfiler()):
+        random.seed(5)
+        game = SBRSGame(basic_init("tests/configs/config-test_normal.json", True), [NullSink()], profiler=profiler)
+        game.run_game()
+        results.append((game.turn, [player.kills for player in game.config.players]))
+    assert results[0] == results[1]
+
+def test_percentiles():
+    """Percentiles come from the recorded timings, and totals are exact."""
+    profiler = SBRSProfiler()
+    for i in range(1, 101):
+        profiler.record("phase:test", i / 1000)
+    row = profiler.to_dict()["phase:test"]
+    assert row["calls"] == 100
+    assert abs(row["total"] - 5.05) < 1e-9
+    assert row["p50"] == 0.051
+    assert row["max"] == 0.1
@@ -0,0 +1,68 @@
+"""
+Unit tests: Roster loading
+"""
+
+import json
+
+import pytest
+from load_functions import load_players
+from roster import read_lines, read_roster, write_roster
+from sbrs import basic_init
+
+def write_config(tmp_path, files, use_teams=False):
+    """Writes a config using the given roster files, and returns its path."""
+    path = tmp_path / "config.json"
+    path.write_text(json.dumps({
+        "use-teams": use_teams,
+        "attack-chance": 0.3,
+        "death-chances": {"passive": 0.5, "attack": 0.5},
+        "files": files,
+    }), encoding="utf-8")
+    return str(path)
+
+@pytest.mark.parametrize("extension", ["csv", "ndjson"])
+def test_combined_roster(tmp_path, extension):
+    """Combined rosters give each player its type and team."""
+    rows = [("Alice", "Default", "Red"), ("Bob", "Bot", "Blue"), ("Carol", "Default", "Red")]
+    write_roster(str(tmp_path / f"roster.{extension}"), rows)
+    config = basic_init(write_config(tmp_path, {"roster": f"roster.{extension}"}, True), True, color=False)
+    assert [(p.name, p.type, p.team.name) for p in config.players] == rows
+    assert config.playertypes == ["Default", "Bot", "Default"]
+    assert sorted(len(team) for team in config.teams) == [1, 2]
+
+def test_csv_roster_optional_columns(tmp_path):
+    """CSV rosters only need a name column; empty types default to Default."""
+    path = tmp_path / "roster.csv"
+    path.write_text("name,type\nAlice,\n\nBob,Bot\n", encoding="utf-8")
+    assert list(read_roster(str(path))) == [("Alice", "Default", None), ("Bob", "Bot", None)]
+
+def test_ndjson_roster_matches_csv(tmp_path):
+    """NDJSON types and teams are cleaned up like CSV cells, so the same roster reads the same."""
+    ndjson = tmp_path / "roster.ndjson"
+    ndjson.write_text(
+        '{"name": " Alice ", "type": " Cat ", "team": 3}\n{"name": "Bob", "type": " ", "team": null}\n',
+        encoding="utf-8",
+    )
+    csv_path = tmp_path / "roster.csv"
+    csv_path.write_text("name,type,team\n Alice , Cat ,3\nBob, ,\n", encoding="utf-8")
+    expected = [("Alice", "Cat", "3"), ("Bob", "Default", None)]
+    assert list(read_roster(str(ndjson))) == expected
+    assert list(read_roster(str(csv_path))) == expected
+
+def test_line_files_match(tmp_path):
+    """Memory-mapped and regular reads skip blank lines the same way."""
+    path = tmp_path / "players.txt"
+    path.write_text("Alice\n\n  Bob  \r\nCarol", encoding="utf-8")
+    assert list(read_lines(str(path), use_mmap=True)) == ["Alice", "Bob", "Carol"]
+    assert list(read_lines(str(path), use_mmap=False)) == ["Alice", "Bob", "Carol"]
+
+def test_duplicate_players():
+    """Duplicate player names are rejected while loading."""
+    with pytest.raises(ValueError):
+        load_players(iter(["Alice", "Bob", "Alice"]), None, None)
+
+def test_missing_playertypes():
+    """Players past the end of the playertypes get the Default type."""
+    players, teams = load_players(iter(["Alice", "Bob"]), iter(["Bot"]), None)
+    assert [player.type for player in players] == ["Bot", "Default"]
+    assert teams is None
@@ -0,0 +1,128 @@
+"""
+Unit tests: Live game server
+"""
+
+import asyncio
+import json
+
+from server import SBRSConnection, SBRSServer, parse_configs
+
+CONFIGS = {
+    "normal": "tests/configs/config-test_normal.json",
+    "stresstest": "tests/configs/config-test_stresstest.json",
+}
+
+async def request(reader, writer, message: dict) -> dict:
+    """Sends a request and reads the reply."""
+    writer.write((json.dumps(message) + "\n").encode())
+    await writer.drain()
+    return json.loads(await reader.readline())
+
+def test_server_games():
+    """A small game streams every turn to its viewer while a huge game is still being played."""
+    async def run():
+        server = SBRSServer(CONFIGS, actions_per_step=5)
+        port = await server.start()
+        try:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            assert await request(reader, writer, {"cmd": "configs"}) == {"configs": ["normal", "stresstest"]}
+            big = (await request(reader, writer, {"cmd": "start", "config": "stresstest"}))["game"]
+            small = (await request(reader, writer, {"cmd": "start", "config": "normal", "watch": True}))["game"]
+            turns, lines = [], []
+            while not turns or not turns[-1]["summary"]["finished"]:
+                message = json.loads(await reader.readline())
+                lines.append(message)
+                if "summary" in message:
+                    turns.append(message)
+            games = (await request(reader, writer, {"cmd": "games"}))["games"]
+            writer.close()
+            return big, small, turns, lines, games
+        finally:
+            await server.close()
+
+    big, small, turns, lines, games = asyncio.run(run())
+    assert all(message["game"] == small for message in lines)
+    # Turns are sent in chunks, each turn ending with its summary
+    assert len(lines) > len(turns)
+    assert [message["turn"] for message in lines] == sorted(message["turn"] for message in lines)
+    assert [turn["turn"] for turn in turns] == list(range(1, len(turns) + 1))
+    assert turns[-1]["summary"]["winner"]
+    assert any("TURN ENDED" in line for line in turns[-1]["lines"])
+    # The small game finished long before the huge one
+    assert [game["game"] for game in games] == [big]
+    assert games[0]["turn"] < 10 and not games[0]["finished"]
+
+def test_server_errors():
+    """Bad requests are answered with errors, and the connection keeps working."""
+    async def run():
+        server = SBRSServer({"normal": CONFIGS["normal"]})
+        port = await server.start()
+        try:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            replies = [
+                await request(reader, writer, {"cmd": "start", "config": "missing"}),
+                await request(reader, writer, {"cmd": "watch", "game": 42}),
+                await request(reader, writer, {"cmd": "dance"}),
+                await request(reader, writer, {"cmd": "configs"}),
+            ]
+            writer.close()
+            return replies
+        finally:
+            await server.close()
+
+    replies = asyncio.run(run())
+    assert all("error" in reply for reply in replies[:3])
+    assert replies[3] == {"configs": ["normal"]}
+
+def test_parse_configs():
+    """Configs are named explicitly or after their file."""
+    assert parse_configs(["big=a/b.json", "c/normal.json"]) == {"big": "a/b.json", "normal": "c/normal.json"}
+
+def test_connection_lost():
+    """A client that goes away mid-send closes its connection instead of killing the sender with an error."""
+    class BrokenWriter:
+        """A stream whose client has disconnected."""
+        closed = False
+
+        def write(self, data):
+            pass
+
+        async def drain(self):
+            raise ConnectionResetError()
+
+        def close(self):
+            self.closed = True
+
+    async def run():
+        connection = SBRSConnection(BrokenWriter())
+        connection.reply({"game": 1})
+        await asyncio.wait_for(connection.send_loop(), 5)
+        return connection
+
+    connection = asyncio.run(run())
+    assert connection.closed and connection.writer.closed
+    assert not connection.reply({"game": 1})
+
+def test_unwatched_games():
+    """Games share their config's messages, and only render while someone watches."""
+    async def run():
+        server = SBRSServer({"normal": CONFIGS["normal"]})
+        await server.start()
+        try:
+            live = await server.start_game("normal")
+            config = server.configs["normal"]
+            shared = live.game.config.messages["passive"]["Default"][0] is config.messages["passive"]["Default"][0]
+            own_players = not set(map(id, live.game.config.players)) & set(map(id, config.players))
+            sinks = [len(live.game.sinks)]
+            viewer = SBRSConnection(None)
+            live.watch(viewer)
+            sinks.append(len(live.game.sinks))
+            live.unwatch(viewer)
+            sinks.append(len(live.game.sinks))
+            return shared, own_players, sinks
+        finally:
+            await server.close()
+
+    shared, own_players, sinks = asyncio.run(run())
+    assert shared and own_players
+    assert sinks == [0, 1, 0]
@@ -0,0 +1,46 @@
+"""
+Unit tests: Tournaments
+"""
+
+import json
+
+import pytest
+from sbrs import basic_init
+from tournament import run_tournament, split_evenly
+
+def test_split_evenly():
+    """Groups are as even as possible and never larger than asked."""
+    assert split_evenly(list(range(13)), 4) == [[0, 1, 2, 3], [4, 5, 6], [7, 8, 9], [10, 11, 12]]
+    assert split_evenly([1], 4) == [[1]]
+
+def test_tournament_bracket():
+    """Every heat has a winner, and each round's winners play the next round."""
+    config = basic_init("tests/configs/config-test_stresstest.json", True, color=False)
+    result = run_tournament(config, 100, workers=1, seed=1)
+    assert [len(winners) for winners in result.rounds] == [81, 1]
+    assert result.heats() == 82
+    assert result.champion == result.rounds[-1][0] and result.champion in result.rounds[0]
+    names = {player.name for player in config.players}
+    assert set(result.kills) <= names
+    # A heat of n players has at most n - 1 kills
+    assert sum(result.kills.values()) <= len(config.players) - 1
+    # The config itself is left untouched
+    assert all(player.alive and player.kills == 0 for player in config.players)
+
+def test_tournament_same_seed_any_workers():
+    """The same seed gives the same tournament whether heats run in one process or several."""
+    config = basic_init("tests/configs/config-test_normal.json", True, color=False)
+    single = run_tournament(config, 3, workers=1, seed=7)
+    pooled = run_tournament(config, 3, workers=2, seed=7)
+    assert [len(winners) for winners in single.rounds] == [5, 2, 1]
+    assert single.to_dict() == pooled.to_dict()
+    assert json.loads(single.to_json())["champion"] == single.champion
+
+def test_tournament_teams():
+    """Team heats are made of whole teams, and a team is champion."""
+    config = basic_init("tests/configs/config-test_teams.json", True, color=False)
+    result = run_tournament(config, 2, workers=1, seed=1)
+    assert result.rounds == [[result.champion]]
+    assert result.champion in ("Team1", "Team2")
+    with pytest.raises(ValueError):
+        run_tournament(config, 1)
@@ -0,0 +1,74 @@
+"""
+Unit tests: Vector turn engine
+"""
+
+import random
+
+import pytest
+
+from action import SBRSAction
+from output_sinks import EventSink, MemorySink
+from sbrs import SBRSGame, basic_init
+
+pytest.importorskip("numpy")
+
+@pytest.mark.parametrize("config", ["config-test_normal.json", "config-test_teams.json"])
+def test_vector_game_is_consistent(config):
+    """Nobody acts after dying, nobody dies twice and teammates never attack each other."""
+    random.seed(1)
+    sink = EventSink()
+    game = SBRSGame(basic_init(f"tests/configs/{config}", True), [sink], "vector")
+    game.run_game()
+    assert game.finished
+    assert game.vector_engine is not None
+    dead = set()
+    for event in sink.events:
+        if event.kind in ("attack-success", "attack-fail", "passive-attack", "passive", "passive-death"):
+            assert event.actor.name not in dead
+        if event.kind in ("attack-success", "attack-fail"):
+            assert event.target.name not in dead
+            if game.config.use_teams:
+                assert event.actor.team != event.target.team
+        if event.kind == "attack-success":
+            dead.add(event.target.name)
+        elif event.kind == "passive-death":
+            dead.add(event.actor.name)
+    assert len(game.config.players) - len(dead) == len(game.remaining_players)
+    assert sum(player.kills for player in game.config.players) == sum(
+        event.kind == "attack-success" for event in sink.events
+    )
+
+def test_vector_engine_fallback():
+    """The vector engine is only used when the actions are the vanilla ones."""
+    game = SBRSGame(basic_init("tests/configs/config-test_normal.json", True), [MemorySink()], "vector")
+    assert game.uses_vector_engine()
+    game.add_action(SBRSAction("dance", "Player dances", lambda game, player: None))
+    with pytest.raises(ValueError):
+        game.uses_vector_engine()
+    game.engine = "auto"
+    assert not game.uses_vector_engine()
+
+def test_auto_engine_small_games():
+    """Small games are played by the reference engine."""
+    game = SBRSGame(basic_init("tests/configs/config-test_normal.json", True), [MemorySink()])
+    assert not game.uses_vector_engine()
+    game.run_game()
+    assert game.vector_engine is None
+
+def test_vector_checkpoint(tmp_path):
+    """Vector engine games resume exactly from checkpoints."""
+    path = str(tmp_path / "game.sbrscheckpoint")
+    random.seed(2)
+    full = MemorySink()
+    game = SBRSGame(basic_init("tests/configs/config-test_normal.json", True), [full], "vector")
+    game.turn += 1
+    game.simulate_turn()
+    lines_before = len(full.lines)
+    game.checkpoint(path)
+    game.run_game()
+
+    resumed = MemorySink()
+    game = SBRSGame(basic_init("tests/configs/config-test_normal.json", True), [resumed], "vector")
+    game.restore(path)
+    game.run_game()
+    assert resumed.lines == full.lines[lines_before:]